@@ -0,0 +1,4 @@
+"""QThreadWithReturn 性能基准
+
+本目录中的脚本用于测量线程池与回调热路径的性能，不属于测试用例。
+"""
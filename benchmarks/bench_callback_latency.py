@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""任务返回到回调执行的延迟分解
+
+利用 QThreadWithReturn.timings 把"任务完成到界面收到回调"的延迟拆成两段：
+- deliver: 任务函数返回 → 结果在主线程中处理（信号投递、事件循环排队）
+- dispatch: 结果处理 → 回调开始执行（回调分发器排队）
+
+分别统计逐任务 QThread 模式与常驻工作线程模式下的 p50/p99/max。
+
+运行:
+    python -m benchmarks.bench_callback_latency
+    python -m benchmarks.bench_callback_latency --tasks 5000 --workers 8
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import warnings
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+from qthreadwithreturn import QThreadPoolExecutor
+
+
+def percentile(values, q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def run(tasks: int, workers: int, persistent: bool) -> dict:
+    app = QApplication.instance()
+    pool = QThreadPoolExecutor(max_workers=workers, persistent_workers=persistent)
+    called = []
+    futures = []
+    for i in range(tasks):
+        future = pool.submit(int, i)
+        future.add_done_callback(called.append)
+        futures.append(future)
+
+    deadline = time.monotonic() + 60
+    while len(called) < tasks and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.001)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        pool.shutdown(wait=True)
+
+    deliver, dispatch = [], []
+    for future in futures:
+        timings = future.timings
+        if "returned" in timings and timings["callbacks"]:
+            deliver.append(timings["delivered"] - timings["returned"])
+            dispatch.append(timings["callbacks"][0] - timings["delivered"])
+    return {"deliver": deliver, "dispatch": dispatch}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    QApplication.instance() or QApplication(sys.argv)
+
+    print(f"{'mode':<12} {'phase':<10} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8} {'mean ms':>8}")
+    for name, persistent in (("per-task", False), ("persistent", True)):
+        samples = run(args.tasks, args.workers, persistent)
+        for phase, values in samples.items():
+            if not values:
+                continue
+            print(
+                f"{name:<12} {phase:<10} {percentile(values, 0.5) * 1000:>8.2f} "
+                f"{percentile(values, 0.99) * 1000:>8.2f} {max(values) * 1000:>8.2f} "
+                f"{statistics.fmean(values) * 1000:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""回调签名检查微基准
+
+测量 add_done_callback 所依赖的回调签名检查的单次耗时：同一个绑定方法在
+大量不同实例上注册（缓存命中）与每次都执行 inspect.signature（旧实现）的对比。
+
+运行:
+    python -m benchmarks.bench_callback_validation
+    python -m benchmarks.bench_callback_validation --count 100000
+"""
+
+import argparse
+import inspect
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from qthreadwithreturn._callbacks import _count_required_params, validate_callback
+
+
+class Receiver:
+    def on_done(self, result):
+        pass
+
+    def on_failure(self, exc, *args, **kwargs):
+        pass
+
+
+def uncached(callback, name):
+    """旧实现：每次调用都执行 inspect.signature"""
+    if not callable(callback):
+        raise TypeError(f"{name} must be callable")
+    try:
+        return _count_required_params(callback)
+    except Exception as e:
+        raise ValueError(f"Cannot inspect {name} signature: {e}") from e
+
+
+def measure(validate, callbacks) -> float:
+    """返回每次检查的平均耗时（微秒）"""
+    start = time.perf_counter()
+    for callback in callbacks:
+        validate(callback, "done_callback")
+    return (time.perf_counter() - start) / len(callbacks) * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=20_000, help="注册次数")
+    args = parser.parse_args()
+
+    receivers = [Receiver() for _ in range(args.count)]
+    cases = {
+        "bound method": [r.on_done for r in receivers],
+        "varargs method": [r.on_failure for r in receivers],
+        "lambda (new each)": [lambda result: None for _ in range(args.count)],
+    }
+
+    print(f"{'callback':<20} {'uncached us':>12} {'cached us':>10} {'speedup':>8}")
+    for name, callbacks in cases.items():
+        before = measure(uncached, callbacks)
+        after = measure(validate_callback, callbacks)
+        print(f"{name:<20} {before:>12.2f} {after:>10.2f} {before / after:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""批量取消运行中任务的耗时基准
+
+启动 N 个运行中的任务后逐个调用 cancel(force_stop=True)，统计总耗时：
+- token: 任务声明 cancel_token 参数，阻塞在 cancel_token.wait() 上
+- interruption: 任务轮询 QThread.isInterruptionRequested()
+- uncooperative: 任务不响应取消，只能依靠分阶段的 quit/terminate（任务数单独设置）
+
+运行:
+    python -m benchmarks.bench_cancellation
+    python -m benchmarks.bench_cancellation --tasks 200 --uncooperative 5
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QThread
+from PySide6.QtWidgets import QApplication
+from qthreadwithreturn import QThreadWithReturn
+
+
+def token_task(started, cancel_token):
+    started.release()
+    # 阻塞在令牌上代替 sleep 轮询，取消时立即唤醒
+    while not cancel_token.wait(1000):
+        pass
+
+
+def interruption_task(started):
+    started.release()
+    thread = QThread.currentThread()
+    while not thread.isInterruptionRequested():
+        time.sleep(0.001)
+
+
+def uncooperative_task(started):
+    started.release()
+    while True:
+        time.sleep(0.001)
+
+
+def measure(app, task, count: int) -> float:
+    """返回取消 count 个运行中任务的总耗时（毫秒）"""
+    started = threading.Semaphore(0)
+    threads = [QThreadWithReturn(task, started) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for _ in range(count):
+        while not started.acquire(timeout=0.01):
+            app.processEvents()
+
+    start = time.perf_counter()
+    for thread in threads:
+        thread.cancel(force_stop=True)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    # 等待清理完成，避免影响下一轮
+    deadline = time.monotonic() + 1
+    while time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    return elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=1000, help="协作式任务数")
+    parser.add_argument("--uncooperative", type=int, default=3, help="不响应取消的任务数（每个约 300ms 以上）")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    print(f"{'task':<15} {'count':>6} {'total ms':>10} {'per task ms':>12}")
+    for name, task, count in (
+            ("token", token_task, args.tasks),
+            ("interruption", interruption_task, args.tasks),
+            ("uncooperative", uncooperative_task, args.uncooperative),
+    ):
+        if count <= 0:
+            continue
+        total = measure(app, task, count)
+        print(f"{name:<15} {count:>6} {total:>10.1f} {total / count:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""shutdown(force_stop=True) 耗时随工作线程数的变化
+
+每个工作线程运行一个不响应取消的任务（time.sleep），只能依靠 terminate 停止。
+所有线程共享同一个截止时间并行停止，耗时应与线程数基本无关；旧实现逐个线程
+分阶段等待（100ms + 200ms + terminate），32 个线程需要 10 秒以上。
+
+terminate 会让 Qt 在 stderr 输出大量警告，可以重定向丢弃。
+
+运行:
+    python -m benchmarks.bench_force_stop 2>/dev/null
+    python -m benchmarks.bench_force_stop --workers 1 8 32 64 --timeout-ms 500
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+from qthreadwithreturn import QThreadPoolExecutor
+
+
+def stuck_task(started):
+    started.release()
+    time.sleep(60)
+
+
+def run(workers: int, timeout_ms) -> float:
+    pool = QThreadPoolExecutor(max_workers=workers)
+    started = threading.Semaphore(0)
+    for _ in range(workers):
+        pool.submit(stuck_task, started)
+    for _ in range(workers):
+        started.acquire()
+
+    start = time.perf_counter()
+    pool.shutdown(force_stop=True, timeout_ms=timeout_ms)
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--timeout-ms", type=int, default=None, help="强制停止预算，默认 2300ms")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    print(f"{'workers':>8} {'shutdown ms':>12}")
+    for workers in args.workers:
+        elapsed = run(workers, args.timeout_ms)
+        print(f"{workers:>8} {elapsed * 1000:>12.1f}")
+        app.processEvents()
+
+
+if __name__ == "__main__":
+    main()
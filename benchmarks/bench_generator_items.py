@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""生成器任务分批交付产出项的基准
+
+一个任务逐项产出 N 行（每行模拟少量计算），比较三种把行交给主线程的方式：
+- list: 普通函数返回完整列表，界面在任务结束后才看到第一行
+- signal: 每产出一行 emit 一次信号（队列连接到主线程的槽）
+- batched: 生成器函数 + add_item_callback，按数量/时间上限分批交付
+
+统计首行到达主线程的时间、全部完成的总耗时、主线程处理的事件次数，以及单次
+processEvents() 的最长耗时（界面卡顿的上限）。
+
+运行:
+    python -m benchmarks.bench_generator_items
+    python -m benchmarks.bench_generator_items --rows 200000 --work 50
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QObject, Qt, Signal
+from PySide6.QtWidgets import QApplication
+from qthreadwithreturn import QThreadWithReturn
+
+
+class RowSignal(QObject):
+    """逐行发射的信号"""
+
+    row = Signal(object)
+
+
+def make_row(i: int, work: int) -> tuple:
+    value = 0
+    for j in range(work):
+        value += i * j
+    return i, value
+
+
+def rows_list(rows: int, work: int) -> list:
+    return [make_row(i, work) for i in range(rows)]
+
+
+def rows_signal(rows: int, work: int, emitter: RowSignal) -> int:
+    for i in range(rows):
+        emitter.row.emit(make_row(i, work))
+    return rows
+
+
+def rows_generator(rows: int, work: int):
+    for i in range(rows):
+        yield make_row(i, work)
+
+
+def run(mode: str, rows: int, work: int) -> dict:
+    app = QApplication.instance()
+    received = [0]
+    events = [0]
+    first = []
+
+    def on_rows(batch) -> None:
+        if not first:
+            first.append(time.perf_counter())
+        events[0] += 1
+        received[0] += len(batch)
+
+    emitter = RowSignal()
+    emitter.row.connect(lambda row: on_rows((row,)), Qt.QueuedConnection)
+    if mode == "list":
+        thread = QThreadWithReturn(rows_list, rows, work)
+        thread.add_done_callback(on_rows)
+    elif mode == "signal":
+        thread = QThreadWithReturn(rows_signal, rows, work, emitter)
+    else:
+        thread = QThreadWithReturn(rows_generator, rows, work)
+        thread.add_item_callback(on_rows)
+
+    start = time.perf_counter()
+    thread.start()
+    max_stall = 0.0
+    deadline = time.monotonic() + 300
+    while received[0] < rows and time.monotonic() < deadline:
+        before = time.perf_counter()
+        app.processEvents()
+        max_stall = max(max_stall, time.perf_counter() - before)
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    thread.wait(5000)
+    # 让工作线程完全退出后再开始下一轮
+    settle = time.monotonic() + 0.2
+    while time.monotonic() < settle:
+        app.processEvents()
+        time.sleep(0.01)
+    return {
+        "first": (first[0] - start) if first else float("nan"),
+        "elapsed": elapsed,
+        "events": events[0],
+        "max_stall": max_stall,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000, help="产出的行数")
+    parser.add_argument("--work", type=int, default=20, help="每行的模拟计算量")
+    args = parser.parse_args()
+
+    QApplication.instance() or QApplication(sys.argv)
+
+    print(f"rows={args.rows}, work={args.work}\n")
+    print(f"{'mode':<8} {'first row ms':>13} {'total s':>8} {'events':>8} {'max stall ms':>13}")
+    for mode in ("list", "signal", "batched"):
+        stats = run(mode, args.rows, args.work)
+        print(
+            f"{mode:<8} {stats['first'] * 1000:>13.1f} {stats['elapsed']:>8.2f} "
+            f"{stats['events']:>8} {stats['max_stall'] * 1000:>13.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
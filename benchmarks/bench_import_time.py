@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""包导入耗时与单任务开销基准
+
+- import: 在全新子进程中测量 `import qthreadwithreturn` 以及首次访问
+  QThreadPoolExecutor 的耗时，并记录此时是否已加载 PySide6.QtCore / QtWidgets
+- per-task: 有/无 Qt 应用时，常驻工作线程池与单个 QThreadWithReturn
+  start() + result() 的平均单任务耗时，以及运行任务后是否加载了 QtWidgets
+
+运行:
+    python -m benchmarks.bench_import_time
+    python -m benchmarks.bench_import_time --runs 20 --tasks 20000
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+_IMPORT_PROBE = """
+import sys, time, json
+t0 = time.perf_counter()
+import qthreadwithreturn
+t1 = time.perf_counter()
+after_package = {m: m in sys.modules for m in ("PySide6.QtCore", "PySide6.QtWidgets")}
+qthreadwithreturn.QThreadPoolExecutor
+t2 = time.perf_counter()
+after_executor = {m: m in sys.modules for m in ("PySide6.QtCore", "PySide6.QtWidgets")}
+print(json.dumps({"package_ms": (t1 - t0) * 1000, "executor_ms": (t2 - t0) * 1000,
+                  "after_package": after_package, "after_executor": after_executor}))
+"""
+
+_TASK_PROBE = """
+import sys, time, json, warnings
+with_app = sys.argv[1] == "qt"
+tasks = int(sys.argv[2])
+if with_app:
+    from PySide6.QtWidgets import QApplication
+    app = QApplication(sys.argv[:1])
+from qthreadwithreturn import QThreadPoolExecutor, QThreadWithReturn
+
+pool = QThreadPoolExecutor(max_workers=4, persistent_workers=True)
+start = time.perf_counter()
+futures = [pool.submit(int, i) for i in range(tasks)]
+for f in futures:
+    f.result(timeout_ms=60000)
+pool_us = (time.perf_counter() - start) / tasks * 1e6
+with warnings.catch_warnings():
+    warnings.simplefilter("ignore")
+    pool.shutdown(wait=True)
+
+threads = max(1, tasks // 20)
+start = time.perf_counter()
+for i in range(threads):
+    t = QThreadWithReturn(int, i)
+    t.start()
+    t.result(timeout_ms=60000)
+thread_us = (time.perf_counter() - start) / threads * 1e6
+print(json.dumps({"pool_us": pool_us, "thread_us": thread_us,
+                  "qtwidgets": "PySide6.QtWidgets" in sys.modules}))
+"""
+
+
+def run_probe(code: str, *args: str) -> dict:
+    completed = subprocess.run(
+        [sys.executable, "-c", code, *args],
+        cwd=project_root, capture_output=True, text=True, timeout=600,
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10, help="导入测量的子进程次数")
+    parser.add_argument("--tasks", type=int, default=10000)
+    args = parser.parse_args()
+
+    samples = [run_probe(_IMPORT_PROBE) for _ in range(args.runs)]
+    package_ms = statistics.median(s["package_ms"] for s in samples)
+    executor_ms = statistics.median(s["executor_ms"] for s in samples)
+    print(f"{'import':<34} {'median ms':>10}  modules loaded")
+    for label, ms, key in (
+        ("import qthreadwithreturn", package_ms, "after_package"),
+        ("+ QThreadPoolExecutor", executor_ms, "after_executor"),
+    ):
+        loaded = ", ".join(m.split(".")[-1] for m, v in samples[0][key].items() if v) or "-"
+        print(f"{label:<34} {ms:>10.1f}  {loaded}")
+
+    print(f"\n{'mode':<12} {'pool us/task':>13} {'thread us/task':>15} {'QtWidgets':>10}")
+    for mode in ("headless", "qt"):
+        result = run_probe(_TASK_PROBE, mode, str(args.tasks))
+        print(
+            f"{mode:<12} {result['pool_us']:>13.1f} {result['thread_us']:>15.1f} "
+            f"{'loaded' if result['qtwidgets'] else '-':>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""线程池指标记录开销基准
+
+对比按线程分片的无锁记录（_metrics._PoolMetrics）与共享计数器加锁的写法，
+统计每次 increment()/observe() 的平均耗时，并给出常驻工作线程模式下每个任务
+的总耗时作为参照（每个任务约记录 3 个计数和 3 个直方图观测值）。
+
+运行:
+    python -m benchmarks.bench_metrics_overhead
+    python -m benchmarks.bench_metrics_overhead --ops 200000 --threads 1 4 8
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+import warnings
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qthreadwithreturn import QThreadPoolExecutor
+from qthreadwithreturn import _metrics
+
+
+class LockedCounters:
+    """对照组：所有线程共享一组计数器，每次记录都获取同一把锁"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counters = [0] * len(_metrics.COUNTERS)
+        self.sums = [0.0] * len(_metrics.HISTOGRAMS)
+
+    def increment(self, counter: int) -> None:
+        with self._lock:
+            self.counters[counter] += 1
+
+    def observe(self, histogram: int, seconds: float) -> None:
+        with self._lock:
+            self.sums[histogram] += seconds
+
+
+def run_recorder(recorder, threads: int, ops: int) -> float:
+    """返回每次记录的平均耗时（纳秒）"""
+
+    def work():
+        for _ in range(ops):
+            recorder.increment(_metrics.COMPLETED)
+            recorder.observe(_metrics.RUN_TIME, 0.001)
+
+    workers = [threading.Thread(target=work) for _ in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+    return elapsed / (threads * ops * 2) * 1e9
+
+
+def run_pool(tasks: int) -> float:
+    """常驻工作线程模式（无 Qt 应用）下每个任务的平均耗时（微秒）"""
+    pool = QThreadPoolExecutor(max_workers=4, persistent_workers=True)
+    start = time.perf_counter()
+    for _ in range(tasks):
+        pool.submit(int)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        pool.shutdown(wait=True)
+    return (time.perf_counter() - start) / tasks * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ops", type=int, default=100_000, help="每个线程的记录次数")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--tasks", type=int, default=20_000)
+    args = parser.parse_args()
+
+    print(f"{'threads':>8} {'sharded ns/op':>14} {'locked ns/op':>13}")
+    for threads in args.threads:
+        sharded = run_recorder(_metrics._PoolMetrics(), threads, args.ops)
+        locked = run_recorder(LockedCounters(), threads, args.ops)
+        print(f"{threads:>8} {sharded:>14.0f} {locked:>13.0f}")
+
+    print(f"\npersistent pool: {run_pool(args.tasks):.1f} us/task")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""高优先级任务排队延迟基准
+
+线程池饱和且积压大量后台任务时，测量新提交任务从 submit() 到开始执行的延迟
+（p50/p99），对比默认优先级（FIFO，排在积压任务之后）与 priority=10。
+
+运行:
+    python -m benchmarks.bench_priority_latency
+    python -m benchmarks.bench_priority_latency --backlog 5000 --samples 50
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import warnings
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+from qthreadwithreturn import QThreadPoolExecutor
+
+
+def started_at() -> float:
+    return time.perf_counter()
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(priority: int, workers: int, backlog: int, samples: int, task_seconds: float,
+            persistent: bool) -> list:
+    """返回每个探测任务的排队延迟（毫秒）"""
+    pool = QThreadPoolExecutor(max_workers=workers, persistent_workers=persistent)
+    latencies = []
+    try:
+        for _ in range(backlog):
+            pool.submit(time.sleep, task_seconds)
+        for _ in range(samples):
+            submitted_at = time.perf_counter()
+            future = pool.submit(started_at, priority=priority)
+            latencies.append((future.result() - submitted_at) * 1000)
+            # 补充后台任务，保持积压规模
+            while len(pool._pending_tasks) < backlog:
+                pool.submit(time.sleep, task_seconds)
+    finally:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", UserWarning)  # shutdown(wait=True) 的 UI 阻塞提示
+            pool.shutdown(cancel_futures=True, wait=True)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--backlog", type=int, default=1000, help="积压的后台任务数")
+    parser.add_argument("--samples", type=int, default=20)
+    parser.add_argument("--task-ms", type=float, default=1.0, help="每个后台任务的耗时（毫秒）")
+    parser.add_argument("--thread-mode", action="store_true", help="使用逐任务 QThread 模式而不是常驻工作线程")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    print(f"workers={args.workers} backlog={args.backlog} task={args.task_ms}ms")
+    print(f"{'priority':<10} {'p50 ms':>10} {'p99 ms':>10} {'mean ms':>10}")
+    for priority in (0, 10):
+        latencies = measure(
+            priority, args.workers, args.backlog, args.samples, args.task_ms / 1000.0,
+            persistent=not args.thread_mode,
+        )
+        print(
+            f"{priority:<10} {percentile(latencies, 50):>10.3f} "
+            f"{percentile(latencies, 99):>10.3f} {statistics.fmean(latencies):>10.3f}"
+        )
+    app.processEvents()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""CPU 密集型任务在线程池与进程池中的扩展性
+
+把固定总量的纯 Python 计算（统计素数个数）分成若干块，分别提交给
+QThreadPoolExecutor（常驻工作线程）和 QProcessPoolExecutor，统计不同工作者数量下的
+耗时和相对第一行（默认 1 个工作者）的加速比。线程池受 GIL 限制，加速比约为 1；
+进程池在物理核心数以内应接近线性扩展。工作进程的启动时间不计入（先用一轮预热
+任务启动工作进程）。
+
+运行:
+    python -m benchmarks.bench_process_pool
+    python -m benchmarks.bench_process_pool --chunks 64 --limit 60000 --workers 1 2 4 8 16
+"""
+
+import argparse
+import os
+import sys
+import time
+import warnings
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qthreadwithreturn import QProcessPoolExecutor, QThreadPoolExecutor
+
+
+def count_primes(start: int, stop: int) -> int:
+    """纯 Python 的 CPU 密集型内核（全程持有 GIL）"""
+    count = 0
+    for n in range(max(2, start), stop):
+        d = 2
+        while d * d <= n:
+            if n % d == 0:
+                break
+            d += 1
+        else:
+            count += 1
+    return count
+
+
+def run(pool, chunks: int, limit: int) -> float:
+    step = limit // chunks
+    start = time.perf_counter()
+    futures = [pool.submit(count_primes, i * step, (i + 1) * step) for i in range(chunks)]
+    for f in futures:
+        f.result(timeout_ms=600_000)
+    return time.perf_counter() - start
+
+
+def measure(pool_class, workers: int, chunks: int, limit: int, **kwargs) -> float:
+    pool = pool_class(max_workers=workers, **kwargs)
+    try:
+        # 预热：启动全部工作线程/进程
+        for f in [pool.submit(count_primes, 0, 10) for _ in range(workers)]:
+            f.result(timeout_ms=600_000)
+        return run(pool, chunks, limit)
+    finally:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            pool.shutdown(wait=True)
+
+
+def main() -> None:
+    cpus = os.cpu_count() or 1
+    default_workers = sorted({1, 2, 4, 8, cpus} & set(range(1, cpus + 1))) or [1]
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, nargs="+", default=default_workers)
+    parser.add_argument("--chunks", type=int, default=32, help="总计算量分成的任务数")
+    parser.add_argument("--limit", type=int, default=400_000, help="统计 [0, limit) 中的素数")
+    args = parser.parse_args()
+
+    print(f"cpu_count={cpus}, chunks={args.chunks}, limit={args.limit}\n")
+    print(f"{'workers':>8} {'thread s':>10} {'speedup':>8} {'process s':>10} {'speedup':>8} {'efficiency':>11}")
+    thread_base = process_base = None
+    for workers in args.workers:
+        thread_s = measure(QThreadPoolExecutor, workers, args.chunks, args.limit, persistent_workers=True)
+        process_s = measure(QProcessPoolExecutor, workers, args.chunks, args.limit)
+        thread_base = thread_base or thread_s
+        process_base = process_base or process_s
+        process_speedup = process_base / process_s
+        print(
+            f"{workers:>8} {thread_s:>10.2f} {thread_base / thread_s:>7.2f}x {process_s:>10.2f} "
+            f"{process_speedup:>7.2f}x {process_speedup / workers:>10.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""逐项进度信号与合并进度报告的对比基准
+
+若干任务各自报告大量进度：
+- signal: 每处理一项 emit 一次自定义信号（队列连接到主线程的槽）
+- coalesced: 每处理一项调用 progress.report()，由共享的刷新调度按固定频率交付
+
+统计全部完成（含进度事件处理完毕）的总耗时、主线程执行进度回调的次数，以及
+单次 processEvents() 的最长耗时（界面卡顿的上限）。
+
+运行:
+    python -m benchmarks.bench_progress
+    python -m benchmarks.bench_progress --tasks 8 --items 50000
+"""
+
+import argparse
+import os
+import sys
+import time
+import warnings
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QObject, Qt, Signal
+from PySide6.QtWidgets import QApplication
+from qthreadwithreturn import QThreadPoolExecutor
+
+
+class ProgressSignal(QObject):
+    """逐项发射的进度信号"""
+
+    progressed = Signal(object)
+
+
+def signal_task(items: int, emitter: ProgressSignal) -> int:
+    for i in range(1, items + 1):
+        emitter.progressed.emit(i)
+    return items
+
+
+def coalesced_task(items: int, progress) -> int:
+    for i in range(1, items + 1):
+        progress.report(i)
+    return items
+
+
+def run(mode: str, tasks: int, items: int) -> dict:
+    app = QApplication.instance()
+    calls = [0]
+    final = []
+
+    def on_progress(value) -> None:
+        calls[0] += 1
+        if value == items:
+            final.append(value)
+
+    emitter = ProgressSignal()
+    emitter.progressed.connect(on_progress, Qt.QueuedConnection)
+    pool = QThreadPoolExecutor(max_workers=tasks, persistent_workers=True)
+    start = time.perf_counter()
+    futures = []
+    for _ in range(tasks):
+        if mode == "signal":
+            future = pool.submit(signal_task, items, emitter)
+        else:
+            future = pool.submit(coalesced_task, items)
+            future.add_progress_callback(on_progress)
+        futures.append(future)
+
+    max_stall = 0.0
+    deadline = time.monotonic() + 300
+    while (len(final) < tasks or not all(f.done() for f in futures)) and time.monotonic() < deadline:
+        before = time.perf_counter()
+        app.processEvents()
+        max_stall = max(max_stall, time.perf_counter() - before)
+        time.sleep(0.001)
+    elapsed = time.perf_counter() - start
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        pool.shutdown(wait=True)
+    return {"elapsed": elapsed, "calls": calls[0], "max_stall": max_stall}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=4, help="并发任务数")
+    parser.add_argument("--items", type=int, default=20000, help="每个任务报告的次数")
+    args = parser.parse_args()
+
+    QApplication.instance() or QApplication(sys.argv)
+
+    print(f"tasks={args.tasks}, items={args.items}\n")
+    print(f"{'mode':<10} {'total s':>8} {'callbacks':>10} {'max stall ms':>13}")
+    for mode in ("signal", "coalesced"):
+        stats = run(mode, args.tasks, args.items)
+        print(f"{mode:<10} {stats['elapsed']:>8.2f} {stats['calls']:>10} {stats['max_stall'] * 1000:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
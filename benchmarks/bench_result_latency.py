@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""result() 唤醒延迟基准
+
+测量任务函数返回到主线程 result() 返回之间的延迟（p50/p99），
+对比事件驱动的 result()（局部 QEventLoop）与旧实现的轮询等待
+（wait(1ms) + processEvents + 5/20/50ms 分段休眠）。
+
+运行:
+    python -m benchmarks.bench_result_latency
+    python -m benchmarks.bench_result_latency --samples 200
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+from qthreadwithreturn import QThreadWithReturn
+
+
+def legacy_poll_wait(future: QThreadWithReturn) -> None:
+    """旧版 result() 的主线程等待循环"""
+    app = QApplication.instance()
+    start_time = time.monotonic()
+    while not future.done() and not future._completion_event.wait(0.001):
+        if threading.current_thread() == threading.main_thread():
+            app.processEvents()
+        elapsed_ms = (time.monotonic() - start_time) * 1000
+        if elapsed_ms < 500:
+            time.sleep(0.005)
+        elif elapsed_ms < 2000:
+            time.sleep(0.020)
+        else:
+            time.sleep(0.050)
+
+
+def timed_task(duration: float) -> float:
+    time.sleep(duration)
+    return time.perf_counter()
+
+
+def percentile(samples, pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(samples: int, max_duration: float, legacy: bool) -> list:
+    """返回每次唤醒延迟（毫秒）"""
+    rng = random.Random(1234)
+    latencies = []
+    for _ in range(samples):
+        thread = QThreadWithReturn(timed_task, rng.uniform(0.0, max_duration))
+        thread.start()
+        if legacy:
+            legacy_poll_wait(thread)
+            returned_at = thread._result
+        else:
+            returned_at = thread.result()
+        latencies.append((time.perf_counter() - returned_at) * 1000)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--samples", type=int, default=100)
+    parser.add_argument(
+        "--max-duration", type=float, default=0.05, help="任务时长上限（秒），在 [0, 该值] 内均匀分布"
+    )
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    print(f"{'waiter':<14} {'p50 ms':>8} {'p99 ms':>8} {'mean ms':>8}")
+    for name, legacy in (("event-driven", False), ("legacy-poll", True)):
+        latencies = measure(args.samples, args.max_duration, legacy)
+        print(
+            f"{name:<14} {percentile(latencies, 50):>8.3f} "
+            f"{percentile(latencies, 99):>8.3f} {statistics.fmean(latencies):>8.3f}"
+        )
+    app.processEvents()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""进程池大缓冲区传输基准：管道 vs 共享内存
+
+分别测量工作进程返回一块 N 字节的结果、以及接收一块 N 字节的参数时每个任务的
+往返耗时。"pipe" 为 shared_memory_threshold=None（整体 pickle 后经管道传输），
+"shm" 为默认阈值（大缓冲区复制一次到共享内存，接收端得到视图）。
+
+运行:
+    python -m benchmarks.bench_shared_memory
+    python -m benchmarks.bench_shared_memory --sizes 1 16 64 --tasks 20
+"""
+
+import argparse
+import os
+import sys
+import time
+import warnings
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from qthreadwithreturn import QProcessPoolExecutor
+
+MIB = 1 << 20
+
+
+def make_result(size: int) -> bytes:
+    return bytes(size)
+
+
+def consume(data) -> int:
+    return len(data)
+
+
+def per_task_ms(pool, tasks: int, fn, *args) -> float:
+    start = time.perf_counter()
+    for _ in range(tasks):
+        pool.submit(fn, *args).result(timeout_ms=600_000)
+    return (time.perf_counter() - start) * 1000 / tasks
+
+
+def measure(threshold, size: int, tasks: int):
+    pool = QProcessPoolExecutor(max_workers=1, shared_memory_threshold=threshold)
+    try:
+        pool.submit(consume, b"").result(timeout_ms=600_000)  # 预热：启动工作进程
+        payload = bytes(size)
+        return per_task_ms(pool, tasks, make_result, size), per_task_ms(pool, tasks, consume, payload)
+    finally:
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            pool.shutdown(wait=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=float, nargs="+", default=[0.25, 1, 4, 16, 64], help="缓冲区大小（MiB）")
+    parser.add_argument("--tasks", type=int, default=10, help="每种大小执行的任务数")
+    args = parser.parse_args()
+
+    print(f"{'size MiB':>9} {'result pipe ms':>15} {'result shm ms':>14} {'arg pipe ms':>12} {'arg shm ms':>11}")
+    for size_mib in args.sizes:
+        size = int(size_mib * MIB)
+        result_pipe, arg_pipe = measure(None, size, args.tasks)
+        result_shm, arg_shm = measure(MIB, size, args.tasks)
+        print(f"{size_mib:>9g} {result_pipe:>15.2f} {result_shm:>14.2f} {arg_pipe:>12.2f} {arg_shm:>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
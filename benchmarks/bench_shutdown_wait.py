@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""shutdown(wait=True) 等待期间的开销基准
+
+提交若干个休眠任务后调用 shutdown(wait=True)，统计：
+- wall: 等待的总耗时
+- overshoot: 最后一个任务结束到 shutdown 返回的延迟
+- cpu: 等待期间进程的 CPU 时间（任务只休眠，几乎全部来自等待本身）
+
+阻塞在池级别的完成通知上时 CPU 时间接近 0；旧实现每 10ms 复制一次任务集合、
+逐个 wait(50) 并处理事件，CPU 时间随等待时长和任务数增长。
+
+运行:
+    python -m benchmarks.bench_shutdown_wait
+    python -m benchmarks.bench_shutdown_wait --tasks 256 --workers 32 --seconds 2
+"""
+
+import argparse
+import os
+import sys
+import time
+import warnings
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+from qthreadwithreturn import QThreadPoolExecutor
+
+
+def sleep_task(seconds: float) -> float:
+    time.sleep(seconds)
+    return time.perf_counter()
+
+
+def run(tasks: int, workers: int, seconds: float, persistent: bool) -> dict:
+    pool = QThreadPoolExecutor(max_workers=workers, persistent_workers=persistent)
+    futures = [pool.submit(sleep_task, seconds) for _ in range(tasks)]
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        pool.shutdown(wait=True)
+    cpu = time.process_time() - cpu_start
+    end = time.perf_counter()
+
+    last_finished = max(f.result() for f in futures)
+    return {
+        "wall": end - wall_start,
+        "overshoot": end - last_finished,
+        "cpu": cpu,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=1.0, help="每个任务的休眠时间")
+    args = parser.parse_args()
+
+    QApplication.instance() or QApplication(sys.argv)
+
+    print(f"{'mode':<12} {'wall ms':>9} {'overshoot ms':>13} {'cpu ms':>8}")
+    for name, persistent in (("per-task", False), ("persistent", True)):
+        stats = run(args.tasks, args.workers, args.seconds, persistent)
+        print(
+            f"{name:<12} {stats['wall'] * 1000:>9.1f} {stats['overshoot'] * 1000:>13.1f} "
+            f"{stats['cpu'] * 1000:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""线程、线程池与回调热路径的基准套件
+
+对比以下后端在同一组场景下的表现，并输出机器可读的 JSON 以便跨版本追踪回归：
+- qt-per-task: 有 Qt 应用（offscreen），每个任务一个 QThread
+- qt-persistent: 有 Qt 应用，常驻工作线程（persistent_workers=True）
+- headless-per-task / headless-persistent: 没有 Qt 应用（纯 Python 后端）
+- stdlib: concurrent.futures.ThreadPoolExecutor
+
+场景:
+- tiny_tasks: 提交 N 个空任务并等待全部结果，统计吞吐量（任务/秒）与单次 submit() 耗时
+- result_wakeup: 任务返回到阻塞在 result() 中的调用方被唤醒的延迟
+- as_completed: 提交 N 个空任务并用 as_completed 按完成顺序取回的吞吐量
+- callback_latency: 任务返回到完成回调开始执行的延迟
+- shutdown: 4 * workers 个 5ms 任务排队时 shutdown(wait=True) 的耗时
+- peak_rss_mb: 每个后端在独立子进程中运行，结束时的峰值常驻内存
+
+运行:
+    python -m benchmarks.bench_suite
+    python -m benchmarks.bench_suite --json results.json
+    python -m benchmarks.bench_suite --quick --backends stdlib headless-persistent
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import warnings
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+BACKENDS = ("qt-per-task", "qt-persistent", "headless-per-task", "headless-persistent", "stdlib")
+
+# 等待单个结果的上限（秒），只用于防止基准挂起
+_WAIT_S = 60
+
+
+def tiny(x=None):
+    return x
+
+
+def stamp_after(seconds: float) -> float:
+    """休眠后返回时间戳，确保调用方已进入等待状态"""
+    time.sleep(seconds)
+    return time.perf_counter()
+
+
+def latency_summary(samples) -> dict:
+    """延迟样本（秒）→ 微秒统计"""
+    ordered = sorted(samples)
+
+    def pick(q):
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1e6
+
+    return {
+        "p50_us": pick(0.5),
+        "p99_us": pick(0.99),
+        "mean_us": statistics.fmean(ordered) * 1e6,
+        "max_us": ordered[-1] * 1e6,
+    }
+
+
+def peak_rss_mb() -> float:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return float("nan")
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 以 KB 为单位，macOS 以字节为单位
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+class QtPoolBackend:
+    """QThreadPoolExecutor 适配器"""
+
+    def __init__(self, persistent: bool, with_app: bool):
+        from qthreadwithreturn import QThreadPoolExecutor
+
+        self._executor_class = QThreadPoolExecutor
+        self._persistent = persistent
+        self._app = None
+        if with_app:
+            from PySide6.QtWidgets import QApplication
+
+            self._app = QApplication.instance() or QApplication(sys.argv)
+
+    def make_pool(self, workers: int):
+        return self._executor_class(max_workers=workers, persistent_workers=self._persistent)
+
+    def submit(self, pool, fn, *args):
+        return pool.submit(fn, *args)
+
+    def result(self, future):
+        return future.result(timeout_ms=_WAIT_S * 1000)
+
+    def as_completed(self, futures):
+        return self._executor_class.as_completed(futures, timeout_ms=_WAIT_S * 1000)
+
+    def add_callback(self, future, callback):
+        future.add_done_callback(callback)
+
+    def shutdown(self, pool):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            pool.shutdown(wait=True)
+
+    def pump(self):
+        if self._app is not None:
+            self._app.processEvents()
+
+
+class StdlibBackend:
+    """concurrent.futures.ThreadPoolExecutor 适配器"""
+
+    def __init__(self):
+        import concurrent.futures
+
+        self._futures = concurrent.futures
+
+    def make_pool(self, workers: int):
+        return self._futures.ThreadPoolExecutor(max_workers=workers)
+
+    def submit(self, pool, fn, *args):
+        return pool.submit(fn, *args)
+
+    def result(self, future):
+        return future.result(timeout=_WAIT_S)
+
+    def as_completed(self, futures):
+        return self._futures.as_completed(futures, timeout=_WAIT_S)
+
+    def add_callback(self, future, callback):
+        future.add_done_callback(lambda f: callback(f.result()))
+
+    def shutdown(self, pool):
+        pool.shutdown(wait=True)
+
+    def pump(self):
+        pass
+
+
+def make_backend(name: str):
+    if name == "stdlib":
+        return StdlibBackend()
+    return QtPoolBackend(persistent=name.endswith("persistent"), with_app=name.startswith("qt-"))
+
+
+def bench_tiny_tasks(backend, tasks: int, workers: int) -> dict:
+    pool = backend.make_pool(workers)
+    submit_times = []
+    start = time.perf_counter()
+    futures = []
+    for i in range(tasks):
+        t0 = time.perf_counter()
+        futures.append(backend.submit(pool, tiny, i))
+        submit_times.append(time.perf_counter() - t0)
+    for future in futures:
+        backend.result(future)
+    elapsed = time.perf_counter() - start
+    backend.shutdown(pool)
+    return {"tasks_per_s": tasks / elapsed, "submit": latency_summary(submit_times)}
+
+
+def bench_result_wakeup(backend, repeat: int, workers: int) -> dict:
+    pool = backend.make_pool(workers)
+    samples = []
+    for _ in range(repeat):
+        returned_at = backend.result(backend.submit(pool, stamp_after, 0.001))
+        samples.append(time.perf_counter() - returned_at)
+    backend.shutdown(pool)
+    return latency_summary(samples)
+
+
+def bench_as_completed(backend, tasks: int, workers: int) -> dict:
+    pool = backend.make_pool(workers)
+    start = time.perf_counter()
+    futures = [backend.submit(pool, tiny, i) for i in range(tasks)]
+    count = sum(1 for _ in backend.as_completed(futures))
+    elapsed = time.perf_counter() - start
+    backend.shutdown(pool)
+    assert count == tasks
+    return {"tasks_per_s": tasks / elapsed}
+
+
+def bench_callback_latency(backend, repeat: int, workers: int) -> dict:
+    pool = backend.make_pool(workers)
+    samples = []
+    for _ in range(repeat):
+        seen = []
+        future = backend.submit(pool, stamp_after, 0.001)
+        backend.add_callback(future, lambda returned_at: seen.append(time.perf_counter() - returned_at))
+        deadline = time.monotonic() + _WAIT_S
+        while not seen and time.monotonic() < deadline:
+            backend.pump()
+            time.sleep(0)
+        samples.extend(seen)
+    backend.shutdown(pool)
+    return latency_summary(samples)
+
+
+def bench_shutdown(backend, workers: int) -> dict:
+    pool = backend.make_pool(workers)
+    futures = [backend.submit(pool, time.sleep, 0.005) for _ in range(4 * workers)]
+    start = time.perf_counter()
+    backend.shutdown(pool)
+    elapsed = time.perf_counter() - start
+    done = sum(1 for f in futures if f.done())
+    # 4 轮 5ms 任务是下限
+    return {"ms": elapsed * 1000, "ideal_ms": 20.0, "completed": done}
+
+
+def run_backend(name: str, tasks: int, repeat: int, workers: int) -> dict:
+    """在当前进程中运行一个后端的全部场景"""
+    backend = make_backend(name)
+    results = {
+        "tiny_tasks": bench_tiny_tasks(backend, tasks, workers),
+        "result_wakeup": bench_result_wakeup(backend, repeat, workers),
+        "as_completed": bench_as_completed(backend, tasks, workers),
+        "callback_latency": bench_callback_latency(backend, repeat, workers),
+        "shutdown": bench_shutdown(backend, workers),
+    }
+    results["peak_rss_mb"] = peak_rss_mb()
+    return results
+
+
+def run_backend_in_subprocess(name: str, args) -> dict:
+    """每个后端使用独立的子进程：无 Qt 模式不能存在 QApplication，峰值内存也互不影响"""
+    command = [
+        sys.executable, "-m", "benchmarks.bench_suite", "--run-backend", name,
+        "--tasks", str(args.tasks), "--repeat", str(args.repeat), "--workers", str(args.workers),
+    ]
+    completed = subprocess.run(
+        command, cwd=project_root, capture_output=True, text=True, timeout=1800
+    )
+    lines = completed.stdout.strip().splitlines()
+    if completed.returncode != 0 or not lines:
+        return {"error": (completed.stderr.strip().splitlines() or ["no output"])[-1]}
+    return json.loads(lines[-1])
+
+
+def environment() -> dict:
+    try:
+        import PySide6
+
+        pyside_version = PySide6.__version__
+    except ImportError:
+        pyside_version = None
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=project_root, capture_output=True, text=True, timeout=10,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "pyside6": pyside_version,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+    }
+
+
+ROWS = (
+    ("tiny tasks/s", ("tiny_tasks", "tasks_per_s"), "{:.0f}"),
+    ("submit p50 us", ("tiny_tasks", "submit", "p50_us"), "{:.1f}"),
+    ("submit p99 us", ("tiny_tasks", "submit", "p99_us"), "{:.1f}"),
+    ("result() wake p50 us", ("result_wakeup", "p50_us"), "{:.0f}"),
+    ("result() wake p99 us", ("result_wakeup", "p99_us"), "{:.0f}"),
+    ("as_completed tasks/s", ("as_completed", "tasks_per_s"), "{:.0f}"),
+    ("callback p50 us", ("callback_latency", "p50_us"), "{:.0f}"),
+    ("callback p99 us", ("callback_latency", "p99_us"), "{:.0f}"),
+    ("shutdown ms", ("shutdown", "ms"), "{:.1f}"),
+    ("peak RSS MB", ("peak_rss_mb",), "{:.1f}"),
+)
+
+
+def print_table(results: dict) -> None:
+    names = list(results)
+    width = max(len(name) for name in names) + 2
+    print(f"{'':<22}" + "".join(f"{name:>{width}}" for name in names))
+    for label, path, fmt in ROWS:
+        cells = []
+        for name in names:
+            value = results[name]
+            for key in path:
+                value = value.get(key) if isinstance(value, dict) else None
+            cells.append(fmt.format(value) if isinstance(value, (int, float)) else "-")
+        print(f"{label:<22}" + "".join(f"{cell:>{width}}" for cell in cells))
+    for name in names:
+        if "error" in results[name]:
+            print(f"{name}: {results[name]['error']}", file=sys.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--tasks", type=int, default=5000, help="吞吐量场景的任务数")
+    parser.add_argument("--repeat", type=int, default=300, help="延迟场景的采样次数")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--quick", action="store_true", help="缩小规模，用于冒烟检查")
+    parser.add_argument("--json", metavar="PATH", help="把结果写入 JSON 文件（- 表示标准输出）")
+    parser.add_argument("--run-backend", choices=BACKENDS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.quick:
+        args.tasks, args.repeat = 500, 50
+
+    if args.run_backend:
+        # 子进程：只输出一行 JSON
+        print(json.dumps(run_backend(args.run_backend, args.tasks, args.repeat, args.workers)))
+        return
+
+    results = {}
+    for name in args.backends:
+        print(f"running {name}...", file=sys.stderr)
+        results[name] = run_backend_in_subprocess(name, args)
+
+    report = {
+        "environment": environment(),
+        "config": {"tasks": args.tasks, "repeat": args.repeat, "workers": args.workers},
+        "results": results,
+    }
+    if args.json == "-":
+        print(json.dumps(report, indent=2))
+        return
+    print_table(results)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"\nwrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""线程池待处理队列的调度开销基准
+
+测量队列中积压 1k ~ 1M 个任务时，每个任务的入队 + 出队开销，
+对比旧实现（list.append + list.pop(0)）与 _TaskQueue。
+队列实现为 O(1) 时，每任务开销应与积压数量无关。
+
+运行:
+    python -m benchmarks.bench_task_queue
+    python -m benchmarks.bench_task_queue --sizes 1000 10000 --pool
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from qthreadwithreturn._task_queue import _TaskQueue
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+LIST_MAX_SIZE = 100_000  # list.pop(0) 为 O(n)，更大的规模耗时过长
+
+
+def bench_list(n: int) -> float:
+    """旧实现：list.append + list.pop(0)，返回每任务纳秒数"""
+    items = [object() for _ in range(n)]
+    queue = []
+    start = time.perf_counter_ns()
+    for item in items:
+        queue.append(item)
+    while queue:
+        queue.pop(0)
+    return (time.perf_counter_ns() - start) / n
+
+
+def bench_task_queue(n: int) -> float:
+    """_TaskQueue.append + popleft，返回每任务纳秒数"""
+    items = [object() for _ in range(n)]
+    queue = _TaskQueue()
+    start = time.perf_counter_ns()
+    for item in items:
+        queue.append(item)
+    while queue:
+        queue.popleft()
+    return (time.perf_counter_ns() - start) / n
+
+
+def bench_pool_submit(n: int) -> float:
+    """向已满的常驻线程池提交 n 个任务，返回每次 submit 的纳秒数"""
+    import threading
+
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtWidgets import QApplication
+    from qthreadwithreturn import QThreadPoolExecutor
+
+    app = QApplication.instance() or QApplication(sys.argv)
+    gate = threading.Event()
+    pool = QThreadPoolExecutor(max_workers=1, persistent_workers=True)
+    pool.submit(gate.wait)  # 占住唯一的工作线程，后续任务全部排队
+
+    start = time.perf_counter_ns()
+    for _ in range(n):
+        pool.submit(int)
+    elapsed = time.perf_counter_ns() - start
+
+    gate.set()
+    pool.shutdown(wait=False, cancel_futures=True)
+    app.processEvents()
+    return elapsed / n
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument(
+        "--pool", action="store_true", help="同时测量向已满线程池 submit 的开销（需要 PySide6）"
+    )
+    args = parser.parse_args()
+
+    print(f"{'queued':>10} {'list ns/task':>14} {'_TaskQueue ns/task':>20}")
+    for n in args.sizes:
+        list_ns = f"{bench_list(n):.1f}" if n <= LIST_MAX_SIZE else "-"
+        print(f"{n:>10} {list_ns:>14} {bench_task_queue(n):>20.1f}")
+
+    if args.pool:
+        print()
+        print(f"{'queued':>10} {'submit ns/task':>16}")
+        for n in args.sizes:
+            if n > LIST_MAX_SIZE:
+                continue  # 每个任务都是一个 QObject，百万级内存开销过大
+            print(f"{n:>10} {bench_pool_submit(n):>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""任务完成后 QThread 回收基准
+
+以固定速率（默认 10k 任务/秒）启动短任务，统计同时存活的 QThread 对象数量
+（峰值/均值），对比按顺序排在回调之后立即清理与旧实现的固定 50ms 延迟清理
+（QTimer.singleShot(50, _perform_delayed_cleanup)）。
+
+单个 QThread 的创建开销决定了可达到的速率上限，实际速率会一并输出。
+
+运行:
+    python -m benchmarks.bench_thread_cleanup
+    python -m benchmarks.bench_thread_cleanup --rate 5000 --seconds 3
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# 添加项目根目录到 Python 路径
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QEventLoop, QThread, QTimer
+from PySide6.QtWidgets import QApplication
+from qthreadwithreturn import QThreadWithReturn, qthread_with_return
+
+
+class CountingQThread(QThread):
+    """统计存活数量的 QThread（C++ 对象销毁时计数减一）"""
+
+    live = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        CountingQThread.live += 1
+        self.destroyed.connect(CountingQThread._on_destroyed)
+
+    @staticmethod
+    def _on_destroyed(*_):
+        CountingQThread.live -= 1
+
+
+def legacy_on_thread_finished(self) -> None:
+    """旧版 _on_thread_finished：固定延迟 50ms 后清理"""
+    self._thread_really_finished = True
+    QTimer.singleShot(50, self._perform_delayed_cleanup)
+
+
+def noop() -> None:
+    return None
+
+
+def run(rate: int, seconds: float, legacy: bool) -> dict:
+    original_qthread = qthread_with_return.QThread
+    original_handler = QThreadWithReturn._on_thread_finished
+    qthread_with_return.QThread = CountingQThread
+    if legacy:
+        QThreadWithReturn._on_thread_finished = legacy_on_thread_finished
+    CountingQThread.live = 0
+
+    futures = []
+    samples = []
+    loop = QEventLoop()
+    start = time.perf_counter()
+
+    def produce():
+        elapsed = time.perf_counter() - start
+        if elapsed >= seconds:
+            producer.stop()
+            return
+        # 追赶目标速率，单次最多启动 200 个，避免事件循环长时间得不到处理
+        due = min(int(rate * elapsed) - len(futures), 200)
+        for _ in range(due):
+            thread = QThreadWithReturn(noop)
+            thread.start()
+            futures.append(thread)
+
+    def sample():
+        samples.append(CountingQThread.live)
+        if not producer.isActive() and all(f.done() for f in futures[-50:]) and len(samples) > 10:
+            # 生产结束后再观察 200ms 的回收情况
+            QTimer.singleShot(200, loop.quit)
+            sampler.timeout.disconnect(sample)
+            sampler.timeout.connect(lambda: samples.append(CountingQThread.live))
+
+    producer = QTimer()
+    producer.timeout.connect(produce)
+    producer.start(1)
+    sampler = QTimer()
+    sampler.timeout.connect(sample)
+    sampler.start(5)
+    try:
+        loop.exec()
+    finally:
+        producer.stop()
+        sampler.stop()
+        qthread_with_return.QThread = original_qthread
+        QThreadWithReturn._on_thread_finished = original_handler
+
+    duration = min(seconds, time.perf_counter() - start)
+    return {
+        "tasks": len(futures),
+        "rate": len(futures) / duration,
+        "peak": max(samples),
+        "mean": statistics.fmean(samples),
+        "final": samples[-1],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rate", type=int, default=10_000, help="目标启动速率（任务/秒）")
+    parser.add_argument("--seconds", type=float, default=2.0)
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    print(f"{'cleanup':<12} {'tasks':>8} {'tasks/s':>9} {'peak':>7} {'mean':>8} {'final':>7}")
+    for name, legacy in (("ordered", False), ("fixed-50ms", True)):
+        stats = run(args.rate, args.seconds, legacy)
+        print(
+            f"{name:<12} {stats['tasks']:>8} {stats['rate']:>9.0f} {stats['peak']:>7} "
+            f"{stats['mean']:>8.1f} {stats['final']:>7}"
+        )
+        # 等待上一轮遗留的线程全部退出
+        deadline = time.monotonic() + 2
+        while time.monotonic() < deadline:
+            app.processEvents()
+            time.sleep(0.01)
+
+
+if __name__ == "__main__":
+    main()
@@ -766,8 +766,7 @@ class ThreadDemoWindow(QMainWindow):
 
         # 在另一个线程中执行批量任务以避免阻塞UI
         def run_batch():
-            futures = [self.thread_pool.submit(square, x) for x in numbers]
-            results = [f.result() for f in futures]
+            results = list(self.thread_pool.map(square, numbers))
             self.log_widget.add_log(f"批量任务结果: {results}", "SUCCESS")
             self.completed_task_count += len(results)
 
@@ -1,9 +1,60 @@
-from qthreadwithreturn import qthread_with_return
-from qthreadwithreturn.qthread_with_return import QThreadWithReturn
-from qthreadwithreturn.qthread_pool_executor import QThreadPoolExecutor
+"""QThreadWithReturn: 带返回值的 Qt 线程与线程池。
+
+公开名称在首次访问时才导入对应模块（PEP 562），``import qthreadwithreturn``
+本身不会加载 PySide6；只使用 CancellationToken 时也不需要 Qt。
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from qthreadwithreturn import qthread_with_return
+    from qthreadwithreturn._callbacks import set_callback_time_budget
+    from qthreadwithreturn._item_batches import set_item_batching
+    from qthreadwithreturn.cancellation import CancellationToken
+    from qthreadwithreturn.progress import ProgressReporter, set_progress_rate
+    from qthreadwithreturn.qprocess_pool_executor import QProcessPoolExecutor
+    from qthreadwithreturn.qthread_pool_executor import QThreadPoolExecutor
+    from qthreadwithreturn.qthread_with_return import QThreadWithReturn
 
 __all__ = [
+    "CancellationToken",
+    "ProgressReporter",
+    "QProcessPoolExecutor",
     "QThreadWithReturn",
     "QThreadPoolExecutor",
     "qthread_with_return",
+    "set_callback_time_budget",
+    "set_item_batching",
+    "set_progress_rate",
 ]
+
+# 公开名称 -> 定义它的模块；值为 None 表示名称本身就是子模块
+_LAZY_ATTRIBUTES = {
+    "CancellationToken": "qthreadwithreturn.cancellation",
+    "ProgressReporter": "qthreadwithreturn.progress",
+    "QProcessPoolExecutor": "qthreadwithreturn.qprocess_pool_executor",
+    "QThreadWithReturn": "qthreadwithreturn.qthread_with_return",
+    "QThreadPoolExecutor": "qthreadwithreturn.qthread_pool_executor",
+    "qthread_with_return": None,
+    "set_callback_time_budget": "qthreadwithreturn._callbacks",
+    "set_item_batching": "qthreadwithreturn._item_batches",
+    "set_progress_rate": "qthreadwithreturn.progress",
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name = _LAZY_ATTRIBUTES[name]
+    if module_name is None:
+        value = importlib.import_module(f"{__name__}.{name}")
+    else:
+        value = getattr(importlib.import_module(module_name), name)
+    # 缓存到模块字典，之后的访问不再经过 __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,193 @@
+"""主线程回调批量分发。
+
+任务完成后的回调需要在主线程中执行。逐个使用 QTimer.singleShot(0, ...) 投递时，
+每秒上千个任务完成会向 GUI 事件队列塞入同样数量的定时器事件，导致界面卡顿。
+这里把待执行的回调收集到一个队列中，每次只向主线程投递一个事件，在该事件中
+批量执行，并受单次时间预算限制，超出预算的回调留到下一个事件，让重绘和输入
+事件得以穿插处理。
+
+另外提供回调签名检查的缓存：同一个函数（或同一个方法）被注册到成千上万个
+future 上时，只需执行一次 inspect.signature。
+"""
+
+import inspect
+import sys
+import threading
+import time
+import types
+import weakref
+from collections import deque
+from typing import Any, Callable, Optional
+
+from PySide6.QtCore import QCoreApplication, QObject, Qt, Signal
+
+from qthreadwithreturn._qtapp import app_instance
+
+# 单次批量执行回调的默认时间预算（毫秒），约为 60Hz 下半帧
+DEFAULT_CALLBACK_TIME_BUDGET_MS = 8.0
+
+_dispatcher: Optional["_CallbackDispatcher"] = None
+_dispatcher_lock = threading.Lock()
+_time_budget_ms: float = DEFAULT_CALLBACK_TIME_BUDGET_MS
+
+
+# 回调签名缓存：以函数对象为弱引用键，函数被回收时条目随之删除。
+# 普通函数与绑定方法分开存放，同一个函数作为方法绑定后少一个参数。
+_signature_cache: "weakref.WeakKeyDictionary[Any, int]" = weakref.WeakKeyDictionary()
+_bound_signature_cache: "weakref.WeakKeyDictionary[Any, int]" = weakref.WeakKeyDictionary()
+_signature_cache_lock = threading.Lock()
+
+
+def set_callback_time_budget(budget_ms: float) -> None:
+    """设置主线程单次批量执行回调的时间预算。
+
+    回调在主线程中按提交顺序批量执行，单次执行超过该预算后，剩余回调留到
+    下一轮事件循环，以免长时间占用主线程导致界面无法重绘。单个回调总会完整
+    执行，因此实际耗时可能略超预算。
+
+    Args:
+        budget_ms: 时间预算（毫秒），必须大于 0。
+
+    Raises:
+        ValueError: 当 budget_ms <= 0 时。
+
+    Example:
+        >>> from qthreadwithreturn import set_callback_time_budget
+        >>> set_callback_time_budget(4)  # 高刷新率界面使用更小的预算
+    """
+    global _time_budget_ms
+    if budget_ms <= 0:
+        raise ValueError("budget_ms must be greater than 0")
+    _time_budget_ms = float(budget_ms)
+
+
+class _CallbackDispatcher(QObject):
+    """每个 Qt 应用一个的主线程回调分发器。
+
+    通过队列连接到自身的信号投递分发事件：每次 emit 在主线程事件队列中
+    只产生一个事件，事件对象由 Qt 管理。
+    """
+
+    _drain_requested = Signal()
+
+    def __init__(self, app: QCoreApplication):
+        super().__init__()
+        if self.thread() is not app.thread():
+            self.moveToThread(app.thread())
+        self._drain_requested.connect(self._drain, Qt.QueuedConnection)
+        self._app_ref = weakref.ref(app)
+        self._queue: deque = deque()  # [(callback, args), ...]
+        self._lock = threading.Lock()
+        self._posted = False  # 是否已有尚未开始处理的分发事件
+
+    def schedule(self, callback: Callable, args: tuple) -> None:
+        with self._lock:
+            self._queue.append((callback, args))
+            if self._posted:
+                return
+            self._posted = True
+        self._drain_requested.emit()
+
+    def _drain(self) -> None:
+        # 事件一开始处理就清除标记：回调运行嵌套事件循环（如在完成回调中调用
+        # result()）时，期间排入的回调会投递新的分发事件，由嵌套循环执行
+        with self._lock:
+            self._posted = False
+        deadline = time.perf_counter() + _time_budget_ms / 1000.0
+        queue = self._queue
+        while True:
+            with self._lock:
+                if not queue:
+                    return
+                callback, args = queue.popleft()
+            try:
+                callback(*args)
+            except Exception as e:
+                print(f"Error in dispatched callback: {e}", file=sys.stderr)
+            if time.perf_counter() >= deadline:
+                break
+
+        # 超出时间预算：重新投递到事件队列末尾，先让已排队的重绘和输入事件执行
+        with self._lock:
+            if not queue or self._posted:
+                return
+            self._posted = True
+        self._drain_requested.emit()
+
+
+def _get_dispatcher(app: QCoreApplication) -> "_CallbackDispatcher":
+    global _dispatcher
+    dispatcher = _dispatcher
+    if dispatcher is not None and dispatcher._app_ref() is app:
+        return dispatcher
+    with _dispatcher_lock:
+        # 首次使用或 Qt 应用被重新创建
+        if _dispatcher is None or _dispatcher._app_ref() is not app:
+            _dispatcher = _CallbackDispatcher(app)
+        return _dispatcher
+
+
+def call_in_main_thread(callback: Callable, *args: Any) -> None:
+    """在主线程中异步执行 callback(*args)；没有 Qt 应用时直接执行。
+
+    callback 抛出的异常会被捕获并输出到 stderr。
+    """
+    app = app_instance()
+    if app is None:
+        try:
+            callback(*args)
+        except Exception as e:
+            print(f"Error in dispatched callback: {e}", file=sys.stderr)
+        return
+    _get_dispatcher(app).schedule(callback, args)
+
+
+def _count_required_params(callback: Callable) -> int:
+    params = list(inspect.signature(callback).parameters.values())
+
+    # 过滤掉self参数（类方法的第一个参数）
+    if params and params[0].name == "self":
+        params = params[1:]
+
+    # 计算必需参数的数量（没有默认值的参数）；有 *args/**kwargs 时即为最小参数数量
+    return sum(
+        1
+        for p in params
+        if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) and p.default is p.empty
+    )
+
+
+def validate_callback(callback: Callable, name: str) -> int:
+    """验证回调函数签名并返回必需参数数量，结果按底层函数对象缓存。
+
+    绑定方法以其 __func__ 为键，因此同一方法在不同实例上注册也只检查一次。
+    无法弱引用的可调用对象（如部分内置函数）不缓存，每次重新检查。
+
+    Raises:
+        TypeError: 如果callback不可调用。
+        ValueError: 如果无法检查callback签名。
+    """
+    if not callable(callback):
+        raise TypeError(f"{name} must be callable")
+
+    if isinstance(callback, types.MethodType):
+        cache, key = _bound_signature_cache, callback.__func__
+    else:
+        cache, key = _signature_cache, callback
+
+    try:
+        return cache[key]
+    except (KeyError, TypeError):  # TypeError: 不可哈希或不支持弱引用
+        pass
+
+    try:
+        count = _count_required_params(callback)
+    except Exception as e:
+        raise ValueError(f"Cannot inspect {name} signature: {e}") from e
+
+    try:
+        with _signature_cache_lock:
+            cache[key] = count
+    except TypeError:
+        pass
+    return count
@@ -0,0 +1,140 @@
+"""进程内共享的截止时间调度器。
+
+所有设置了超时的任务都向同一个调度器登记截止时间，由一个守护线程按到期顺序
+触发，而不是每个任务各自创建一个 QTimer（Qt 模式）或一个休眠线程（无 Qt 模式）。
+
+截止时间保存在最小堆中。取消为 O(1)：只清除条目中的回调及其参数，任务对象
+随即可以被回收；残留的空条目在到达堆顶时丢弃，或在空条目过半时整体压缩。
+
+Qt 模式下到期的回调只是把处理投递到主线程，直接在调度线程中执行。无 Qt 应用时
+回调会直接运行用户代码（超时处理和完成回调、产出项回调、进度回调），因此交给
+共享工作线程（_headless）执行：一个慢回调不会推迟进程内其它的截止时间，等待另一个
+超时任务的完成回调也不会死锁。
+"""
+
+import functools
+import heapq
+import itertools
+import sys
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+from qthreadwithreturn import _headless
+from qthreadwithreturn._qtapp import app_instance
+
+# 堆中条目少于该值时不做压缩
+_COMPACT_MIN_SIZE = 64
+
+
+class _Deadline:
+    """已登记的截止时间，cancel() 为 O(1)"""
+
+    __slots__ = ("callback", "args", "_scheduler")
+
+    def __init__(self, callback: Callable[..., Any], args: tuple, scheduler: "_DeadlineScheduler"):
+        self.callback: Optional[Callable[..., Any]] = callback
+        self.args: tuple = args
+        self._scheduler = scheduler
+
+    def cancel(self) -> None:
+        """取消尚未触发的截止时间；已触发或已取消时无操作"""
+        if self.callback is not None:
+            self.callback = None
+            self.args = ()
+            # 只用于决定何时压缩堆，不要求精确
+            self._scheduler._cancelled += 1
+
+    def active(self) -> bool:
+        return self.callback is not None
+
+
+class _DeadlineScheduler:
+    """单个守护线程驱动的截止时间调度器"""
+
+    def __init__(self):
+        self._heap: List[tuple] = []  # [(deadline, seq, _Deadline), ...]
+        self._cancelled = 0  # 堆中已取消条目的（近似）数量
+        self._seq = itertools.count()
+        self._condition = threading.Condition(threading.Lock())
+        self._thread: Optional[threading.Thread] = None
+
+    def call_later(self, delay_s: float, callback: Callable[..., Any], *args: Any) -> _Deadline:
+        """delay_s 秒后调用 callback(*args)，返回可取消的句柄。
+
+        存在 Qt 应用时在调度线程中调用，否则在共享工作线程中调用。
+        """
+        entry = _Deadline(callback, args, self)
+        deadline = time.monotonic() + max(0.0, delay_s)
+        with self._condition:
+            heap = self._heap
+            if len(heap) >= _COMPACT_MIN_SIZE and 2 * self._cancelled > len(heap):
+                heap[:] = [item for item in heap if item[2].callback is not None]
+                heapq.heapify(heap)
+                self._cancelled = 0
+            heapq.heappush(heap, (deadline, next(self._seq), entry))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="QThreadWithReturn-deadlines", daemon=True
+                )
+                self._thread.start()
+            elif heap[0][2] is entry:
+                # 新的截止时间早于调度线程正在等待的时间
+                self._condition.notify()
+        return entry
+
+    def __len__(self) -> int:
+        """堆中条目数（含尚未丢弃的已取消条目）"""
+        return len(self._heap)
+
+    def _run(self) -> None:
+        heap = self._heap
+        while True:
+            with self._condition:
+                while heap and heap[0][2].callback is None:
+                    heapq.heappop(heap)
+                    self._cancelled = max(0, self._cancelled - 1)
+                if not heap:
+                    self._condition.wait()
+                    continue
+                delay = heap[0][0] - time.monotonic()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+                entry = heapq.heappop(heap)[2]
+                callback, args = entry.callback, entry.args
+                entry.callback, entry.args = None, ()
+            if callback is None:
+                continue
+            if app_instance() is None:
+                _headless.run_in_worker(functools.partial(_fire, callback, args))
+            else:
+                _fire(callback, args)
+            del callback, args
+
+
+def _fire(callback: Callable[..., Any], args: tuple) -> None:
+    """执行到期的回调，异常只记录不传播"""
+    try:
+        callback(*args)
+    except Exception as e:
+        print(f"Error in deadline callback: {e}", file=sys.stderr)
+
+
+_scheduler: Optional[_DeadlineScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> _DeadlineScheduler:
+    """返回进程内共享的调度器（首次使用时创建）"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                _scheduler = _DeadlineScheduler()
+    return _scheduler
+
+
+def call_later(delay_s: float, callback: Callable[..., Any], *args: Any) -> _Deadline:
+    """delay_s 秒后调用 callback(*args)（见 _DeadlineScheduler.call_later）"""
+    return get_scheduler().call_later(delay_s, callback, *args)
@@ -0,0 +1,72 @@
+"""无 Qt 应用（headless）模式的纯 Python 执行后端。
+
+没有 QApplication 时不存在事件循环，QThread/QTimer 与跨线程信号都无从发挥作用。
+此时任务交给进程内共享的一组 threading 工作线程执行，不分配任何 Qt 对象；
+超时由共享的截止时间调度器（_deadlines）触发。
+
+工作线程按需增长：没有空闲线程时为新任务创建线程，因此互相等待的任务不会因
+线程数不足而死锁；空闲超过 _IDLE_TIMEOUT_S 秒的线程自动退出。
+"""
+
+import itertools
+import queue
+import sys
+import threading
+from typing import Callable, Optional
+
+# 工作线程空闲多久后退出（秒）
+_IDLE_TIMEOUT_S = 10.0
+
+
+class _WorkerSet:
+    """按需增长、空闲回收的共享工作线程集合。"""
+
+    def __init__(self, idle_timeout: float = _IDLE_TIMEOUT_S):
+        self._idle_timeout = idle_timeout
+        self._tasks: "queue.SimpleQueue[Callable[[], None]]" = queue.SimpleQueue()
+        # 信号量计数 = 尚未被预订的空闲线程数
+        self._idle = threading.Semaphore(0)
+        self._counter = itertools.count(1)
+
+    def submit(self, task: Callable[[], None]) -> None:
+        """在工作线程中执行 task()；task 抛出的异常输出到 stderr"""
+        self._tasks.put(task)
+        # 预订一个空闲线程；没有空闲线程时创建新线程
+        if self._idle.acquire(blocking=False):
+            return
+        threading.Thread(
+            target=self._work,
+            name=f"QThreadWithReturn-headless-{next(self._counter)}",
+            daemon=True,
+        ).start()
+
+    def _work(self) -> None:
+        while True:
+            try:
+                task = self._tasks.get(timeout=self._idle_timeout)
+            except queue.Empty:
+                # 成功取走一个未预订的空闲名额才退出；否则已有任务预订了本线程
+                if self._idle.acquire(blocking=False):
+                    return
+                continue
+            try:
+                task()
+            except Exception as e:
+                print(f"Error in headless worker: {e}", file=sys.stderr)
+            del task
+            self._idle.release()
+
+
+_worker_set: Optional[_WorkerSet] = None
+_init_lock = threading.Lock()
+
+
+def run_in_worker(task: Callable[[], None]) -> None:
+    """在共享工作线程中执行 task()"""
+    global _worker_set
+    if _worker_set is None:
+        with _init_lock:
+            if _worker_set is None:
+                _worker_set = _WorkerSet()
+    _worker_set.submit(task)
+
@@ -0,0 +1,99 @@
+"""生成器任务产出项的分批交付。
+
+生成器任务每产出一项就投递一次主线程事件，会让主线程的开销与项数成正比。
+这里在工作线程一侧缓冲产出的项，缓冲区达到数量上限或第一项等待超过时间上限时
+整批交付，主线程每批只处理一个事件。时间上限由共享的截止时间调度器触发，生成器
+在两项之间长时间阻塞（例如等待下一页查询结果）时已产出的项也能及时送达。
+"""
+
+import inspect
+import threading
+from typing import Any, Callable, List, Optional
+
+from qthreadwithreturn import _deadlines
+
+# 默认每批最多的项数和第一项最长的等待时间（毫秒）
+DEFAULT_ITEM_BATCH_SIZE = 256
+DEFAULT_ITEM_BATCH_DELAY_MS = 50.0
+
+_batch_size: int = DEFAULT_ITEM_BATCH_SIZE
+_batch_delay_s: float = DEFAULT_ITEM_BATCH_DELAY_MS / 1000.0
+
+
+def set_item_batching(
+        max_items: int = DEFAULT_ITEM_BATCH_SIZE,
+        max_delay_ms: float = DEFAULT_ITEM_BATCH_DELAY_MS,
+) -> None:
+    """设置生成器任务产出项的分批上限（对之后启动的任务生效）。
+
+    缓冲的项达到 max_items，或第一项已等待 max_delay_ms 时整批交给
+    add_item_callback 注册的回调。
+
+    Args:
+        max_items: 每批最多的项数，必须大于 0。1 表示逐项交付。
+        max_delay_ms: 产出的项最长的缓冲时间（毫秒），必须大于 0。
+
+    Raises:
+        ValueError: 当 max_items <= 0 或 max_delay_ms <= 0 时。
+
+    Example:
+        >>> from qthreadwithreturn import set_item_batching
+        >>> set_item_batching(max_items=1000, max_delay_ms=100)
+    """
+    global _batch_size, _batch_delay_s
+    if max_items <= 0:
+        raise ValueError("max_items must be greater than 0")
+    if max_delay_ms <= 0:
+        raise ValueError("max_delay_ms must be greater than 0")
+    _batch_size = int(max_items)
+    _batch_delay_s = max_delay_ms / 1000.0
+
+
+class _ItemBatcher:
+    """在工作线程中缓冲产出的项，按数量或时间上限整批交给 deliver"""
+
+    __slots__ = ("_deliver", "_items", "_lock", "_deadline", "_max_items", "_max_delay_s")
+
+    def __init__(self, deliver: Callable[[List[Any]], None]):
+        self._deliver = deliver
+        self._items: List[Any] = []
+        self._lock = threading.Lock()
+        self._deadline: Optional[_deadlines._Deadline] = None
+        self._max_items = _batch_size
+        self._max_delay_s = _batch_delay_s
+
+    def add(self, item: Any) -> None:
+        # 在锁内交付：工作线程与到期的刷新同时交付时保持批次顺序
+        with self._lock:
+            items = self._items
+            items.append(item)
+            if len(items) >= self._max_items:
+                self._deliver(self._take())
+            elif self._deadline is None:
+                self._deadline = _deadlines.call_later(self._max_delay_s, self.flush)
+
+    def flush(self) -> None:
+        """立即交付已缓冲的项（没有时无操作）"""
+        with self._lock:
+            if self._items:
+                self._deliver(self._take())
+
+    def _take(self) -> List[Any]:
+        batch, self._items = self._items, []
+        deadline, self._deadline = self._deadline, None
+        if deadline is not None:
+            deadline.cancel()
+        return batch
+
+
+def call(fn: Callable, args: tuple) -> Any:
+    """执行 fn(*args)；fn 是生成器函数时消费生成器，返回其返回值，没有返回值时返回产出项列表"""
+    if not inspect.isgeneratorfunction(fn):
+        return fn(*args)
+    generator = fn(*args)
+    items = []
+    while True:
+        try:
+            items.append(next(generator))
+        except StopIteration as stop:
+            return items if stop.value is None else stop.value
@@ -0,0 +1,148 @@
+"""线程池运行指标。
+
+计数器与直方图按线程分片：每个线程只写自己的分片，记录时不加锁，也不会与
+其它线程竞争同一个计数；读取快照时才在锁内汇总所有分片，已退出线程的分片
+在汇总时并入一个归档分片后丢弃。因此指标可以在生产环境中始终开启。
+
+直方图使用固定的对数刻度桶（秒），快照中的分位数是所在桶的上界估计值。
+"""
+
+import bisect
+import sys
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 计数器
+COUNTERS = ("submitted", "started", "completed", "failed", "cancelled")
+SUBMITTED, STARTED, COMPLETED, FAILED, CANCELLED = range(len(COUNTERS))
+
+# 直方图（单位：秒）
+HISTOGRAMS = ("queue_wait", "run_time", "callback_delay")
+QUEUE_WAIT, RUN_TIME, CALLBACK_DELAY = range(len(HISTOGRAMS))
+
+# 直方图桶上界（秒），最后还有一个溢出桶
+BUCKET_BOUNDS = (
+    0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005,
+    0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0,
+    10.0, 30.0, 60.0,
+)
+
+_QUANTILES = (("p50", 0.5), ("p90", 0.9), ("p99", 0.99))
+
+
+class _Shard:
+    """单个线程写入的计数器与直方图"""
+
+    __slots__ = ("counters", "buckets", "sums", "maxima")
+
+    def __init__(self):
+        self.counters: List[int] = [0] * len(COUNTERS)
+        self.buckets: List[List[int]] = [[0] * (len(BUCKET_BOUNDS) + 1) for _ in HISTOGRAMS]
+        self.sums: List[float] = [0.0] * len(HISTOGRAMS)
+        self.maxima: List[float] = [0.0] * len(HISTOGRAMS)
+
+    def merge_into(self, total: "_Shard") -> None:
+        for i, value in enumerate(self.counters):
+            total.counters[i] += value
+        for h in range(len(HISTOGRAMS)):
+            buckets = total.buckets[h]
+            for i, value in enumerate(self.buckets[h]):
+                buckets[i] += value
+            total.sums[h] += self.sums[h]
+            total.maxima[h] = max(total.maxima[h], self.maxima[h])
+
+
+class _PoolMetrics:
+    """一个线程池的指标，increment()/observe() 可以在任意线程中调用"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards: List[Tuple[threading.Thread, _Shard]] = []
+        self._retired = _Shard()  # 已退出线程的分片汇总
+        self._lock = threading.Lock()
+        self.hook: Optional[Callable[[str, float], Any]] = None
+
+    def _shard(self) -> _Shard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append((threading.current_thread(), shard))
+            return shard
+
+    def increment(self, counter: int) -> None:
+        self._shard().counters[counter] += 1
+        if self.hook is not None:
+            self._emit(COUNTERS[counter], 1)
+
+    def observe(self, histogram: int, seconds: float) -> None:
+        seconds = max(0.0, seconds)
+        shard = self._shard()
+        shard.buckets[histogram][bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+        shard.sums[histogram] += seconds
+        if seconds > shard.maxima[histogram]:
+            shard.maxima[histogram] = seconds
+        if self.hook is not None:
+            self._emit(HISTOGRAMS[histogram], seconds)
+
+    def _emit(self, name: str, value: float) -> None:
+        hook = self.hook
+        if hook is None:
+            return
+        try:
+            hook(name, value)
+        except Exception as e:
+            print(f"Error in metrics hook: {e}", file=sys.stderr)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """汇总所有分片，返回 {计数器名: int, 直方图名: {...}}"""
+        total = _Shard()
+        with self._lock:
+            live = []
+            for thread, shard in self._shards:
+                if thread.is_alive():
+                    live.append((thread, shard))
+                else:
+                    # 线程已退出，不会再写入该分片
+                    shard.merge_into(self._retired)
+            self._shards = live
+            self._retired.merge_into(total)
+            for _thread, shard in live:
+                shard.merge_into(total)
+
+        result: Dict[str, Any] = dict(zip(COUNTERS, total.counters))
+        for h, name in enumerate(HISTOGRAMS):
+            result[name] = _histogram_snapshot(total.buckets[h], total.sums[h], total.maxima[h])
+        return result
+
+
+def _histogram_snapshot(buckets: List[int], total: float, maximum: float) -> Dict[str, Any]:
+    count = sum(buckets)
+    snapshot: Dict[str, Any] = {
+        "count": count,
+        "sum": total,
+        "mean": total / count if count else 0.0,
+        "max": maximum,
+        # [(桶上界（秒）, 数量), ...]，溢出桶的上界为 inf
+        "buckets": list(zip(BUCKET_BOUNDS + (float("inf"),), buckets)),
+    }
+    for key, q in _QUANTILES:
+        snapshot[key] = _quantile(buckets, count, q, maximum)
+    return snapshot
+
+
+def _quantile(buckets: List[int], count: int, q: float, maximum: float) -> float:
+    """按桶上界估计分位数，不超过观测到的最大值"""
+    if not count:
+        return 0.0
+    rank = q * count
+    seen = 0
+    for bound, n in zip(BUCKET_BOUNDS, buckets):
+        seen += n
+        if seen >= rank:
+            return min(bound, maximum)
+    return maximum
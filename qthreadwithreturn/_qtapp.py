@@ -0,0 +1,16 @@
+"""Qt 应用实例的快速访问。
+
+热路径（start、result、回调分发、关闭等）需要反复判断当前是否存在 Qt 应用。
+在函数内执行 ``from PySide6.QtWidgets import QApplication`` 每次都要经过 PySide6
+安装的导入钩子（约 4µs），还会让没有 Qt 应用的用户也加载 QtWidgets。
+QApplication 本身就是 QCoreApplication，QCoreApplication.instance() 返回的是
+同一个对象，因此统一通过这里的 app_instance() 查询，只依赖 QtCore。
+
+只缓存查询函数而不缓存实例：应用对象可能被销毁后重新创建，持有引用还会
+延长它的生命周期。
+"""
+
+from PySide6.QtCore import QCoreApplication
+
+# 返回当前 Qt 应用（QApplication/QGuiApplication/QCoreApplication），不存在时返回 None
+app_instance = QCoreApplication.instance
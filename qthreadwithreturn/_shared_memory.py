@@ -0,0 +1,224 @@
+"""进程池的大缓冲区传输：pickle 协议 5 带外缓冲区 + 共享内存。
+
+默认情况下 ProcessPoolExecutor 把参数和结果整体 pickle 后经管道传输，大块数据
+（图像分块、采样数据等）会被复制多次，峰值内存翻倍。这里在发送端用协议 5 序列化，
+超过阈值的缓冲区（NumPy 数组等支持带外序列化的对象，以及 bytes、bytearray、
+memoryview）不写入 pickle 数据流，而是复制一次到一块共享内存；接收端把共享内存
+切片成 memoryview 交给 pickle.loads(buffers=...)，反序列化出的对象直接引用
+共享内存，不再复制。作为参数传入的 bytes/bytearray 在工作进程中从共享内存复制
+一次，重建为原类型，任务函数收到的参数类型不随数据大小变化。
+
+共享内存块的生命周期:
+    - 结果块由工作进程创建，主进程映射后立即 unlink，映射在最后一个视图释放后解除
+    - 参数块由主进程创建，任务结束后由主进程 unlink
+    - 视图仍被引用时无法关闭映射，这类块登记在 _attached 中，之后每次打包/解包时重试
+"""
+
+import contextlib
+import io
+import pickle
+import threading
+from multiprocessing import shared_memory
+from multiprocessing.reduction import ForkingPickler
+from typing import Any, Callable, List, Optional, Tuple
+
+_PROTOCOL = 5
+
+# 映射仍被视图引用、暂时无法关闭的共享内存块
+_attached: List["_AttachedBlock"] = []
+_attached_lock = threading.Lock()
+
+
+class _AttachedBlock(shared_memory.SharedMemory):
+    """允许在视图存活时被回收的共享内存块"""
+
+    def __del__(self):
+        # 视图仍然存在时映射无法关闭，交给进程退出时释放
+        with contextlib.suppress(BufferError, OSError):
+            self.close()
+
+
+class _Payload:
+    """打包后的对象：pickle 数据 + 可选的共享内存块（带外缓冲区依次存放）"""
+
+    __slots__ = ("data", "block", "sizes")
+
+    def __init__(self, data: bytes, block: Optional[str] = None, sizes: Tuple[int, ...] = ()):
+        self.data = data
+        self.block = block
+        self.sizes = sizes
+
+    def __getstate__(self):
+        return self.data, self.block, self.sizes
+
+    def __setstate__(self, state):
+        self.data, self.block, self.sizes = state
+
+
+def _restore_view(buffer, format: str, shape: Tuple[int, ...]) -> memoryview:
+    view = memoryview(buffer)
+    return view if format == "B" and len(shape) == 1 else view.cast(format, shape)
+
+
+class _Pickler(ForkingPickler):
+    """把超过阈值的连续 memoryview 转为带外缓冲区（bytes/bytearray 见 _wrap_buffers）"""
+
+    def __init__(self, file, threshold: int, buffer_callback: Callable):
+        # ForkingPickler.__init__ 只接受位置参数
+        super().__init__(file, _PROTOCOL, True, buffer_callback)
+        self._threshold = threshold
+
+    def reducer_override(self, obj):
+        if type(obj) is memoryview and obj.c_contiguous and obj.nbytes >= self._threshold:
+            # 接收端按原来的格式和形状重建视图
+            return _restore_view, (pickle.PickleBuffer(obj), obj.format, obj.shape)
+        return NotImplemented
+
+
+class _TypedBuffer:
+    """带外传输的 bytes/bytearray，接收端从缓冲区重建为原类型（复制一次）"""
+
+    __slots__ = ("buffer", "kind")
+
+    def __init__(self, obj: Any):
+        self.buffer = pickle.PickleBuffer(obj)
+        self.kind = type(obj)
+
+    def __reduce__(self):
+        return self.kind, (self.buffer,)
+
+
+def _is_large_bytes(obj: Any, threshold: int) -> bool:
+    return (type(obj) is bytes or type(obj) is bytearray) and len(obj) >= threshold
+
+
+def _wrap_buffers(obj: Any, threshold: int, keep_type: bool = False) -> Any:
+    """把顶层及顶层元组/列表中的大 bytes/bytearray 包装为带外缓冲区。
+
+    C 实现的 Pickler 对 bytes 和 bytearray 走快速路径，不会调用 reducer_override，
+    因此只能在序列化前替换。keep_type 为 False 时接收端得到 memoryview（bytes 为
+    只读，bytearray 可写），为 True 时重建为原类型。更深层嵌套的 bytes/bytearray
+    仍在带内传输。
+    """
+    wrap = _TypedBuffer if keep_type else pickle.PickleBuffer
+    if _is_large_bytes(obj, threshold):
+        return wrap(obj)
+    kind = type(obj)
+    if (kind is tuple or kind is list) and any(_is_large_bytes(item, threshold) for item in obj):
+        return kind(wrap(item) if _is_large_bytes(item, threshold) else item for item in obj)
+    return obj
+
+
+def _release_closed() -> None:
+    """关闭视图已全部释放的共享内存块"""
+    if not _attached:
+        return
+    with _attached_lock:
+        for block in list(_attached):
+            try:
+                block.close()
+            except BufferError:
+                continue
+            _attached.remove(block)
+
+
+def pack(obj: Any, threshold: int) -> Tuple[_Payload, Optional[shared_memory.SharedMemory]]:
+    """序列化 obj，超过 threshold 字节的缓冲区放入一块新建的共享内存。
+
+    Args:
+        obj: 要传输的对象。
+        threshold: 带外传输的最小缓冲区字节数。
+
+    Returns:
+        Tuple[_Payload, Optional[SharedMemory]]: 打包结果和新建的共享内存块
+        （没有大缓冲区时为 None）。调用方负责在接收端用完后关闭并 unlink。
+    """
+    _release_closed()
+    buffers = []
+
+    def buffer_callback(buffer: pickle.PickleBuffer) -> bool:
+        try:
+            view = buffer.raw()
+        except BufferError:  # 非连续内存，只能在带内序列化
+            return True
+        if view.nbytes < threshold:
+            return True
+        buffers.append(view)
+        return False
+
+    stream = io.BytesIO()
+    _Pickler(stream, threshold, buffer_callback).dump(_wrap_buffers(obj, threshold))
+    if not buffers:
+        return _Payload(stream.getvalue()), None
+
+    sizes = tuple(view.nbytes for view in buffers)
+    block = shared_memory.SharedMemory(create=True, size=sum(sizes))
+    offset = 0
+    for view, size in zip(buffers, sizes):
+        block.buf[offset:offset + size] = view
+        offset += size
+    return _Payload(stream.getvalue(), block.name, sizes), block
+
+
+def pack_call(
+        fn: Callable, args: tuple, kwargs: dict, threshold: int
+) -> Tuple[_Payload, Optional[shared_memory.SharedMemory]]:
+    """打包一次函数调用，位置参数和关键字参数中的大 bytes 同样经共享内存传输。
+
+    参数中的 bytes/bytearray 在工作进程中重建为原类型，而不是以 memoryview 到达。
+    """
+    kwargs = {key: _wrap_buffers(value, threshold, keep_type=True) for key, value in kwargs.items()}
+    return pack((fn, _wrap_buffers(args, threshold, keep_type=True), kwargs), threshold)
+
+
+def unpack(payload: _Payload, unlink: bool) -> Any:
+    """反序列化 pack() 的结果，带外缓冲区以指向共享内存的视图提供（不复制）。
+
+    Args:
+        payload: pack() 返回的打包结果。
+        unlink: 映射后是否立即删除共享内存块的名称（接收方拥有该块时为 True）。
+
+    Returns:
+        Any: 反序列化得到的对象。
+    """
+    _release_closed()
+    if payload.block is None:
+        return pickle.loads(payload.data)
+
+    block = _AttachedBlock(name=payload.block)
+    try:
+        if unlink:
+            block.unlink()
+        views = []
+        offset = 0
+        for size in payload.sizes:
+            views.append(block.buf[offset:offset + size])
+            offset += size
+        return pickle.loads(payload.data, buffers=views)
+    finally:
+        # 返回的对象仍引用映射，留待之后的 _release_closed() 关闭
+        with _attached_lock:
+            _attached.append(block)
+
+
+def release(block: Optional[shared_memory.SharedMemory]) -> None:
+    """关闭并删除 pack() 创建的共享内存块（可为 None）"""
+    if block is None:
+        return
+    with contextlib.suppress(BufferError, OSError):
+        block.close()
+    with contextlib.suppress(OSError):
+        block.unlink()
+
+
+def call_packed(payload: _Payload, threshold: int) -> _Payload:
+    """在工作进程中执行：解包 (fn, args, kwargs)，调用并打包结果"""
+    fn, args, kwargs = unpack(payload, unlink=False)
+    result = fn(*args, **kwargs)
+    del fn, args, kwargs
+    packed, block = pack(result, threshold)
+    if block is not None:
+        # 块由主进程接管（映射后 unlink），这里只关闭本进程的映射
+        with contextlib.suppress(BufferError, OSError):
+            block.close()
+    return packed
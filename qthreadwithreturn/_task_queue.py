@@ -0,0 +1,219 @@
+"""线程池待处理任务队列。"""
+
+import heapq
+import itertools
+import time
+from collections import deque
+from typing import Any, Iterable, Iterator, Optional
+
+
+class _TaskQueue:
+    """基于 deque 的 FIFO 任务队列。
+
+    入队、出队、队首插回均为 O(1)。从队列中间移除任务（例如排队中的任务被取消）
+    采用惰性删除：只从成员集合中移除，残留条目在出队时跳过，因此同样是 O(1)。
+
+    单个操作依赖 deque 与 set 在 GIL 下的原子性，本身不加锁；
+    需要组合多个操作保持一致时由调用方加锁。
+    """
+
+    __slots__ = ("_items", "_members")
+
+    def __init__(self):
+        self._items: deque = deque()
+        self._members: set = set()
+
+    def append(self, item: Any) -> None:
+        """将任务加入队尾"""
+        self._items.append(item)
+        self._members.add(item)
+
+    def appendleft(self, item: Any) -> None:
+        """将任务插回队首（用于启动失败后的重试）"""
+        self._items.appendleft(item)
+        self._members.add(item)
+
+    def popleft(self) -> Any:
+        """取出队首任务。
+
+        Raises:
+            IndexError: 队列为空时。
+        """
+        items = self._items
+        members = self._members
+        while True:
+            item = items.popleft()
+            if item in members:
+                members.discard(item)
+                return item
+
+    def pop_oldest(self) -> Any:
+        """取出最早入队的任务，FIFO 队列中即队首任务。
+
+        Raises:
+            IndexError: 队列为空时。
+        """
+        return self.popleft()
+
+    def peek(self) -> Any:
+        """返回队首任务但不出队。
+
+        Raises:
+            IndexError: 队列为空时。
+        """
+        items = self._items
+        members = self._members
+        while items[0] not in members:
+            items.popleft()
+        return items[0]
+
+    def discard(self, item: Any) -> bool:
+        """从队列中移除任务（惰性删除），返回任务是否在队列中"""
+        if item in self._members:
+            self._members.discard(item)
+            if not self._members:
+                self._items.clear()
+            return True
+        return False
+
+    def clear(self) -> None:
+        """清空队列"""
+        self._items.clear()
+        self._members.clear()
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __bool__(self) -> bool:
+        return bool(self._members)
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self._members
+
+    def __iter__(self) -> Iterator[Any]:
+        """按出队顺序遍历队列中的任务"""
+        members = self._members
+        return iter([item for item in self._items if item in members])
+
+
+class _PriorityTaskQueue:
+    """基于堆的优先级任务队列，接口与 _TaskQueue 相同。
+
+    priority 越大越先出队，同优先级按入队顺序。aging_ms > 0 时任务每等待
+    aging_ms 毫秒有效优先级提高 1，避免低优先级任务被持续到来的高优先级任务饿死。
+
+    有效优先级为 priority + (now - enqueued) / aging，两个任务的先后关系与 now
+    无关，因此堆键 enqueued / aging - priority 在入队时即可确定，无需重新建堆。
+    入队、出队为 O(log n)，移除同样采用惰性删除。
+    """
+
+    __slots__ = ("_heap", "_members", "_counter", "_aging_ms", "_origin", "_last_popped")
+
+    def __init__(self, aging_ms: float = 0):
+        # [(key, order, seq, item), ...]：order 为同键条目的出队次序，seq 为入队序号
+        self._heap: list = []
+        self._members: set = set()
+        self._counter = itertools.count()
+        self._aging_ms = aging_ms
+        self._origin = time.monotonic()
+        self._last_popped: Optional[tuple] = None  # 最近出队的 (item, seq)，供 appendleft 还原序号
+
+    @classmethod
+    def from_queue(cls, items: Iterable[Any], aging_ms: float = 0) -> "_PriorityTaskQueue":
+        """由现有队列构建，已有任务按原顺序以默认优先级 0 入队"""
+        queue = cls(aging_ms)
+        for item in items:
+            queue.append(item)
+        return queue
+
+    def _key(self, priority: int) -> float:
+        if self._aging_ms > 0:
+            waited_units = (time.monotonic() - self._origin) * 1000.0 / self._aging_ms
+            return waited_units - priority
+        return -priority
+
+    def append(self, item: Any, priority: int = 0) -> None:
+        """按优先级入队"""
+        seq = next(self._counter)
+        heapq.heappush(self._heap, (self._key(priority), seq, seq, item))
+        self._members.add(item)
+
+    def appendleft(self, item: Any) -> None:
+        """将任务插回队首（用于启动失败后的重试），保留其原来的入队序号"""
+        heap = self._heap
+        key = heap[0][0] if heap else 0
+        last, self._last_popped = self._last_popped, None
+        seq = last[1] if last is not None and last[0] is item else next(self._counter)
+        # 负的出队次序保证在同键的条目之前出队；pop_oldest 仍按原入队序号判断
+        heapq.heappush(heap, (key, -next(self._counter), seq, item))
+        self._members.add(item)
+
+    def popleft(self) -> Any:
+        """取出有效优先级最高的任务。
+
+        Raises:
+            IndexError: 队列为空时。
+        """
+        heap = self._heap
+        members = self._members
+        while True:
+            _, _, seq, item = heapq.heappop(heap)
+            if item in members:
+                members.discard(item)
+                self._last_popped = (item, seq)
+                return item
+
+    def pop_oldest(self) -> Any:
+        """取出最早入队的任务（不论优先级），O(n)。
+
+        Raises:
+            IndexError: 队列为空时。
+        """
+        members = self._members
+        live = [entry for entry in self._heap if entry[3] in members]
+        if not live:
+            raise IndexError("pop from an empty queue")
+        item = min(live, key=lambda entry: entry[2])[3]
+        self.discard(item)
+        return item
+
+    def peek(self) -> Any:
+        """返回下一个出队的任务但不出队。
+
+        Raises:
+            IndexError: 队列为空时。
+        """
+        heap = self._heap
+        members = self._members
+        while heap[0][3] not in members:
+            heapq.heappop(heap)
+        return heap[0][3]
+
+    def discard(self, item: Any) -> bool:
+        """从队列中移除任务（惰性删除），返回任务是否在队列中"""
+        if item in self._members:
+            self._members.discard(item)
+            if not self._members:
+                self._heap.clear()
+            return True
+        return False
+
+    def clear(self) -> None:
+        """清空队列"""
+        self._heap.clear()
+        self._members.clear()
+        self._last_popped = None
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def __bool__(self) -> bool:
+        return bool(self._members)
+
+    def __contains__(self, item: Any) -> bool:
+        return item in self._members
+
+    def __iter__(self) -> Iterator[Any]:
+        """按出队顺序遍历队列中的任务"""
+        members = self._members
+        return iter([entry[3] for entry in sorted(self._heap, key=lambda e: e[:2]) if entry[3] in members])
@@ -0,0 +1,249 @@
+"""协作式取消令牌。
+
+任务函数声明名为 ``cancel_token`` 的参数即可获得一个 CancellationToken。取消
+Future（包括超时和线程池强制关闭）时令牌被取消，任务在循环中检查令牌后自行
+退出，无需等待 QThread 中断轮询或分阶段的 quit/terminate。参数带默认值时只有
+注解为 CancellationToken（如 ``cancel_token: Optional[CancellationToken] = None``）
+才会注入，调用方显式传入的值不会被替换。
+"""
+
+import functools
+import inspect
+import re
+import sys
+import threading
+import weakref
+from concurrent.futures import CancelledError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# 注入令牌时使用的参数名
+_TOKEN_PARAMETER = "cancel_token"
+
+# 函数（普通函数按代码对象）-> 可以按关键字传入的参数，用于判断是否注入令牌（以及进度报告器）
+_keyword_parameters_cache: "weakref.WeakKeyDictionary[Any, Dict[str, Tuple[inspect.Parameter, Optional[int]]]]" = (
+    weakref.WeakKeyDictionary()
+)
+# 不支持弱引用的内置函数/方法（如 time.sleep、list.append）按 (模块, 限定名) 缓存
+_builtin_parameters_cache: Dict[Tuple[Optional[str], str], Dict[str, Tuple[inspect.Parameter, Optional[int]]]] = {}
+
+
+class CancellationToken:
+    """协作式取消令牌。
+
+    任务在循环中检查 ``cancelled`` 属性或调用 ``raise_if_cancelled()``，收到取消
+    请求后尽快返回。令牌可以链接到父令牌：父令牌被取消时所有子令牌随之取消，
+    取消子令牌不影响父令牌。
+
+    所有方法都是线程安全的；``cancelled`` 只是读取一个布尔值，可以在热循环中
+    频繁检查。
+
+    Args:
+        parent: 父令牌。父令牌已被取消时，新令牌创建后立即处于取消状态。
+
+    Example:
+        >>> def task(items, cancel_token):
+        ...     for item in items:
+        ...         cancel_token.raise_if_cancelled()
+        ...         process(item)
+        >>> thread = QThreadWithReturn(task, items)
+        >>> thread.start()
+        >>> thread.cancel()  # 任务在处理下一项之前退出
+        ...
+        >>> # 一个父令牌同时取消一批任务
+        >>> batch = CancellationToken()
+        >>> futures = [pool.submit(task, chunk, cancel_token=batch) for chunk in chunks]
+        >>> batch.cancel()
+    """
+
+    __slots__ = ("_cancelled", "_event", "_lock", "_callbacks", "_children", "__weakref__")
+
+    def __init__(self, parent: Optional["CancellationToken"] = None):
+        self._cancelled: bool = False
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], Any]] = []
+        self._children: "weakref.WeakSet[CancellationToken]" = weakref.WeakSet()
+        if parent is not None:
+            parent._add_child(self)
+
+    @property
+    def cancelled(self) -> bool:
+        """是否已请求取消"""
+        return self._cancelled
+
+    def cancel(self) -> None:
+        """请求取消：标记令牌、取消所有子令牌并依次调用已注册的回调。
+
+        重复调用无效果。回调在调用 cancel() 的线程中执行，抛出的异常会输出到 stderr。
+        """
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            callbacks, self._callbacks = self._callbacks, []
+            children = list(self._children)
+            self._children = weakref.WeakSet()
+        self._event.set()
+        for child in children:
+            child.cancel()
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in cancellation callback: {e}", file=sys.stderr)
+
+    def raise_if_cancelled(self) -> None:
+        """已请求取消时抛出 CancelledError。
+
+        Raises:
+            CancelledError: 令牌已被取消时。
+        """
+        if self._cancelled:
+            raise CancelledError()
+
+    def add_callback(self, callback: Callable[[], Any]) -> None:
+        """注册取消回调；令牌已被取消时立即在当前线程中调用。
+
+        Args:
+            callback: 无参数的可调用对象。
+        """
+        with self._lock:
+            if not self._cancelled:
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback: Callable[[], Any]) -> bool:
+        """注销尚未触发的取消回调。
+
+        Returns:
+            bool: 找到并移除回调时返回 True。
+        """
+        with self._lock:
+            try:
+                self._callbacks.remove(callback)
+            except ValueError:
+                return False
+            return True
+
+    def wait(self, timeout_ms: int = -1) -> bool:
+        """阻塞直到令牌被取消或超时，可用于替代任务中的 time.sleep()。
+
+        Args:
+            timeout_ms: 超时时间（毫秒）。<0 表示无限等待。
+
+        Returns:
+            bool: 令牌已被取消时返回 True，超时返回 False。
+        """
+        return self._event.wait(timeout_ms / 1000.0 if timeout_ms >= 0 else None)
+
+    def _add_child(self, child: "CancellationToken") -> None:
+        with self._lock:
+            if not self._cancelled:
+                self._children.add(child)
+                return
+        child.cancel()
+
+    def __repr__(self) -> str:
+        state = "cancelled" if self._cancelled else "active"
+        return f"<CancellationToken {state}>"
+
+
+def _plain_code(func: Callable) -> Any:
+    """func 的代码对象，只对签名完全由代码对象决定的普通函数返回，其它情况为 None。
+
+    functools.wraps 包装的函数（__wrapped__）和自定义 __signature__ 的签名与代码对象
+    无关，不能按代码对象判断。
+    """
+    if not inspect.isfunction(func) or hasattr(func, "__wrapped__") or hasattr(func, "__signature__"):
+        return None
+    return func.__code__
+
+
+def _cannot_accept(func: Callable, name: str) -> bool:
+    """不检查签名，仅凭代码对象就能确定 func 没有 name 参数时返回 True。
+
+    底层普通函数（绑定方法取 __func__）的参数名中没有 name 且没有 ``**kwargs`` 时
+    成立，每次提交新建的 lambda 也无需调用 inspect.signature()。
+    """
+    code = _plain_code(getattr(func, "__func__", func))
+    if code is None or code.co_flags & inspect.CO_VARKEYWORDS:
+        return False
+    return name not in code.co_varnames[:code.co_argcount + code.co_kwonlyargcount]
+
+
+def _keyword_parameters(func: Callable) -> Dict[str, Tuple[inspect.Parameter, Optional[int]]]:
+    """func 中可以按关键字传入的参数（名称 -> (Parameter, 位置序号)），结果会被缓存。
+
+    普通函数按代码对象缓存，同一个 def/lambda 每次创建的函数对象共用一份结果；不支持
+    弱引用的内置函数按 (模块, 限定名) 缓存；其它可调用对象按对象本身缓存。位置序号
+    相对于底层函数（绑定方法包含 self），仅限关键字的参数为 None。
+    """
+    target = getattr(func, "__func__", func)
+    code = _plain_code(target)
+    if code is not None:
+        key, cache = code, _keyword_parameters_cache
+    elif inspect.isbuiltin(target):
+        key, cache = (getattr(target, "__module__", None), target.__qualname__), _builtin_parameters_cache
+    else:
+        key, cache = target, _keyword_parameters_cache
+    try:
+        return cache[key]
+    except (KeyError, TypeError):
+        pass
+    try:
+        parameters = inspect.signature(target).parameters.values()
+    except (TypeError, ValueError):
+        parameters = ()
+    found = {}
+    position = 0
+    for parameter in parameters:
+        if parameter.kind == parameter.POSITIONAL_OR_KEYWORD:
+            found[parameter.name] = (parameter, position)
+        elif parameter.kind == parameter.KEYWORD_ONLY:
+            found[parameter.name] = (parameter, None)
+        if parameter.kind in (parameter.POSITIONAL_ONLY, parameter.POSITIONAL_OR_KEYWORD):
+            position += 1
+    try:
+        cache[key] = found
+    except TypeError:
+        pass
+    return found
+
+
+def _wants_injection(func: Callable, name: str, type_name: str, positional_count: int = 0) -> bool:
+    """func 的 name 参数是否需要注入对象。
+
+    调用方按位置传入了该参数（其位置序号小于 positional_count）时不注入。参数没有
+    默认值时注入；有默认值（如 ``progress=False``）时只在注解为 type_name（包括
+    ``Optional[...]`` 和字符串注解）时注入，以免改变已有函数的行为。
+    functools.partial 按其包装的函数判断，已绑定的参数视为调用方传入。
+    """
+    while isinstance(func, functools.partial):
+        if name in func.keywords:
+            return False
+        positional_count += len(func.args)
+        func = func.func
+    if _cannot_accept(func, name):
+        return False
+    entry = _keyword_parameters(func).get(name)
+    if entry is None:
+        return False
+    parameter, position = entry
+    if position is not None:
+        if getattr(func, "__func__", func) is not func:
+            position -= 1  # 绑定方法的 self/cls 已经绑定
+        if position < positional_count:
+            return False
+    if parameter.default is parameter.empty:
+        return True
+    annotation = parameter.annotation
+    if annotation is parameter.empty:
+        return False
+    text = annotation if isinstance(annotation, str) else repr(annotation)
+    return re.search(rf"\b{type_name}\b", text) is not None
+
+
+def _accepts_token(func: Callable, positional_count: int = 0) -> bool:
+    """func 是否声明了需要注入的 cancel_token 参数（调用方按位置传入了 positional_count 个参数）"""
+    return _wants_injection(func, _TOKEN_PARAMETER, "CancellationToken", positional_count)
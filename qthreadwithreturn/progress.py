@@ -0,0 +1,149 @@
+"""合并的进度报告通道。
+
+任务函数声明名为 ``progress`` 的参数即可获得一个 ProgressReporter。报告器只保存
+最新的值：任务可以在每处理一项后调用 report()，无论调用多频繁，主线程在每个
+刷新周期（默认 30Hz）内对每个 Future 最多执行一轮进度回调，期间的中间值被
+合并丢弃。所有运行中的 Future 共用同一个刷新调度，不会向事件队列为每次报告
+投递事件。参数带默认值时（如 ``progress=False``）只有注解为 ProgressReporter
+才会注入。
+"""
+
+import sys
+import threading
+import time
+from typing import Any, Callable, List, Optional
+
+from qthreadwithreturn import _deadlines
+from qthreadwithreturn._callbacks import call_in_main_thread
+from qthreadwithreturn.cancellation import _wants_injection
+
+# 注入进度报告器时使用的参数名
+_PROGRESS_PARAMETER = "progress"
+
+# 默认刷新频率（Hz）
+DEFAULT_PROGRESS_RATE_HZ = 30.0
+
+_interval_s: float = 1.0 / DEFAULT_PROGRESS_RATE_HZ
+
+
+def set_progress_rate(rate_hz: float) -> None:
+    """设置进度回调的最高刷新频率（所有 Future 共用）。
+
+    Args:
+        rate_hz: 每秒最多刷新的次数，必须大于 0。
+
+    Raises:
+        ValueError: 当 rate_hz <= 0 时。
+
+    Example:
+        >>> from qthreadwithreturn import set_progress_rate
+        >>> set_progress_rate(10)  # 每 100ms 最多刷新一次进度
+    """
+    global _interval_s
+    if rate_hz <= 0:
+        raise ValueError("rate_hz must be greater than 0")
+    _interval_s = 1.0 / rate_hz
+
+
+class ProgressReporter:
+    """只保留最新值的进度报告器。
+
+    任务在工作线程中调用 report()，最新的值由共享的刷新调度交给 Future 的进度
+    回调（见 QThreadWithReturn.add_progress_callback）。report() 只是保存一个值，
+    可以在热循环中频繁调用；任务结束时尚未交付的最新值会在完成/失败回调之前交付。
+
+    Example:
+        >>> def task(paths, progress):
+        ...     for i, path in enumerate(paths, 1):
+        ...         convert(path)
+        ...         progress.report(i, len(paths))
+        >>> future = pool.submit(task, paths)
+        >>> future.add_progress_callback(lambda done, total: bar.setValue(100 * done // total))
+    """
+
+    __slots__ = ("_value", "_pending", "_deliver")
+
+    def __init__(self, deliver: Optional[Callable[[Any], None]] = None):
+        """创建报告器。
+
+        Args:
+            deliver: 交付最新值的函数，在主线程中调用（无 Qt 应用时在报告线程或
+                共享工作线程中调用）。
+                None 表示只记录值，不交付。
+        """
+        self._value: Any = None
+        self._pending: bool = False  # 是否有尚未交付的值
+        self._deliver = deliver
+
+    @property
+    def value(self) -> Any:
+        """最近一次报告的值，尚未报告时为 None"""
+        return self._value
+
+    def report(self, value: Any, *values: Any) -> None:
+        """报告当前进度，覆盖尚未交付的旧值。
+
+        传入多个值时按元组保存，进度回调像完成回调一样解包元组。
+
+        Args:
+            value: 进度值（任意对象）。
+            *values: 其余的值，与 value 一起组成元组。
+
+        Example:
+            >>> progress.report(0.5)
+            >>> progress.report(done, total, "正在处理 a.png")
+        """
+        self._value = (value, *values) if values else value
+        if not self._pending and self._deliver is not None:
+            self._pending = True
+            _channel.mark(self)
+
+    def _flush(self) -> None:
+        """立即交付尚未交付的最新值"""
+        if self._pending:
+            self._pending = False
+            self._deliver(self._value)
+
+    def __repr__(self) -> str:
+        return f"<ProgressReporter value={self._value!r}>"
+
+
+class _ProgressChannel:
+    """所有报告器共用的刷新调度：每个刷新周期最多向主线程投递一次"""
+
+    def __init__(self):
+        self._pending: List[ProgressReporter] = []
+        self._lock = threading.Lock()
+        self._scheduled = False
+        self._last_flush = 0.0
+
+    def mark(self, reporter: ProgressReporter) -> None:
+        with self._lock:
+            self._pending.append(reporter)
+            if self._scheduled:
+                return
+            self._scheduled = True
+            delay = self._last_flush + _interval_s - time.monotonic()
+        if delay > 0:
+            _deadlines.call_later(delay, call_in_main_thread, self._flush)
+        else:
+            call_in_main_thread(self._flush)
+
+    def _flush(self) -> None:
+        with self._lock:
+            reporters, self._pending = self._pending, []
+            self._scheduled = False
+            self._last_flush = time.monotonic()
+        for reporter in reporters:
+            try:
+                reporter._flush()
+            except Exception as e:
+                print(f"Error in progress callback: {e}", file=sys.stderr)
+
+
+_channel = _ProgressChannel()
+
+
+def _accepts_progress(func: Callable, positional_count: int = 0) -> bool:
+    """func 是否声明了需要注入的 progress 参数（调用方按位置传入了 positional_count 个参数）"""
+    return _wants_injection(func, _PROGRESS_PARAMETER, "ProgressReporter", positional_count)
@@ -0,0 +1,228 @@
+"""进程池执行器：在常驻工作进程中执行 CPU 密集型任务。
+
+线程池中的纯 Python 计算任务受 GIL 限制，多核机器上也只能得到约 1 倍的加速。
+QProcessPoolExecutor 把任务交给一组常驻工作进程（concurrent.futures.ProcessPoolExecutor）
+执行，调度仍由 QThreadPoolExecutor 的常驻工作线程完成：每个工作线程把一个任务
+转交给工作进程并等待结果（等待期间释放 GIL），因此返回的 Future、回调在主线程中
+执行、元组结果解包到多参数回调、池级别回调、优先级、超时、背压、指标、map 和
+as_completed 的语义都与线程池完全相同。
+"""
+
+import contextlib
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, List, Optional, Tuple
+
+from qthreadwithreturn import _shared_memory
+from qthreadwithreturn.cancellation import CancellationToken, _TOKEN_PARAMETER
+from qthreadwithreturn.qthread_pool_executor import QThreadPoolExecutor
+from qthreadwithreturn.qthread_with_return import QThreadWithReturn
+
+
+class QProcessPoolExecutor(QThreadPoolExecutor):
+    """PySide6 进程池执行器。
+
+    API 与 QThreadPoolExecutor 相同，任务在常驻工作进程中执行，适合受 GIL 限制的
+    CPU 密集型纯 Python 计算。
+
+    主要特性:
+        - 常驻工作进程，进程只在首次需要时启动一次并被后续任务复用
+        - 回调（任务级别和池级别）在主线程中执行，元组结果自动解包
+        - 支持优先级、超时、有界等待队列、map、as_completed 和运行指标
+        - 默认使用 "spawn" 启动方式，避免在多线程的 Qt 进程中 fork
+        - 大于 shared_memory_threshold 的缓冲区（NumPy 数组、bytes 等）经共享内存传输，
+          结果以指向共享内存的视图交给回调，不经管道复制
+
+    使用示例:
+        >>> def count_primes(limit):  # 必须定义在可导入的模块顶层
+        ...     return sum(all(n % d for d in range(2, int(n ** 0.5) + 1)) for n in range(2, limit))
+        >>> pool = QProcessPoolExecutor(max_workers=4)
+        >>> future = pool.submit(count_primes, 100_000)
+        >>> future.add_done_callback(lambda count: label.setText(str(count)))
+        >>> pool.add_done_callback(lambda: print("所有任务完成"))
+
+    Note:
+        任务函数、参数和返回值都需要能被 pickle 序列化：lambda、局部函数和 Qt 对象
+        不能传给工作进程，序列化失败时 Future 以该异常结束并触发失败回调。任务函数
+        不能接收 CancellationToken 或 ProgressReporter；submit(..., cancel_token=token)
+        传入的令牌只用于取消尚未开始执行的任务。生成器对象不能序列化，生成器函数
+        不能作为任务。正在工作进程中执行的任务无法单独停止，shutdown(force_stop=True)
+        会终止所有工作进程。
+    """
+
+    # 警告由 QThreadPoolExecutor.shutdown() 发出，经本类的 shutdown() 多一层调用
+    _shutdown_warning_stacklevel = QThreadPoolExecutor._shutdown_warning_stacklevel + 1
+
+    def __init__(
+            self,
+            max_workers: Optional[int] = None,
+            thread_name_prefix: str = "",
+            initializer: Optional[Callable] = None,
+            initargs: Tuple = (),
+            *,
+            mp_context: Optional[Any] = None,
+            max_tasks_per_child: Optional[int] = None,
+            shared_memory_threshold: Optional[int] = 1 << 20,
+            **kwargs,
+    ):
+        """初始化进程池执行器。
+
+        Args:
+            max_workers: 工作进程数。如果为 None，默认为 CPU 核心数。
+            thread_name_prefix: 调度线程名称前缀，用于调试和日志记录。
+            initializer: 每个工作进程启动时调用的初始化函数（在工作进程中执行）。
+            initargs: 传递给 initializer 的参数元组。
+            mp_context: multiprocessing 上下文。None 表示使用 "spawn"：Qt 应用中
+                存在多个线程，fork 出的子进程可能因继承了被持有的锁而死锁。
+            max_tasks_per_child: 每个工作进程最多执行的任务数，达到后替换为新进程，
+                用于释放泄漏的内存。None 表示不限制（Python 3.11+）。
+            shared_memory_threshold: 参数和结果中不小于该字节数的缓冲区通过共享内存
+                传输（pickle 协议 5 带外缓冲区），默认 1 MiB。支持带外序列化的对象
+                （如 NumPy 数组）保持原类型；memoryview，以及作为返回值或返回元组
+                元素的 bytes/bytearray 以 memoryview 视图的形式到达（bytes 为只读）。
+                作为参数的 bytes/bytearray 在工作进程中复制一次，保持原类型。
+                None 表示全部经管道传输。
+            **kwargs: 传递给 QThreadPoolExecutor 的其它参数（max_queue_size、
+                queue_full_policy、priority_aging_ms、default_timeout_ms、timeout_from）。
+
+        Raises:
+            ValueError: 当 max_workers <= 0、shared_memory_threshold <= 0 或其它参数无效时。
+            TypeError: 当 default_timeout_ms 不是数字类型时。
+
+        Example:
+            >>> pool = QProcessPoolExecutor(max_workers=8, max_queue_size=100)
+        """
+        if "persistent_workers" in kwargs:
+            raise TypeError("QProcessPoolExecutor always uses persistent workers")
+        if shared_memory_threshold is not None and shared_memory_threshold <= 0:
+            raise ValueError("shared_memory_threshold must be greater than 0 or None")
+        max_workers = max_workers or os.cpu_count() or 1
+        super().__init__(
+            max_workers=max_workers,
+            thread_name_prefix=thread_name_prefix,
+            persistent_workers=True,
+            **kwargs,
+        )
+        process_kwargs = {}
+        if max_tasks_per_child is not None:
+            process_kwargs["max_tasks_per_child"] = max_tasks_per_child
+        self._process_pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=mp_context or multiprocessing.get_context("spawn"),
+            initializer=initializer,
+            initargs=initargs,
+            **process_kwargs,
+        )
+        self._processes_released = False
+        self._shared_memory_threshold = shared_memory_threshold
+
+    def _submit(
+            self,
+            fn: Callable,
+            args: tuple,
+            kwargs: dict,
+            policy: Optional[str],
+            priority: int = 0,
+            timeout_ms: Optional[int] = None,
+    ) -> Optional[QThreadWithReturn]:
+        """把任务包装为“转交给工作进程并等待结果”，再按线程池的规则提交"""
+        parent = kwargs.get(_TOKEN_PARAMETER)
+        relay_kwargs = {}
+        if isinstance(parent, CancellationToken):
+            # 令牌不能跨进程传递，只作为父令牌用于取消尚未开始的任务
+            kwargs = {k: v for k, v in kwargs.items() if k != _TOKEN_PARAMETER}
+            relay_kwargs[_TOKEN_PARAMETER] = parent
+        return super()._submit(
+            self._run_in_process, (fn, args, kwargs), relay_kwargs, policy, priority, timeout_ms
+        )
+
+    def _run_in_process(
+            self, fn: Callable, args: tuple, kwargs: dict, cancel_token: CancellationToken
+    ) -> Any:
+        """在调度线程中执行：把任务交给工作进程并阻塞等待结果"""
+        threshold = self._shared_memory_threshold
+        if threshold is None:
+            process_future = self._process_pool.submit(fn, *args, **kwargs)
+            # 任务取消时撤回尚未被工作进程取走的任务
+            cancel_token.add_callback(process_future.cancel)
+            return process_future.result()
+
+        payload, block = _shared_memory.pack_call(fn, args, kwargs, threshold)
+        try:
+            process_future = self._process_pool.submit(_shared_memory.call_packed, payload, threshold)
+            cancel_token.add_callback(process_future.cancel)
+            return _shared_memory.unpack(process_future.result(), unlink=True)
+        finally:
+            # 工作进程已不再使用参数块（任务完成、失败或被撤回）
+            _shared_memory.release(block)
+
+    def _on_future_done(self, future: QThreadWithReturn) -> None:
+        super()._on_future_done(future)
+        # shutdown(wait=False) 之后，最后一个任务完成时释放工作进程
+        if self._shutdown and not self._outstanding and not self._processes_released:
+            self._release_processes(wait=False)
+
+    def _release_processes(self, wait: bool) -> None:
+        """关闭工作进程池（可重复调用）"""
+        self._processes_released = True
+        with contextlib.suppress(Exception):
+            self._process_pool.shutdown(wait=wait)
+
+    def _terminate_processes(self) -> None:
+        """取消排队的任务并立即终止所有工作进程"""
+        self._processes_released = True
+        terminate_workers = getattr(self._process_pool, "terminate_workers", None)
+        if terminate_workers is not None:  # Python 3.14+
+            with contextlib.suppress(Exception):
+                terminate_workers()
+            return
+        processes = list((getattr(self._process_pool, "_processes", None) or {}).values())
+        with contextlib.suppress(Exception):
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+        for process in processes:
+            with contextlib.suppress(Exception):
+                process.terminate()
+
+    def _stop_workers(self, force_stop: bool = False, deadline: Optional[float] = None) -> None:
+        if force_stop:
+            # 先终止工作进程：调度线程等待的结果随即以异常结束，线程可以自行退出
+            self._terminate_processes()
+        super()._stop_workers(force_stop=force_stop, deadline=deadline)
+
+    def shutdown(
+            self,
+            force_stop: bool = False,
+            *,
+            cancel_futures: bool = False,
+            wait: bool = False,
+            timeout_ms: Optional[int] = None,
+    ) -> List[QThreadWithReturn]:
+        """关闭进程池，参数和返回值与 QThreadPoolExecutor.shutdown() 相同。
+
+        工作进程在所有已提交任务完成后退出；force_stop=True 时立即终止所有
+        工作进程，正在执行的任务被取消。
+
+        Args:
+            force_stop: 如果为 True，立即终止工作进程和调度线程。
+            cancel_futures: 如果为 True，取消所有尚未开始的任务。
+            wait: 如果为 True，阻塞直到所有任务完成（最多 timeout_ms）并等待工作进程退出。
+            timeout_ms: 等待的总时间预算（毫秒），见 QThreadPoolExecutor.shutdown()。
+
+        Returns:
+            List[QThreadWithReturn]: wait=True 且超时时仍未完成的任务；force_stop=True
+            或 wait=False 时为空列表。
+
+        Example:
+            >>> pool.shutdown(wait=True)
+        """
+        if force_stop:
+            self._terminate_processes()
+        unfinished = super().shutdown(
+            force_stop, cancel_futures=cancel_futures, wait=wait, timeout_ms=timeout_ms
+        )
+        with self._counter_lock:
+            idle = not self._outstanding
+        if idle:
+            self._release_processes(wait=wait)
+        return unfinished
@@ -1,13 +1,38 @@
+import atexit
 import contextlib
-import inspect
+import itertools
+import os
+import queue
 import sys
 import threading
+import time
+import warnings
+import weakref
+from collections import deque
 from concurrent.futures import CancelledError, TimeoutError
-from typing import Callable, Optional, Iterable, Iterator, Set, Tuple
+from typing import Any, Callable, Deque, Optional, Iterable, Iterator, List, Set, Tuple, Union
 
-from PySide6.QtCore import QTimer
+from PySide6.QtCore import QObject, QThread, QTimer, Qt, Signal
 
-from qthreadwithreturn.qthread_with_return import QThreadWithReturn
+from qthreadwithreturn import _deadlines, _item_batches, _metrics
+from qthreadwithreturn._callbacks import call_in_main_thread, validate_callback
+from qthreadwithreturn._qtapp import app_instance
+from qthreadwithreturn._task_queue import _PriorityTaskQueue, _TaskQueue
+from qthreadwithreturn.qthread_with_return import QThreadWithReturn, _Waiter, _is_thread_running, _track_thread
+
+
+# submit() 在等待队列已满时的处理策略
+_QUEUE_FULL_POLICIES = ("block", "raise", "drop_oldest", "caller_runs")
+_TIMEOUT_FROM = ("start", "submit")
+
+# shutdown(force_stop=True) 的默认总时间预算（毫秒）。数值与旧的逐线程分阶段等待
+# 100 + 200 + 2000 相同，但现在由所有线程共享，不随线程数增长
+DEFAULT_FORCE_STOP_TIMEOUT_MS = 2300
+# 发出中断请求、取消令牌和 quit 后，等待线程自行退出的宽限期（不超过预算的一半）
+_FORCE_STOP_GRACE_MS = 300
+# 常驻工作线程空闲多久后退出（秒）。退出的线程不再引用线程池，未关闭的局部线程池
+# 因此可以被回收；之后提交任务时按需重新创建
+_WORKER_IDLE_TIMEOUT_S = 10.0
 
 
 class QThreadPoolExecutor:
@@ -46,12 +71,22 @@ class QThreadPoolExecutor:
         无公开属性，所有状态通过方法访问。
     """
 
+    # shutdown() 发出 UserWarning 时的 stacklevel，使警告指向调用 shutdown() 的代码；
+    # 子类重写 shutdown() 并调用 super().shutdown() 时相应加 1
+    _shutdown_warning_stacklevel = 2
+
     def __init__(
             self,
             max_workers: Optional[int] = None,
             thread_name_prefix: str = "",
             initializer: Optional[Callable] = None,
             initargs: Tuple = (),
+            persistent_workers: bool = False,
+            max_queue_size: int = 0,
+            queue_full_policy: str = "block",
+            priority_aging_ms: int = 1000,
+            default_timeout_ms: int = -1,
+            timeout_from: str = "start",
     ):
         """初始化线程池执行器。
 
@@ -60,9 +95,32 @@ class QThreadPoolExecutor:
             thread_name_prefix: 线程名称前缀，用于调试和日志记录。
             initializer: 每个工作线程启动时调用的初始化函数。
             initargs: 传递给 initializer 的参数元组。
+            persistent_workers: 如果为 True，线程池保持最多 max_workers 个常驻
+                工作线程，从任务队列中循环取任务执行，而不是为每个任务创建并销毁
+                一个 QThread。适合大量短任务的场景。此模式下 initializer 在每个
+                工作线程启动时只调用一次。空闲超过 10 秒的工作线程自动退出，
+                需要时重新创建。
+            max_queue_size: 等待执行（尚未开始）的任务数上限。0 表示不限制。
+            queue_full_policy: 队列已满时 submit() 的处理策略：
+                - "block": 阻塞直到有任务出队。在主线程中阻塞时会处理 Qt 事件
+                  （与 result() 相同），但仍建议在非 GUI 线程中提交大量任务。
+                - "raise": 抛出 queue.Full。
+                - "drop_oldest": 取消队列中最早的等待任务，为新任务腾出位置。
+                - "caller_runs": 在调用 submit() 的线程中直接执行任务，
+                  返回的 Future 已处于完成状态。
+            priority_aging_ms: 优先级老化间隔。按优先级调度时，任务每等待该毫秒数
+                有效优先级提高 1，防止低优先级任务饿死。<=0 表示不老化。
+            default_timeout_ms: submit() 未指定 timeout_ms 时使用的任务超时（毫秒）。
+                <0 表示无超时。
+            timeout_from: 超时的计时起点：
+                - "start": 从任务开始执行时计时，排队时间不计入。
+                - "submit": 从提交时计时（截止时间语义），排队期间到期的任务
+                  直接取消，不占用工作线程。
 
         Raises:
-            ValueError: 当 max_workers <= 0 时。
+            ValueError: 当 max_workers <= 0、max_queue_size < 0、
+                queue_full_policy 或 timeout_from 无效时。
+            TypeError: 当 default_timeout_ms 不是数字类型时。
 
         Example:
             >>> def init_worker(name):
@@ -73,14 +131,30 @@ class QThreadPoolExecutor:
             ...     initializer=init_worker,
             ...     initargs=("Test",)
             ... )
+            >>> # 大量短任务：复用常驻工作线程
+            >>> pool = QThreadPoolExecutor(max_workers=4, persistent_workers=True)
+            >>> # 限制等待队列长度，生产者按工作线程的吞吐量被限速
+            >>> pool = QThreadPoolExecutor(max_workers=4, max_queue_size=1000)
+            >>> # 每个任务必须在提交后 5 秒内完成
+            >>> pool = QThreadPoolExecutor(default_timeout_ms=5000, timeout_from="submit")
         """
-        import os
-
         self._max_workers = max_workers or min(
             (os.cpu_count() or 1) * 2, 32
         )  # 限制最大线程数避免资源耗尽
         if self._max_workers <= 0:
             raise ValueError("max_workers must be greater than 0")
+        if max_queue_size < 0:
+            raise ValueError("max_queue_size must be >= 0")
+        if queue_full_policy not in _QUEUE_FULL_POLICIES:
+            raise ValueError(
+                f"queue_full_policy must be one of {_QUEUE_FULL_POLICIES}, got {queue_full_policy!r}"
+            )
+        if not isinstance(default_timeout_ms, (int, float)):
+            raise TypeError(
+                f"default_timeout_ms must be a number, got {type(default_timeout_ms).__name__}"
+            )
+        if timeout_from not in _TIMEOUT_FROM:
+            raise ValueError(f"timeout_from must be one of {_TIMEOUT_FROM}, got {timeout_from!r}")
         self._thread_name_prefix = thread_name_prefix
         self._initializer = initializer
         self._initargs = initargs
@@ -90,10 +164,40 @@ class QThreadPoolExecutor:
         # This fixes the counter desynchronization bug when multiple tasks complete simultaneously
         self._counter_lock = threading.Lock()
         self._active_futures: Set[QThreadWithReturn] = set()
-        self._pending_tasks: list = []
+        self._pending_tasks: Union[_TaskQueue, _PriorityTaskQueue] = _TaskQueue()
         self._running_workers: int = 0
         self._thread_counter = 0
         self._waiting_for_shutdown = False  # Track if shutdown(wait=True) is in progress
+        # 已提交且尚未完成的任务（受 _counter_lock 保护），最后一个任务完成时唤醒
+        # shutdown(wait=True) 的等待器
+        self._outstanding: Set[QThreadWithReturn] = set()
+        self._idle_waiters: List[_Waiter] = []
+
+        # 运行指标（按线程分片，记录时不加锁）
+        self._metrics = _metrics._PoolMetrics()
+
+        # 常驻工作线程模式
+        self._persistent_workers = persistent_workers
+        self._queue_condition = threading.Condition()  # 保护 _pending_tasks，唤醒空闲工作线程
+        self._workers: List[Tuple[Any, Any]] = []  # [(thread, worker), ...]，含已退出的线程
+        self._live_workers: int = 0  # 尚未退出任务循环的工作线程数
+        self._idle_workers: int = 0
+        self._worker_counter = itertools.count(1)
+        self._stop_workers_requested = False
+        self._relay: Optional["_TaskRelay"] = None
+
+        # 有界等待队列（背压）
+        self._max_queue_size = max_queue_size
+        self._queue_full_policy = queue_full_policy
+        self._space_waiters: List[_Waiter] = []  # 因队列已满而阻塞的 submit()，受 _queue_condition 保护
+
+        # 优先级调度：首次提交非默认优先级的任务时，等待队列从 FIFO 切换为堆
+        self._priority_aging_ms = priority_aging_ms
+        self._priority_scheduling = False
+
+        # 任务超时
+        self._default_timeout_ms = default_timeout_ms
+        self._timeout_from = timeout_from
 
         # Callback management
         self._done_callbacks: list[Callable] = []
@@ -107,6 +211,9 @@ class QThreadPoolExecutor:
         # The reference is released after all work completes and done callbacks execute
         self._self_reference: Optional["QThreadPoolExecutor"] = None
 
+        if persistent_workers:
+            _persistent_pools.add(self)
+
     def __enter__(self):
         """不建议使用with上下文，会导致阻塞UI界面"""
         return self
@@ -124,12 +231,25 @@ class QThreadPoolExecutor:
             with contextlib.suppress(Exception):
                 self.shutdown(wait=False, force_stop=True)
 
-    def submit(self, fn: Callable, /, *args, **kwargs) -> "QThreadWithReturn":
+    def submit(
+            self,
+            fn: Callable,
+            /,
+            *args,
+            priority: int = 0,
+            timeout_ms: Optional[int] = None,
+            **kwargs,
+    ) -> "QThreadWithReturn":
         """提交任务到线程池执行。
 
         Args:
             fn: 要执行的可调用对象。
             *args: 传递给 fn 的位置参数。
+            priority: 任务优先级，数值越大越先执行，同优先级按提交顺序执行。
+                该参数由线程池使用，不会传递给 fn。
+            timeout_ms: 任务超时（毫秒），计时起点由线程池的 timeout_from 决定。
+                None 表示使用 default_timeout_ms，<0 表示无超时。超时的任务被取消，
+                result() 抛出 CancelledError。该参数不会传递给 fn。
             **kwargs: 传递给 fn 的关键字参数。
 
         Returns:
@@ -137,33 +257,483 @@ class QThreadPoolExecutor:
 
         Raises:
             RuntimeError: 当线程池已关闭时。
+            queue.Full: 等待队列已满且 queue_full_policy 为 "raise" 时。
+            TypeError: 当 timeout_ms 不是数字类型时。
+
+        Note:
+            超时在逐任务 QThread 模式下与 QThreadWithReturn.start(timeout_ms) 相同，
+            会强制停止线程；常驻工作线程模式下不能终止共享的工作线程，超时只取消
+            Future 并丢弃结果，工作线程在任务函数返回后继续处理后续任务。
 
         Example:
             >>> pool = QThreadPoolExecutor(max_workers=2)
             >>> future = pool.submit(sum, [1, 2, 3])
             >>> future.add_done_callback(lambda r: print(f"Sum: {r}"))
             >>> print(future.result())  # 输出: 6
+            >>> # 用户操作的任务优先于后台预取任务执行
+            >>> pool.submit(load_visible_page, priority=10)
+            >>> # 3 秒内没有完成则取消
+            >>> pool.submit(fetch_preview, url, timeout_ms=3000)
+        """
+        return self._submit(fn, args, kwargs, self._queue_full_policy, priority, timeout_ms)
+
+    def try_submit(
+            self,
+            fn: Callable,
+            /,
+            *args,
+            priority: int = 0,
+            timeout_ms: Optional[int] = None,
+            **kwargs,
+    ) -> Optional["QThreadWithReturn"]:
+        """尝试提交任务，等待队列已满时立即返回 None，不阻塞也不触发 queue_full_policy。
+
+        Args:
+            fn: 要执行的可调用对象。
+            *args: 传递给 fn 的位置参数。
+            priority: 任务优先级，同 submit()。
+            timeout_ms: 任务超时（毫秒），同 submit()。
+            **kwargs: 传递给 fn 的关键字参数。
+
+        Returns:
+            Optional[QThreadWithReturn]: 提交成功时返回 Future 对象，队列已满时返回 None。
+
+        Raises:
+            RuntimeError: 当线程池已关闭时。
+
+        Example:
+            >>> future = pool.try_submit(load_thumbnail, path)
+            >>> if future is None:
+            ...     print("队列已满，稍后重试")
         """
+        return self._submit(fn, args, kwargs, None, priority, timeout_ms)
+
+    async def submit_async(
+            self,
+            fn: Callable,
+            /,
+            *args,
+            priority: int = 0,
+            timeout_ms: Optional[int] = None,
+            **kwargs,
+    ) -> Any:
+        """提交任务并在 asyncio 协程中等待其结果，等价于 ``await pool.submit(...)``。
+
+        Args:
+            fn: 要执行的可调用对象。
+            *args: 传递给 fn 的位置参数。
+            priority: 任务优先级，同 submit()。
+            timeout_ms: 任务超时（毫秒），同 submit()。
+            **kwargs: 传递给 fn 的关键字参数。
+
+        Returns:
+            Any: 任务的返回值。
+
+        Raises:
+            RuntimeError: 当线程池已关闭，或当前线程没有正在运行的事件循环时。
+            asyncio.CancelledError: 任务被取消或超时。
+            Exception: 任务执行时抛出的异常。
+
+        Note:
+            任务在协程开始执行时才提交。等待队列已满且 queue_full_policy 为 "block" 时，
+            提交会阻塞事件循环所在的线程；"caller_runs" 会在事件循环线程中直接执行任务。
+            等待期间的唤醒方式见 QThreadWithReturn.__await__()。
+
+        Example:
+            >>> async def load_all(urls):
+            ...     return await asyncio.gather(*(pool.submit_async(fetch, url) for url in urls))
+        """
+        return await self.submit(fn, *args, priority=priority, timeout_ms=timeout_ms, **kwargs)
+
+    def _submit(
+            self,
+            fn: Callable,
+            args: tuple,
+            kwargs: dict,
+            policy: Optional[str],
+            priority: int = 0,
+            timeout_ms: Optional[int] = None,
+    ) -> Optional["QThreadWithReturn"]:
+        """按队列已满策略提交任务；policy 为 None 时队列已满直接返回 None"""
+        if timeout_ms is None:
+            timeout_ms = self._default_timeout_ms
+        elif not isinstance(timeout_ms, (int, float)):
+            raise TypeError(f"timeout_ms must be a number, got {type(timeout_ms).__name__}")
+        while True:
+            action = "enqueue"
+            waiter: Optional[_Waiter] = None
+            dropped: Optional[QThreadWithReturn] = None
+            with self._shutdown_lock:
+                if self._shutdown:
+                    raise RuntimeError("cannot schedule new futures after shutdown")
+                if self._is_queue_full():
+                    if policy is None:
+                        return None
+                    if policy == "raise":
+                        raise queue.Full(
+                            f"pending task queue is full (max_queue_size={self._max_queue_size})"
+                        )
+                    if policy == "caller_runs":
+                        action = "run_in_caller"
+                    elif policy == "drop_oldest":
+                        dropped = self._pop_oldest_pending()
+                    else:
+                        waiter = _Waiter()
+                        with self._queue_condition:
+                            self._space_waiters.append(waiter)
+                        # 登记后再检查一次，避免错过登记前刚刚释放的位置
+                        if self._is_queue_full():
+                            action = "wait"
+                        else:
+                            self._discard_space_waiter(waiter)
+                if action == "enqueue":
+                    future = self._enqueue(fn, args, kwargs, priority, timeout_ms)
+
+            # 在锁外取消被挤出的任务，其完成处理可能会访问线程池状态
+            if dropped is not None:
+                dropped.cancel()
+            if action == "enqueue":
+                return future
+            if action == "run_in_caller":
+                return self._run_in_caller(fn, args, kwargs)
+            try:
+                waiter.wait()
+            finally:
+                self._discard_space_waiter(waiter)
+
+    def _enqueue(
+            self, fn: Callable, args: tuple, kwargs: dict, priority: int = 0, timeout_ms: int = -1
+    ) -> "QThreadWithReturn":
+        """创建 Future 并加入等待队列（调用方需持有 _shutdown_lock）"""
+        self._thread_counter += 1
+        thread_name = None
+        if self._thread_name_prefix:
+            thread_name = (
+                f"{self._thread_name_prefix}-Worker-{self._thread_counter}"
+            )
+        future = QThreadWithReturn(
+            fn,
+            *args,
+            initializer=self._initializer,
+            initargs=self._initargs,
+            thread_name=thread_name,
+            **kwargs,
+        )
+        # 超时设置（各属性的含义见 QThreadWithReturn.__init__）
+        future._pool_timeout_ms = timeout_ms
+        if timeout_ms >= 0 and self._timeout_from == "submit":
+            future._pool_deadline = time.monotonic() + timeout_ms / 1000.0
+            # 排队期间到期时立即取消，而不是等到出队
+            future._queue_deadline = _deadlines.call_later(
+                timeout_ms / 1000.0, call_in_main_thread, self._expire_queued, future
+            )
+        future._timestamps["queued"] = time.monotonic()
+        self._metrics.increment(_metrics.SUBMITTED)
+        with self._counter_lock:
+            self._outstanding.add(future)
+        future._pool_done_hook = self._on_future_done
+        future._pool_callback_hook = self._record_callback_delay
+        if self._persistent_workers:
+            self._submit_to_workers(future, priority)
+            return future
+        with self._queue_condition:
+            self._push_pending(future, priority)
+        self._try_start_tasks()
+        return future
+
+    def _on_future_done(self, future: QThreadWithReturn) -> None:
+        """任务完成通知（可能在任意线程中调用）：最后一个任务完成时唤醒等待者"""
+        self._record_outcome(future)
+        with self._counter_lock:
+            self._outstanding.discard(future)
+            if self._outstanding or not self._idle_waiters:
+                return
+            waiters, self._idle_waiters = self._idle_waiters, []
+        for waiter in waiters:
+            waiter.wake()
+
+    def _record_started(self, future: QThreadWithReturn) -> None:
+        """任务出队开始执行：记录启动计数和排队时间"""
+        self._metrics.increment(_metrics.STARTED)
+        queued = future._timestamps.get("queued")
+        if queued is not None:
+            self._metrics.observe(_metrics.QUEUE_WAIT, time.monotonic() - queued)
+
+    def _record_outcome(self, future: QThreadWithReturn) -> None:
+        """任务完成（含取消）：记录结果计数和运行时间"""
+        metrics = self._metrics
+        if future._is_cancelled or future._is_force_stopped:
+            future._pool_callback_hook = None
+            metrics.increment(_metrics.CANCELLED)
+            return
+        failed = future._exception is not None
+        if not (future._failure_callbacks if failed else future._done_callbacks):
+            # 没有回调要执行，也就没有回调延迟
+            future._pool_callback_hook = None
+        metrics.increment(_metrics.FAILED if failed else _metrics.COMPLETED)
+        timestamps = future._timestamps
+        started = timestamps.get("started")
+        returned = timestamps.get("returned")
+        if started is not None and returned is not None:
+            metrics.observe(_metrics.RUN_TIME, returned - started)
+
+    def _record_callback_delay(self, future: QThreadWithReturn) -> None:
+        """第一个完成/失败回调开始执行：记录从任务函数返回到此刻的延迟"""
+        returned = future._timestamps.get("returned")
+        if returned is not None:
+            self._metrics.observe(_metrics.CALLBACK_DELAY, future._callback_timestamps[0] - returned)
+
+    def _wait_outstanding(self, timeout_ms: Optional[float]) -> List[QThreadWithReturn]:
+        """阻塞直到所有已提交任务完成或超时，返回仍未完成的任务。
+
+        主线程中等待时运行局部事件循环，完成处理和排队任务的启动照常进行。
+        timeout_ms 为 None 表示无限等待。
+        """
+        deadline = None if timeout_ms is None else time.monotonic() + timeout_ms / 1000.0
+        waiter = _Waiter()
+        while True:
+            with self._counter_lock:
+                if not self._outstanding:
+                    return []
+                if deadline is None:
+                    remaining_ms = -1
+                else:
+                    remaining_ms = int((deadline - time.monotonic()) * 1000)
+                    if remaining_ms <= 0:
+                        return list(self._outstanding)
+                self._idle_waiters.append(waiter)
+            try:
+                waiter.wait(remaining_ms)
+            finally:
+                with self._counter_lock, contextlib.suppress(ValueError):
+                    self._idle_waiters.remove(waiter)
+
+    def _push_pending(self, future: QThreadWithReturn, priority: int) -> None:
+        """将任务加入等待队列（调用方需持有 _queue_condition）"""
+        if priority != 0 and not self._priority_scheduling:
+            # 首个带优先级的任务：切换为堆队列，已排队的任务保持原顺序
+            self._pending_tasks = _PriorityTaskQueue.from_queue(
+                self._pending_tasks, self._priority_aging_ms
+            )
+            self._priority_scheduling = True
+        if self._priority_scheduling:
+            self._pending_tasks.append(future, priority)
+        else:
+            self._pending_tasks.append(future)
+
+    def _is_queue_full(self) -> bool:
+        return 0 < self._max_queue_size <= len(self._pending_tasks)
+
+    def _pop_oldest_pending(self) -> Optional["QThreadWithReturn"]:
+        """取出队列中最早提交的等待任务（drop_oldest 策略）"""
+        with self._queue_condition:
+            try:
+                return self._pending_tasks.pop_oldest()
+            except IndexError:
+                return None
+
+    def _run_in_caller(self, fn: Callable, args: tuple, kwargs: dict) -> "QThreadWithReturn":
+        """在调用线程中直接执行任务（caller_runs 策略），返回已完成的 Future"""
+        future = QThreadWithReturn(fn, *args, **kwargs)
+        future._pool_done_hook = self._record_outcome
+        timestamps = future._timestamps
+        timestamps["queued"] = time.monotonic()
+        self._metrics.increment(_metrics.SUBMITTED)
+        self._record_started(future)
+        timestamps["started"] = time.monotonic()
+        try:
+            result = future._call_task(*args, **future._task_kwargs())
+        except Exception as e:
+            timestamps["returned"] = time.monotonic()
+            future._set_exception(e)
+            self._call_failure_callbacks(e)
+        else:
+            timestamps["returned"] = time.monotonic()
+            future._set_result(result)
+        return future
+
+    def _discard_space_waiter(self, waiter: _Waiter) -> None:
+        with self._queue_condition:
+            with contextlib.suppress(ValueError):
+                self._space_waiters.remove(waiter)
+
+    def _notify_queue_space(self) -> None:
+        """等待队列有任务出队（或线程池关闭）时唤醒阻塞的 submit()"""
+        if not self._space_waiters:
+            return
+        with self._queue_condition:
+            waiters = list(self._space_waiters)
+        for waiter in waiters:
+            waiter.wake()
+
+    def _task_timeout_ms(self, future: QThreadWithReturn) -> Optional[int]:
+        """任务出队时调用：撤销排队截止时间，返回执行阶段的超时（毫秒）。
+
+        None 表示无超时，0 表示截止时间已过。
+        """
+        queue_deadline, future._queue_deadline = future._queue_deadline, None
+        if queue_deadline is not None:
+            queue_deadline.cancel()
+        if future._pool_timeout_ms < 0:
+            return None
+        if future._pool_deadline is None:
+            # 从开始执行时计时；0 超时与 start() 相同，按 1ms 处理
+            return max(1, int(future._pool_timeout_ms))
+        remaining = future._pool_deadline - time.monotonic()
+        return max(1, int(remaining * 1000)) if remaining > 0 else 0
+
+    def _expire_queued(self, future: QThreadWithReturn) -> None:
+        """截止时间到达时任务仍在排队：移出队列并取消，不占用工作线程"""
+        future._queue_deadline = None
+        with self._queue_condition:
+            removed = self._pending_tasks.discard(future)
+        if not removed:
+            return
+        self._notify_queue_space()
+        future.cancel()
+        # 逐任务 QThread 模式下排队中的任务尚未连接完成处理，需要补发池完成回调
+        if not self._persistent_workers and self._is_pool_complete():
+            self._execute_done_callbacks()
+
+    def map(
+            self,
+            fn: Callable,
+            *iterables: Iterable,
+            chunksize: int = 1,
+            ordered: bool = True,
+            timeout_ms: int = -1,
+            prefetch: Optional[int] = None,
+    ) -> Iterator[Any]:
+        """对输入的每一组参数执行 fn，以生成器形式返回结果。
+
+        输入按需惰性读取，每 chunksize 组参数打包为一个任务提交，线程池中同时
+        最多保留 prefetch 个已提交但结果尚未取走的分块。调用时立即提交第一批分块，
+        之后每取走一个分块的结果再提交下一个，因此不会一次性构建完整的输入或输出列表。
+
+        Args:
+            fn: 要执行的可调用对象，以 fn(*args) 的形式调用。
+            *iterables: 一个或多个可迭代对象，按 zip 的方式组合为参数。
+            chunksize: 每个任务包含的参数组数量。大量短任务时增大该值可减少开销。
+            ordered: 为 True 时按输入顺序返回结果；为 False 时按分块完成顺序返回。
+            timeout_ms: 从调用 map 开始计算的总超时时间（毫秒）。<=0 表示无超时。
+            prefetch: 同时在途的最大分块数。None 表示 max_workers * 2。
+
+        Returns:
+            Iterator[Any]: 结果生成器。
+
+        Raises:
+            RuntimeError: 当线程池已关闭时。
+            ValueError: 当 chunksize 或 prefetch 小于 1 时。
+            TypeError: 如果 timeout_ms 不是数字类型。
+            TimeoutError: 迭代时超过 timeout_ms 仍未取得下一个结果。
+            Exception: fn 抛出的异常在迭代到对应分块时重新抛出。
+
+        Note:
+            - 生成器提前关闭（break、异常、超时）时会取消尚未开始执行的分块。
+            - 由于分块是逐步提交的，消费结果较慢时线程池可能短暂处于空闲状态，
+              池级别完成回调可能在 map 结束之前触发。
+
+        Example:
+            >>> pool = QThreadPoolExecutor(max_workers=4)
+            >>> for result in pool.map(lambda x: x * x, range(10)):
+            ...     print(result)
+            >>> # 大量短任务，按完成顺序处理
+            >>> for result in pool.map(str.upper, words, chunksize=100, ordered=False):
+            ...     print(result)
+        """
+        if not isinstance(timeout_ms, (int, float)):
+            raise TypeError(f"timeout_ms must be a number, got {type(timeout_ms).__name__}")
+        if chunksize < 1:
+            raise ValueError("chunksize must be >= 1")
+        if prefetch is None:
+            prefetch = self._max_workers * 2
+        elif prefetch < 1:
+            raise ValueError("prefetch must be >= 1")
         with self._shutdown_lock:
             if self._shutdown:
                 raise RuntimeError("cannot schedule new futures after shutdown")
-            self._thread_counter += 1
-            thread_name = None
-            if self._thread_name_prefix:
-                thread_name = (
-                    f"{self._thread_name_prefix}-Worker-{self._thread_counter}"
-                )
-            future = QThreadWithReturn(
-                fn,
-                *args,
-                initializer=self._initializer,
-                initargs=self._initargs,
-                thread_name=thread_name,
-                **kwargs,
-            )
-            self._pending_tasks.append(future)
-            self._try_start_tasks()
-            return future
+
+        deadline = time.monotonic() + timeout_ms / 1000.0 if timeout_ms > 0 else None
+        args_iter = zip(*iterables)
+        in_flight: Deque[QThreadWithReturn] = deque()
+        completed: "queue.SimpleQueue[QThreadWithReturn]" = queue.SimpleQueue()
+        waiter = _Waiter()
+
+        def on_complete(fut: QThreadWithReturn) -> None:
+            completed.put(fut)
+            waiter.wake()
+
+        def submit_next_chunk() -> None:
+            chunk = list(itertools.islice(args_iter, chunksize))
+            if not chunk:
+                return
+            future = self.submit(_run_chunk, fn, chunk)
+            in_flight.append(future)
+            if not ordered:
+                future._add_completion_hook(on_complete)
+
+        def remaining_ms() -> float:
+            if deadline is None:
+                return -1
+            remaining = (deadline - time.monotonic()) * 1000.0
+            if remaining <= 0:
+                raise TimeoutError()
+            return remaining
+
+        def next_done_chunk() -> QThreadWithReturn:
+            if ordered:
+                # 取得结果后再出队：超时时该分块仍在 in_flight 中，关闭时会被取消
+                future = in_flight[0]
+                future.result(timeout_ms=remaining_ms())
+                return in_flight.popleft()
+            while True:
+                try:
+                    future = completed.get_nowait()
+                except queue.Empty:
+                    waiter.wait(remaining_ms())
+                    continue
+                in_flight.remove(future)
+                return future
+
+        def results() -> Iterator[Any]:
+            try:
+                while in_flight:
+                    chunk_results = next_done_chunk().result()
+                    # 先补充下一个分块，让工作线程在消费方处理结果时保持忙碌
+                    submit_next_chunk()
+                    yield from chunk_results
+            finally:
+                for future in in_flight:
+                    future._remove_completion_hook(on_complete)
+                    if not future.running():
+                        future.cancel()
+
+        for _ in range(prefetch):
+            submit_next_chunk()
+        return results()
+
+    def _submit_to_workers(self, future: QThreadWithReturn, priority: int = 0) -> None:
+        """常驻工作线程模式：将任务放入队列并唤醒空闲工作线程"""
+        has_app = app_instance() is not None
+        if has_app and self._relay is None:
+            self._relay = _TaskRelay()
+
+        # 提交时即连接完成处理，取消排队中的任务也能及时更新池状态；
+        # 无Qt应用时排队信号无法投递，直接在发射线程中处理
+        future._pool_connection = future.finished_signal.connect(
+            self._make_finished_handler(future),
+            Qt.AutoConnection if has_app else Qt.DirectConnection,
+        )
+        future._pool_managed = True
+
+        if not self._self_reference:
+            self._self_reference = self
+
+        with self._queue_condition:
+            self._push_pending(future, priority)
+            if self._idle_workers == 0 and self._live_workers < self._max_workers:
+                self._spawn_worker()
+            self._queue_condition.notify()
 
     def _try_start_tasks(self):
         # COUNTER LOCK FIX: Check capacity atomically to prevent race conditions
@@ -182,6 +752,18 @@ class QThreadPoolExecutor:
         if not self._self_reference and (self._active_futures or self._pending_tasks):
             self._self_reference = self
 
+        # Fast path: pool saturated, nothing can start until a task finishes
+        # (the finishing task calls _try_start_tasks again after releasing its slot)
+        if self._running_workers >= self._max_workers:
+            return
+
+        # 无Qt应用时没有事件循环投递跨线程的排队信号，完成处理直接在发射线程中执行
+        connection_type = (
+            Qt.AutoConnection if app_instance() is not None else Qt.DirectConnection
+        )
+
+        skipped_cancelled = False
+        popped = False
         while self._pending_tasks:
             can_start = False
             with self._counter_lock:
@@ -195,75 +777,28 @@ class QThreadPoolExecutor:
                 break  # Pool is full, stop trying
 
             # Pop task AFTER we've reserved a slot
-            future = self._pending_tasks.pop(0)
-
-            # GC BUG FIX: Use strong reference to keep pool alive until all tasks complete
-            # The circular reference (pool → future → signal → closure → pool) is properly
-            # broken by signal disconnection (line 220) and future removal (line 214).
-            # Using weak reference causes pool to be GC'd when it's a local variable,
-            # preventing pending tasks from being scheduled after active tasks complete.
-            # This matches the behavior of concurrent.futures.ThreadPoolExecutor.
-            strong_self = self  # Strong reference to pool
-
-            def make_safe_on_finished(fut):
-                def safe_on_finished():
-                    # strong_self is always valid because pool is kept alive
-                    try:
-                        # COUNTER LOCK FIX: Use dedicated lock for atomic counter operations
-                        # This prevents race conditions when multiple tasks complete simultaneously
-                        with strong_self._counter_lock:
-                            strong_self._running_workers = max(
-                                0, strong_self._running_workers - 1
-                            )
-                            strong_self._active_futures.discard(fut)
-
-                        # NEW: Check for task failure and call failure callbacks
-                        try:
-                            exc = fut.exception()
-                            if exc is not None:
-                                strong_self._call_failure_callbacks(exc)
-                        except CancelledError:
-                            # Task was cancelled, not a failure
-                            pass
-                        except Exception as e:
-                            # Ignore exceptions from exception() call itself
-                            pass
-
-                        # MEMORY LEAK FIX: Disconnect signal immediately after completion
-                        # This breaks the circular reference: future → signal → closure → pool
-                        with contextlib.suppress(RuntimeError, TypeError):
-                            if hasattr(fut, "_pool_connection"):
-                                fut.finished_signal.disconnect(fut._pool_connection)
-                                del fut._pool_connection
-                            if hasattr(fut, "_pool_managed"):
-                                del fut._pool_managed
-
-                        # NEW: Check if pool is complete and call done callbacks
-                        if strong_self._is_pool_complete():
-                            strong_self._execute_done_callbacks()
-
-                        # SHUTDOWN FIX: Start pending tasks even during shutdown
-                        # Standard ThreadPoolExecutor behavior: pending tasks execute unless cancel_futures=True
-                        # The check for shutdown is now inside _try_start_tasks (it checks if tasks were cancelled)
-                        strong_self._try_start_tasks()
-                    except Exception as e:
-                        # COUNTER LOCK FIX: Emergency counter correction with lock protection
-                        print(
-                            f"Warning: Error in task completion handler: {e}",
-                            file=sys.stderr,
-                        )
-                        with contextlib.suppress(Exception):
-                            with strong_self._counter_lock:
-                                strong_self._running_workers = max(
-                                    0, strong_self._running_workers - 1
-                                )
+            with self._queue_condition:
+                future = self._pending_tasks.popleft() if self._pending_tasks else None
+            if future is None:
+                with self._counter_lock:
+                    self._running_workers = max(0, self._running_workers - 1)
+                break
+            popped = True
 
-                return safe_on_finished
+            # 排队期间被取消或已超过截止时间的任务不再启动（start() 会重置取消状态）
+            timeout_ms = self._task_timeout_ms(future)
+            if future._is_cancelled or timeout_ms == 0:
+                if not future._is_cancelled:
+                    future.cancel()
+                with self._counter_lock:
+                    self._running_workers = max(0, self._running_workers - 1)
+                skipped_cancelled = True
+                continue
 
             try:
                 # Connect signal
                 connection = future.finished_signal.connect(
-                    make_safe_on_finished(future)
+                    self._make_finished_handler(future), connection_type
                 )
                 future._pool_connection = connection
                 # COUNTER LOCK FIX: Mark as pool-managed to prevent cleanup from disconnecting
@@ -272,9 +807,10 @@ class QThreadPoolExecutor:
                 # Add to active set
                 with self._counter_lock:
                     self._active_futures.add(future)
+                self._record_started(future)
 
                 # Start thread LAST
-                future.start()
+                future.start(-1 if timeout_ms is None else timeout_ms)
 
             except Exception as e:
                 # STRESS TEST FIX: Rollback on failure
@@ -291,22 +827,261 @@ class QThreadPoolExecutor:
                         self._running_workers = max(0, self._running_workers - 1)
 
                     # Re-add to pending (retry once)
-                    self._pending_tasks.insert(0, future)
+                    with self._queue_condition:
+                        self._pending_tasks.appendleft(future)
                 break  # Stop after error
 
+        if popped:
+            self._notify_queue_space()
+
+        # 跳过的已取消任务可能是最后的待处理任务，此时需要补发池完成回调
+        if skipped_cancelled and self._is_pool_complete():
+            self._execute_done_callbacks()
+
+    def _make_finished_handler(self, fut: QThreadWithReturn) -> Callable[[], None]:
+        """创建任务完成处理函数，连接到 future.finished_signal"""
+        # GC BUG FIX: Use strong reference to keep pool alive until all tasks complete
+        # The circular reference (pool → future → signal → closure → pool) is properly
+        # broken by signal disconnection and future removal in the handler.
+        # Using weak reference causes pool to be GC'd when it's a local variable,
+        # preventing pending tasks from being scheduled after active tasks complete.
+        # This matches the behavior of concurrent.futures.ThreadPoolExecutor.
+        strong_self = self  # Strong reference to pool
+
+        def safe_on_finished():
+            # strong_self is always valid because pool is kept alive
+            try:
+                if strong_self._persistent_workers:
+                    # 常驻工作线程自行维护 _running_workers；
+                    # 排队中被取消的任务需要立即移出队列，否则池永远不会完成
+                    with strong_self._queue_condition:
+                        if strong_self._pending_tasks.discard(fut):
+                            strong_self._notify_queue_space()
+                    with strong_self._counter_lock:
+                        strong_self._active_futures.discard(fut)
+                else:
+                    # COUNTER LOCK FIX: Use dedicated lock for atomic counter operations
+                    # This prevents race conditions when multiple tasks complete simultaneously
+                    with strong_self._counter_lock:
+                        strong_self._running_workers = max(
+                            0, strong_self._running_workers - 1
+                        )
+                        strong_self._active_futures.discard(fut)
+
+                # NEW: Check for task failure and call failure callbacks
+                try:
+                    exc = fut.exception()
+                    if exc is not None:
+                        strong_self._call_failure_callbacks(exc)
+                except CancelledError:
+                    # Task was cancelled, not a failure
+                    pass
+                except Exception as e:
+                    # Ignore exceptions from exception() call itself
+                    pass
+
+                # MEMORY LEAK FIX: Disconnect signal immediately after completion
+                # This breaks the circular reference: future → signal → closure → pool
+                with contextlib.suppress(RuntimeError, TypeError):
+                    if hasattr(fut, "_pool_connection"):
+                        fut.finished_signal.disconnect(fut._pool_connection)
+                        del fut._pool_connection
+                    fut._pool_managed = False
+
+                # NEW: Check if pool is complete and call done callbacks
+                if strong_self._is_pool_complete():
+                    strong_self._execute_done_callbacks()
+
+                # SHUTDOWN FIX: Start pending tasks even during shutdown
+                # Standard ThreadPoolExecutor behavior: pending tasks execute unless cancel_futures=True
+                # The check for shutdown is now inside _try_start_tasks (it checks if tasks were cancelled)
+                if not strong_self._persistent_workers:
+                    strong_self._try_start_tasks()
+            except Exception as e:
+                # COUNTER LOCK FIX: Emergency counter correction with lock protection
+                print(
+                    f"Warning: Error in task completion handler: {e}",
+                    file=sys.stderr,
+                )
+                if not strong_self._persistent_workers:
+                    with contextlib.suppress(Exception):
+                        with strong_self._counter_lock:
+                            strong_self._running_workers = max(
+                                0, strong_self._running_workers - 1
+                            )
+
+        return safe_on_finished
+
+    def _spawn_worker(self) -> None:
+        """创建一个常驻工作线程（调用方需持有 _queue_condition）"""
+        # 丢弃因空闲而退出的线程，列表长度不随线程的退出和重建增长
+        self._workers = [entry for entry in self._workers if _worker_thread_alive(entry[0])]
+        self._live_workers += 1
+        index = next(self._worker_counter)
+        name = f"{self._thread_name_prefix or 'QThreadPoolExecutor'}-Worker-{index}"
+
+        if app_instance() is not None:
+            thread = QThread()
+            thread.setObjectName(name)
+            worker = _PersistentWorker(self)
+            worker.moveToThread(thread)
+            thread.started.connect(worker._run, Qt.QueuedConnection)
+            self._workers.append((thread, worker))
+            thread.start()
+            # 线程池可能在工作线程退出途中被回收（任务循环结束时释放了对线程池的引用），
+            # 由全局登记表保留 QThread，直到线程真正结束
+            _track_thread(thread, worker)
+        else:
+            # 没有Qt应用，使用标准线程
+            thread = threading.Thread(target=self._worker_loop, name=name, daemon=True)
+            self._workers.append((thread, None))
+            thread.start()
+
+    def _worker_loop(self) -> None:
+        """常驻工作线程主循环：从队列中取任务执行，直到线程池关闭且队列为空，
+        或空闲超过 _WORKER_IDLE_TIMEOUT_S 秒"""
+        if self._initializer:
+            with contextlib.suppress(Exception):
+                self._initializer(*self._initargs)
+
+        while True:
+            with self._queue_condition:
+                while (
+                        not self._pending_tasks
+                        and not self._shutdown
+                        and not self._stop_workers_requested
+                ):
+                    self._idle_workers += 1
+                    try:
+                        notified = self._queue_condition.wait(_WORKER_IDLE_TIMEOUT_S)
+                    finally:
+                        self._idle_workers -= 1
+                    if not notified and not self._pending_tasks and not self._shutdown:
+                        # 与 submit() 在同一把锁内判断：退出后新任务会创建新的工作线程
+                        self._live_workers -= 1
+                        return
+                if self._stop_workers_requested or not self._pending_tasks:
+                    self._live_workers -= 1
+                    return
+                future = self._pending_tasks.peek()
+                # 先加入活跃集合再出队，保证 _is_pool_complete() 不会在两者之间误判
+                with self._counter_lock:
+                    self._active_futures.add(future)
+                    self._running_workers += 1
+                self._pending_tasks.popleft()
+                self._notify_queue_space()
+
+            try:
+                timeout_ms = self._task_timeout_ms(future)
+                if timeout_ms == 0 and not future._is_cancelled:
+                    future.cancel()
+                if future._is_cancelled:
+                    continue
+                if timeout_ms is not None:
+                    # 无法终止共享的工作线程：到期时只取消 Future，结果被丢弃
+                    future._schedule_timeout(timeout_ms)
+                self._record_started(future)
+                future._pool_running = True
+                timestamps = future._timestamps
+                timestamps["started"] = time.monotonic()
+                try:
+                    result = future._call_task(*future._args, **future._task_kwargs())
+                    error = None
+                except Exception as e:
+                    result, error = None, e
+                finally:
+                    timestamps["returned"] = time.monotonic()
+                    future._pool_running = False
+
+                if self._stop_workers_requested:
+                    continue
+                relay = self._relay
+                if relay is not None and app_instance() is not None:
+                    # 有Qt应用，通过信号把结果投递到主线程
+                    if error is None:
+                        relay._result_signal.emit(future, result)
+                    else:
+                        relay._error_signal.emit(future, error)
+                elif error is None:
+                    future._on_finished(result)
+                else:
+                    future._on_error(error)
+            finally:
+                with self._counter_lock:
+                    self._running_workers = max(0, self._running_workers - 1)
+
+    def _stop_workers(self, force_stop: bool = False, deadline: Optional[float] = None) -> None:
+        """停止所有常驻工作线程并等待其退出。
+
+        Args:
+            force_stop: 如果为 True，放弃队列中剩余任务，并对未响应的线程并行分阶段
+                强制终止，总耗时不超过 DEFAULT_FORCE_STOP_TIMEOUT_MS。
+            deadline: 非强制停止时等待的截止时间（time.monotonic()），None 表示无限等待。
+        """
+        threads = self._request_workers_stop(force_stop)
+        if force_stop:
+            _force_stop_threads(
+                threads, time.monotonic() + DEFAULT_FORCE_STOP_TIMEOUT_MS / 1000.0
+            )
+            return
+        if deadline is not None:
+            _wait_threads(threads, deadline)
+            return
+        for thread in threads:
+            with contextlib.suppress(RuntimeError):
+                if isinstance(thread, threading.Thread):
+                    thread.join()
+                else:
+                    thread.wait()
+
+    def _request_workers_stop(self, force_stop: bool) -> list:
+        """唤醒所有常驻工作线程使其退出，返回需要等待的线程（不含当前线程）"""
+        with self._queue_condition:
+            if force_stop:
+                self._stop_workers_requested = True
+            self._queue_condition.notify_all()
+            workers = list(self._workers)
+
+        current = threading.current_thread()
+        threads = []
+        for thread, _worker in workers:
+            if isinstance(thread, threading.Thread):
+                if thread is not current and thread.is_alive():
+                    threads.append(thread)
+                continue
+            with contextlib.suppress(RuntimeError):
+                if thread != QThread.currentThread() and thread.isRunning():
+                    threads.append(thread)
+        return threads
+
     def shutdown(
             self,
             force_stop: bool = False,
             *,
             cancel_futures: bool = False,
             wait: bool = False,
-    ) -> None:
+            timeout_ms: Optional[int] = None,
+    ) -> List[QThreadWithReturn]:
         """关闭线程池。
 
         Args:
             force_stop: 如果为 True，立即强制终止所有任务（最高优先级），忽略其他参数。
             cancel_futures: 如果为 True，取消所有待处理的任务。
             wait: 如果为 True，阻塞直到任务完成。会发出警告，因为可能导致UI冻结。
+            timeout_ms: force_stop=True 时强制停止的总时间预算（毫秒），与线程数无关。
+                None 表示 DEFAULT_FORCE_STOP_TIMEOUT_MS（2300）。
+                wait=True 时为最长等待时间，None 表示无限等待。
+
+        Returns:
+            List[QThreadWithReturn]: 未完成的任务列表，所有路径都返回列表（不返回 None）：
+            - wait=True：等待超时时仍未完成的任务（任务继续运行，之后可以单独等待或
+              取消），全部按时完成时为空列表
+            - force_stop=True：所有任务都已被强制结束，返回空列表
+            - wait=False：不等待，返回空列表
+
+        Raises:
+            TypeError: 当 timeout_ms 不是数字类型时。
+            ValueError: 当 timeout_ms < 0 时。
 
         优先级说明:
             1. force_stop=True: 最高优先级，立即强制停止所有任务并触发回调，忽略其他参数
@@ -316,6 +1091,9 @@ class QThreadPoolExecutor:
         Note:
             - shutdown 后不能再提交新任务
             - force_stop=True 会立即标记所有任务为完成并触发池级别回调
+            - force_stop=True 并行停止所有线程：先同时发出中断请求、取消令牌并
+              请求退出，整组等待宽限期后统一 terminate 仍未退出的线程，所有等待
+              共享同一个截止时间
             - wait=True 会发出警告，因为可能导致UI无响应
             - 池级别完成回调会在所有任务完成后自动触发
 
@@ -323,18 +1101,26 @@ class QThreadPoolExecutor:
             >>> pool = QThreadPoolExecutor(max_workers=2)
             >>> # 提交一些任务...
             >>> pool.shutdown(force_stop=True)  # 立即强制停止所有任务
+            >>> pool.shutdown(force_stop=True, timeout_ms=500)  # 最多阻塞约 500ms
             ...
             >>> # 取消待处理任务，等待活跃任务
             >>> pool.shutdown(cancel_futures=True, wait=True)
             ...
+            >>> # 最多等待 5 秒，报告仍未完成的任务
+            >>> unfinished = pool.shutdown(wait=True, timeout_ms=5000)
+            >>> for future in unfinished:
+            ...     future.cancel(force_stop=True)
+            ...
             >>> # UI应用中推荐使用异步关闭
             >>> pool.shutdown()  # 不阻塞主线程
         """
-        import warnings
-        import time
-        from PySide6.QtWidgets import QApplication
+        if timeout_ms is not None:
+            if not isinstance(timeout_ms, (int, float)):
+                raise TypeError(f"timeout_ms must be a number, got {type(timeout_ms).__name__}")
+            if timeout_ms < 0:
+                raise ValueError("timeout_ms must be >= 0")
 
-        # PRIORITY 1: force_stop 最高优先级路径 - 改进版
+        # PRIORITY 1: force_stop 最高优先级路径 - 并行停止所有线程
         if force_stop:
             # 发出 wait 警告（如果设置了 wait=True）
             if wait:
@@ -342,63 +1128,44 @@ class QThreadPoolExecutor:
                     "Setting wait=True will block until all tasks complete, "
                     "which may cause UI freezing and application unresponsiveness.",
                     UserWarning,
-                    stacklevel=2
+                    stacklevel=self._shutdown_warning_stacklevel
                 )
+            budget_ms = DEFAULT_FORCE_STOP_TIMEOUT_MS if timeout_ms is None else timeout_ms
+            deadline = time.monotonic() + budget_ms / 1000.0
 
             # 标记池为已关闭
-            with self._shutdown_lock:
+            with self._shutdown_lock, self._queue_condition:
                 self._shutdown = True
                 # 收集所有任务（pending + active）
                 all_tasks = list(self._pending_tasks) + list(self._active_futures)
                 # 立即清空任务列表
                 self._pending_tasks.clear()
                 self._active_futures.clear()
+            # 唤醒因队列已满而阻塞的 submit()，使其抛出 RuntimeError
+            self._notify_queue_space()
 
-            # 对每个任务进行分阶段强制停止处理
+            # 先通知所有协作式任务，再收集需要停止的线程
+            threads = []
             for future in all_tasks:
                 try:
-                    # 第一阶段：请求中断（给线程优雅退出的机会）
-                    if future._thread and future._thread.isRunning():
-                        future._thread.requestInterruption()
-                        if hasattr(future, '_worker') and future._worker:
-                            future._worker._should_stop = True
-
-                        # 短暂等待（100ms）
-                        if future._thread.wait(100):
-                            # 优雅退出成功
-                            with contextlib.suppress(Exception):
-                                future._mutex.lock()
-                                try:
-                                    if not future._is_finished:
-                                        future._is_finished = True
-                                        future._is_force_stopped = True
-                                        future._wait_condition.wakeAll()
-                                finally:
-                                    future._mutex.unlock()
-                            continue
-
-                        # 第二阶段：quit（半优雅退出）
-                        future._thread.quit()
-                        if future._thread.wait(200):
-                            # 半优雅退出成功
-                            with contextlib.suppress(Exception):
-                                future._mutex.lock()
-                                try:
-                                    if not future._is_finished:
-                                        future._is_finished = True
-                                        future._is_force_stopped = True
-                                        future._wait_condition.wakeAll()
-                                finally:
-                                    future._mutex.unlock()
-                            continue
-
-                        # 第三阶段：terminate（最后手段）
-                        with contextlib.suppress(Exception):
-                            future._thread.terminate()
-                            # 关键：等待足够长时间确保线程真正终止
-                            future._thread.wait(2000)
-
-                    # 安全地标记状态（所有退出路径都执行）
+                    if future._cancel_token is not None:
+                        future._cancel_token.cancel()
+                    if future._worker is not None:
+                        future._worker._should_stop = True
+                    thread = future._thread
+                    if thread is not None and thread.isRunning():
+                        threads.append(thread)
+                except Exception as e:
+                    print(f"Error force-stopping task: {e}", file=sys.stderr)
+            # 常驻工作线程模式：池自身的工作线程与任务线程一起停止
+            if self._persistent_workers:
+                threads.extend(self._request_workers_stop(force_stop=True))
+
+            _force_stop_threads(threads, deadline)
+
+            for future in all_tasks:
+                try:
+                    # 安全地标记状态
                     with contextlib.suppress(Exception):
                         future._mutex.lock()
                         try:
@@ -408,41 +1175,32 @@ class QThreadPoolExecutor:
                                 future._wait_condition.wakeAll()
                         finally:
                             future._mutex.unlock()
+                    future._set_completion_event()
 
                     # 断开池管理的信号连接（防止访问已销毁对象）
                     with contextlib.suppress(Exception):
                         if hasattr(future, "_pool_connection"):
                             future.finished_signal.disconnect(future._pool_connection)
                             del future._pool_connection
-                        if hasattr(future, "_pool_managed"):
-                            del future._pool_managed
-
-                    # 等待 Qt 事件循环处理信号断开
-                    app = QApplication.instance()
-                    if app is not None:
-                        app.processEvents()
-
+                        future._pool_managed = False
                 except Exception as e:
                     print(f"Error force-stopping task: {e}", file=sys.stderr)
 
-            # 统一处理 Qt 事件和回调
-            app = QApplication.instance()
+            # 统一处理 Qt 事件和回调（deleteLater、信号断开），在剩余预算内最多约 150ms
+            app = app_instance()
             if app is not None:
-                # 多次处理事件，确保所有 deleteLater 和信号完成
-                for _ in range(10):
-                    app.processEvents()
-                    time.sleep(0.01)  # 10ms
-
-                # 最终处理确保回调完成
-                time.sleep(0.05)  # 50ms
                 app.processEvents()
+                settle_deadline = min(deadline, time.monotonic() + 0.15)
+                while time.monotonic() < settle_deadline:
+                    time.sleep(0.01)  # 10ms
+                    app.processEvents()
 
             # 检查并调用池级别完成回调
             if self._is_pool_complete():
                 self._execute_done_callbacks()
 
             # force_stop 立即返回，不管其他参数
-            return
+            return []
 
         # PRIORITY 2: 标准路径 - cancel_futures 和 wait
         # 发出 wait 警告
@@ -451,7 +1209,7 @@ class QThreadPoolExecutor:
                 "Setting wait=True will block until all tasks complete, "
                 "which may cause UI freezing and application unresponsiveness.",
                 UserWarning,
-                stacklevel=2
+                stacklevel=self._shutdown_warning_stacklevel
             )
 
         # 标准关闭逻辑
@@ -464,74 +1222,71 @@ class QThreadPoolExecutor:
 
             # 取消待处理任务（如果 cancel_futures=True）
             if not already_shutdown and cancel_futures:
-                pending_copy = list(self._pending_tasks)
+                with self._queue_condition:
+                    pending_copy = list(self._pending_tasks)
+                    self._pending_tasks.clear()
                 for future in pending_copy:
                     with contextlib.suppress(Exception):
                         future.cancel(force_stop=False)
-                self._pending_tasks.clear()
+
+            # 唤醒空闲的常驻工作线程，使其在队列清空后退出
+            with self._queue_condition:
+                self._queue_condition.notify_all()
+            # 唤醒因队列已满而阻塞的 submit()，使其抛出 RuntimeError
+            self._notify_queue_space()
 
             # 复制活跃任务列表
             active_copy = list(self._active_futures)
 
         # 如果 wait=True，等待所有任务完成（包括新启动的任务）
+        unfinished: List[QThreadWithReturn] = []
         if wait:
             # DEADLOCK FIX: Set flag to prevent _try_start_tasks from starting cancelled tasks
             # Only set this when cancel_futures=True, otherwise pending tasks should be allowed to start
             if cancel_futures:
                 self._waiting_for_shutdown = True
             try:
-                start_time = time.time()
-                max_wait_time = 60.0  # 增加到 60 秒以支持长时间运行的任务
-
-                # 轮询等待所有任务完成
+                deadline = None if timeout_ms is None else time.monotonic() + timeout_ms / 1000.0
+                # 阻塞在池级别的完成通知上，最后一个任务完成时被唤醒
                 # 注意：不能只等待 active_copy，因为 pending_tasks 会被动态启动
-                while (time.time() - start_time) < max_wait_time:
-                    # 获取当前所有活跃和待处理的任务（动态检查）
-                    with self._counter_lock:
-                        current_active = list(self._active_futures)
-                        current_pending = list(self._pending_tasks)
-
-                    # 如果没有未完成的任务，退出
-                    # HANG FIX: Check if futures are done, not just if set is empty
-                    # Cancelled futures may still be in _active_futures but are done()
-                    active_not_done = [f for f in current_active if not f.done()]
-                    if not active_not_done and not current_pending:
-                        break
-
-                    # 检查并等待活跃任务
-                    for future in current_active:
-                        try:
-                            if not future.done():
-                                future.wait(50, force_stop=False)  # 50ms 非阻塞检查
-                        except Exception:
-                            pass  # 忽略异常，继续检查其他任务
+                unfinished = self._wait_outstanding(timeout_ms)
 
-                    # 处理 Qt 事件（允许新任务启动和回调执行）
-                    app = QApplication.instance()
-                    if app is not None:
-                        app.processEvents()
+                if not unfinished:
+                    # 清理引用
+                    self._active_futures.clear()
+                    with self._queue_condition:
+                        self._pending_tasks.clear()
 
-                    time.sleep(0.01)
+                    # 等待常驻工作线程退出
+                    if self._persistent_workers:
+                        self._stop_workers(deadline=deadline)
 
-                # 清理引用
-                self._active_futures.clear()
-                self._pending_tasks.clear()
-
-                # 处理剩余的 Qt 事件
-                app = QApplication.instance()
-                if app is not None:
-                    app.processEvents()
-                    time.sleep(0.05)
-                    app.processEvents()
-
-                # 断开信号连接
-                for future in active_copy:
-                    with contextlib.suppress(RuntimeError, TypeError):
-                        if hasattr(future, "_pool_connection"):
-                            future.finished_signal.disconnect(future._pool_connection)
-                            del future._pool_connection
-                        if hasattr(future, "_pool_managed"):
-                            del future._pool_managed
+                    # 处理剩余的 Qt 事件；任务已完成但 QThread 仍在退出途中时，
+                    # 短暂等待其结束后再处理一次（线程结束的通知需要事件循环投递）
+                    app = app_instance()
+                    if app is not None:
+                        app.processEvents()
+                        exiting = [
+                            future._thread for future in active_copy
+                            if future._thread is not None and _is_thread_running(future._thread)
+                        ]
+                        if exiting:
+                            exit_deadline = time.monotonic() + 0.05
+                            for thread in exiting:
+                                remaining_ms = int((exit_deadline - time.monotonic()) * 1000)
+                                if remaining_ms <= 0:
+                                    break
+                                with contextlib.suppress(RuntimeError):
+                                    thread.wait(remaining_ms)
+                            app.processEvents()
+
+                    # 断开信号连接
+                    for future in active_copy:
+                        with contextlib.suppress(RuntimeError, TypeError):
+                            if hasattr(future, "_pool_connection"):
+                                future.finished_signal.disconnect(future._pool_connection)
+                                del future._pool_connection
+                            future._pool_managed = False
             finally:
                 # DEADLOCK FIX: Always clear the flag after wait completes
                 self._waiting_for_shutdown = False
@@ -539,6 +1294,70 @@ class QThreadPoolExecutor:
         # 检查并调用池级别完成回调
         if self._is_pool_complete():
             self._execute_done_callbacks()
+        return unfinished
+
+    def stats(self) -> dict:
+        """返回线程池运行指标的快照。
+
+        Returns:
+            dict: 包含以下键：
+                - submitted / started / completed / failed / cancelled: 累计任务数。
+                  排队中被取消或超时的任务只计入 submitted 和 cancelled。
+                - queue_depth: 当前等待执行的任务数。
+                - active_workers: 当前正在执行任务的工作线程数。
+                - max_workers: 最大工作线程数。
+                - worker_occupancy: active_workers / max_workers。
+                - queue_wait: 从提交到开始执行的时间直方图。
+                - run_time: 任务函数的执行时间直方图。
+                - callback_delay: 从任务函数返回到第一个完成/失败回调开始执行的延迟
+                  直方图，包括信号投递和回调分发器按时间预算排队的时间；没有注册
+                  回调的任务不计入。
+
+            每个直方图是一个字典：count、sum、mean、max（秒），p50/p90/p99（按桶上界
+            估计的分位数，秒），以及 buckets: [(桶上界（秒）, 数量), ...]。
+
+        Note:
+            指标按线程分片记录，不加锁，可以在生产环境中始终开启。快照在读取时
+            汇总，各项之间不保证是同一时刻的精确值。
+
+        Example:
+            >>> stats = pool.stats()
+            >>> print(stats["queue_depth"], stats["worker_occupancy"])
+            >>> print(f"p99 queue wait: {stats['queue_wait']['p99'] * 1000:.1f}ms")
+        """
+        snapshot = self._metrics.snapshot()
+        with self._queue_condition:
+            queue_depth = len(self._pending_tasks)
+        active = self._running_workers
+        snapshot["queue_depth"] = queue_depth
+        snapshot["active_workers"] = active
+        snapshot["max_workers"] = self._max_workers
+        snapshot["worker_occupancy"] = active / self._max_workers
+        return snapshot
+
+    def set_metrics_hook(self, hook: Optional[Callable[[str, float], Any]]) -> None:
+        """设置流式指标回调，每记录一项指标调用一次 hook(name, value)。
+
+        计数器的 name 为 "submitted"、"started"、"completed"、"failed"、"cancelled"，
+        value 为 1；直方图的 name 为 "queue_wait"、"run_time"、"callback_delay"，value
+        为观测值（秒）。适合转发到 StatsD、Prometheus 等外部监控系统。
+
+        Args:
+            hook: 回调函数，None 表示移除。
+
+        Raises:
+            TypeError: 如果 hook 既不是 None 也不可调用。
+
+        Note:
+            hook 在记录指标的线程中同步调用（可能是工作线程），应尽快返回且自行
+            保证线程安全；抛出的异常会被捕获并输出到 stderr。
+
+        Example:
+            >>> pool.set_metrics_hook(lambda name, value: statsd.timing(name, value * 1000))
+        """
+        if hook is not None and not callable(hook):
+            raise TypeError("metrics hook must be callable")
+        self._metrics.hook = hook
 
     def add_done_callback(self, callback: Callable) -> None:
         """添加池级别完成回调，当所有任务完成时执行。
@@ -628,38 +1447,22 @@ class QThreadPoolExecutor:
             return
         self._done_callbacks_executed = True
 
-        from PySide6.QtWidgets import QApplication
-
-        app = QApplication.instance()
+        app = app_instance()
 
         # 复制回调列表避免迭代时修改
         with self._callbacks_lock:
             callbacks_copy = list(self._done_callbacks)
 
         for callback in callbacks_copy:
-            try:
-                if app is not None:
-                    # Qt模式：在主线程事件循环中执行
-                    # CALLBACK EXCEPTION FIX: Wrap callback to catch exceptions
-                    # Callbacks executed via QTimer.singleShot() can raise exceptions during processEvents()
-                    # which would propagate to the caller (e.g., shutdown()). We must catch and log them.
-                    def safe_callback(cb=callback):
-                        try:
-                            cb()
-                        except Exception as e:
-                            print(f"Error in pool done callback: {e}", file=sys.stderr)
-
-                    QTimer.singleShot(0, safe_callback)
-                else:
-                    # 非Qt模式：直接执行
-                    callback()
-            except Exception as e:
-                print(f"Error in pool done callback: {e}", file=sys.stderr)
+            # Qt模式：由回调分发器在主线程中批量执行；非Qt模式：直接执行
+            # CALLBACK EXCEPTION FIX: Exceptions are caught and logged so they never
+            # propagate to the caller (e.g., shutdown() processing events)
+            call_in_main_thread(_call_pool_callback, callback, (), "pool done callback")
 
         # GC BUG FIX: Release self-reference AFTER done callbacks execute
         # Pool no longer needs to keep itself alive once all work is complete and callbacks fired
         # This allows Python GC to collect the pool if there are no external references
-        # CRITICAL: In Qt mode, callbacks are scheduled via QTimer.singleShot(0, ...)
+        # CRITICAL: In Qt mode, callbacks are dispatched asynchronously on the main thread
         # We must delay the self-reference release until those callbacks actually execute
         if app is not None:
             # Qt mode: Delay self-reference release until after callbacks execute
@@ -687,39 +1490,7 @@ class QThreadPoolExecutor:
             TypeError: 如果callback不可调用。
             ValueError: 如果无法检查callback签名。
         """
-        if not callable(callback):
-            raise TypeError(f"{name} must be callable")
-
-        try:
-            sig = inspect.signature(callback)
-            params = list(sig.parameters.values())
-
-            # 过滤掉self参数（类方法的第一个参数）
-            if params and params[0].name == "self":
-                params = params[1:]
-
-            # 计算必需参数的数量（没有默认值的参数）
-            required_param_count = len(
-                [
-                    p
-                    for p in params
-                    if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
-                       and p.default is p.empty
-                ]
-            )
-
-            # 检查是否有可变参数 (*args, **kwargs)
-            has_var_positional = any(p.kind == p.VAR_POSITIONAL for p in params)
-            has_var_keyword = any(p.kind == p.VAR_KEYWORD for p in params)
-
-            # 如果有可变参数，返回最小参数数量
-            if has_var_positional or has_var_keyword:
-                return required_param_count
-
-            return required_param_count
-
-        except Exception as e:
-            raise ValueError(f"Cannot inspect {name} signature: {e}") from e
+        return validate_callback(callback, name)
 
     def _call_failure_callbacks(self, exception: Exception) -> None:
         """执行所有任务失败回调。
@@ -727,43 +1498,14 @@ class QThreadPoolExecutor:
         Args:
             exception: 任务抛出的异常对象。
         """
-        from PySide6.QtWidgets import QApplication
-
-        app = QApplication.instance()
-
         # 复制回调列表避免迭代时修改
         with self._callbacks_lock:
             callbacks_copy = list(self._failure_callbacks)
 
         for callback, param_count in callbacks_copy:
-            try:
-                if app is None:
-                    # 非Qt模式：直接执行
-                    if param_count == 0:
-                        callback()
-                    else:
-                        callback(exception)
-                elif param_count == 0:
-                    # CALLBACK EXCEPTION FIX: Wrap callback to catch exceptions
-                    def safe_callback(cb=callback):
-                        try:
-                            cb()
-                        except Exception as e:
-                            print(f"Error in pool failure callback: {e}", file=sys.stderr)
-
-                    QTimer.singleShot(0, safe_callback)
-                else:
-                    # CALLBACK EXCEPTION FIX: Wrap callback to catch exceptions
-                    # 使用lambda捕获exception，避免闭包问题
-                    def safe_callback_with_exc(e=exception, cb=callback):
-                        try:
-                            cb(e)
-                        except Exception as err:
-                            print(f"Error in pool failure callback: {err}", file=sys.stderr)
-
-                    QTimer.singleShot(0, safe_callback_with_exc)
-            except Exception as e:
-                print(f"Error in pool failure callback: {e}", file=sys.stderr)
+            # Qt模式：由回调分发器在主线程中批量执行；非Qt模式：直接执行
+            args = () if param_count == 0 else (exception,)
+            call_in_main_thread(_call_pool_callback, callback, args, "pool failure callback")
 
     @staticmethod
     def as_completed(
@@ -788,33 +1530,160 @@ class QThreadPoolExecutor:
             ...     result = future.result()
             ...     print(f"Task completed with result: {result}")
         """
-        import time
-
         # 验证 timeout_ms 参数类型
         if not isinstance(timeout_ms, (int, float)):
             raise TypeError(f"timeout_ms must be a number, got {type(timeout_ms).__name__}")
 
-        # 转换为整数毫秒
+        # 每个 future 完成时把自己放入共享的完成队列并唤醒等待方，
+        # 因此按真实完成顺序产出，每个 future 只处理一次，无需轮询
         futures = set(fs)
-        done = set()
-        start_time = time.monotonic() if timeout_ms > 0 else 0
-        while futures:
-            for fut in list(futures):
-                if fut.done():
-                    futures.remove(fut)
-                    done.add(fut)
-                    yield fut
-            if not futures:
-                break
-            if timeout_ms > 0:
-                elapsed = time.monotonic() - start_time
-                if elapsed > timeout_ms / 1000.0:  # 转换毫秒为秒
-                    raise TimeoutError()
-            # CRITICAL FIX: Must process Qt events to allow futures to complete
-            # Previously just slept, preventing signal/callback execution
-            from PySide6.QtWidgets import QApplication
-
-            app = QApplication.instance()
-            if app is not None:
-                app.processEvents()  # Process events to allow futures to complete
-            time.sleep(0.001)  # 1ms minimum delay to avoid CPU spinning
+        if not futures:
+            return
+        completed: "queue.SimpleQueue[QThreadWithReturn]" = queue.SimpleQueue()
+        waiter = _Waiter()
+
+        def on_complete(fut: QThreadWithReturn) -> None:
+            completed.put(fut)
+            waiter.wake()
+
+        deadline = time.monotonic() + timeout_ms / 1000.0 if timeout_ms > 0 else None
+        try:
+            for fut in futures:
+                fut._add_completion_hook(on_complete)
+            while futures:
+                try:
+                    fut = completed.get_nowait()
+                except queue.Empty:
+                    remaining_ms = -1
+                    if deadline is not None:
+                        remaining_ms = (deadline - time.monotonic()) * 1000.0
+                        if remaining_ms <= 0:
+                            raise TimeoutError() from None
+                    waiter.wait(remaining_ms)
+                    continue
+                # 已产出的 future 不再由迭代器持有
+                futures.discard(fut)
+                yield fut
+        finally:
+            # 迭代提前结束（超时、break、异常）时注销剩余 future 上的通知
+            for fut in futures:
+                fut._remove_completion_hook(on_complete)
+
+
+def _wait_threads(threads: list, deadline: float) -> list:
+    """在共享截止时间 deadline（time.monotonic()）之前等待一组线程退出，返回仍在运行的线程"""
+    running = []
+    for thread in threads:
+        remaining_ms = max(0, int((deadline - time.monotonic()) * 1000))
+        try:
+            if isinstance(thread, threading.Thread):
+                thread.join(remaining_ms / 1000.0)
+                stopped = not thread.is_alive()
+            else:
+                stopped = thread.wait(remaining_ms)
+        except RuntimeError:  # C++ 对象已销毁，线程早已结束
+            continue
+        if not stopped:
+            running.append(thread)
+    return running
+
+
+def _force_stop_threads(threads: list, deadline: float) -> None:
+    """并行分阶段强制停止一组线程，在 deadline（time.monotonic()）前返回。
+
+    先向所有 QThread 同时发出中断请求和 quit，整组等待宽限期；仍未退出的线程
+    统一 terminate，再在剩余时间内等待。threading.Thread 无法终止，只在截止
+    时间前 join。
+    """
+    now = time.monotonic()
+    grace_deadline = now + min(_FORCE_STOP_GRACE_MS / 1000.0, max(0.0, deadline - now) / 2)
+    for thread in threads:
+        if isinstance(thread, QThread):
+            with contextlib.suppress(RuntimeError):
+                thread.requestInterruption()
+                thread.quit()
+
+    running = _wait_threads(threads, grace_deadline)
+    for thread in running:
+        if isinstance(thread, QThread):
+            with contextlib.suppress(RuntimeError):
+                thread.terminate()
+    running = _wait_threads(running, deadline)
+    if running:
+        print(
+            f"Warning: {len(running)} thread(s) still running after force stop, marking as finished anyway",
+            file=sys.stderr,
+        )
+
+
+def _worker_thread_alive(thread: Any) -> bool:
+    """常驻工作线程（QThread 或 threading.Thread）是否仍在运行"""
+    if isinstance(thread, threading.Thread):
+        return thread.is_alive()
+    return _is_thread_running(thread)
+
+
+def _call_pool_callback(callback: Callable, args: tuple, name: str) -> None:
+    """执行池级别回调，异常只记录不传播"""
+    try:
+        callback(*args)
+    except Exception as e:
+        print(f"Error in {name}: {e}", file=sys.stderr)
+
+
+def _run_chunk(fn: Callable, chunk: List[tuple]) -> list:
+    """在工作线程中依次执行一个 map 分块；生成器函数的结果与 result() 相同"""
+    return [_item_batches.call(fn, args) for args in chunk]
+
+
+class _TaskRelay(QObject):
+    """把常驻工作线程中的执行结果转发到主线程。
+
+    对象在主线程中创建，工作线程发射信号时 Qt 自动使用队列连接，
+    因此 future._on_finished/_on_error 总是在主线程中执行。
+    """
+
+    _result_signal = Signal(object, object)  # (future, result)
+    _error_signal = Signal(object, object)  # (future, exception)
+
+    def __init__(self):
+        super().__init__()
+        app = app_instance()
+        if app is not None and self.thread() is not app.thread():
+            self.moveToThread(app.thread())
+        self._result_signal.connect(self._deliver_result)
+        self._error_signal.connect(self._deliver_error)
+
+    def _deliver_result(self, future: QThreadWithReturn, result: Any) -> None:
+        future._on_finished(result)
+
+    def _deliver_error(self, future: QThreadWithReturn, exception: Exception) -> None:
+        future._on_error(exception)
+
+
+class _PersistentWorker(QObject):
+    """常驻 QThread 中运行任务循环的工作对象"""
+
+    def __init__(self, pool: QThreadPoolExecutor):
+        super().__init__()
+        self._pool = pool
+
+    def _run(self) -> None:
+        try:
+            self._pool._worker_loop()
+        finally:
+            # 任务循环结束后退出线程事件循环
+            QThread.currentThread().quit()
+            self._pool = None
+
+
+# 存活的常驻工作线程池，解释器退出前需要停止其工作线程，
+# 否则 QThread 在运行中被销毁会导致进程崩溃
+_persistent_pools: "weakref.WeakSet[QThreadPoolExecutor]" = weakref.WeakSet()
+
+
+@atexit.register
+def _stop_persistent_workers_at_exit() -> None:
+    for pool in list(_persistent_pools):
+        with contextlib.suppress(Exception):
+            pool._stop_workers(force_stop=True)
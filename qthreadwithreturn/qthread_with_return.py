@@ -37,10 +37,134 @@ import inspect
 import sys
 import threading
 import time
+import warnings
 from concurrent.futures import CancelledError, TimeoutError
-from typing import Callable, Any, Optional
+from typing import TYPE_CHECKING, Any, Callable, Generator, Optional
+
+from PySide6.QtCore import (
+    QEventLoop, QMetaObject, QThread, QObject, Qt, Signal, QTimer, QMutex, QWaitCondition
+)
+
+from qthreadwithreturn import _deadlines, _headless
+from qthreadwithreturn._callbacks import call_in_main_thread, validate_callback
+from qthreadwithreturn._item_batches import _ItemBatcher
+from qthreadwithreturn._qtapp import app_instance
+from qthreadwithreturn.cancellation import CancellationToken, _TOKEN_PARAMETER, _accepts_token
+from qthreadwithreturn.progress import ProgressReporter, _PROGRESS_PARAMETER, _accepts_progress
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+# 已启动的 QThread 及其 worker。Python 持有 QThread 的所有权，如果在线程运行中
+# 丢弃最后一个引用（例如 QThreadWithReturn 被回收，或优雅取消后解绑），进程会崩溃。
+# 因此在这里保留引用，直到线程真正结束后再释放。
+_live_threads: dict = {}  # {id(thread): (thread, worker)}
+_live_threads_lock = threading.Lock()
+_sweep_threshold = 64  # 登记数量达到该值时清扫已结束的线程
+_REAP_RETRY_S = 0.005  # 已发出 finished 的线程仍在退出时，重新检查的间隔
+
+
+def _is_thread_running(thread: QThread) -> bool:
+    with contextlib.suppress(RuntimeError, AttributeError):
+        return thread.isRunning()
+    return False
+
+
+def _track_thread(thread: QThread, worker: Optional[QObject]) -> None:
+    """登记新启动的线程"""
+    global _sweep_threshold
+    with _live_threads_lock:
+        if len(_live_threads) >= _sweep_threshold:
+            # 释放在运行中被 _retire_thread 跳过、之后已经结束的线程；阈值翻倍使清扫均摊 O(1)
+            for key, (entry_thread, _) in list(_live_threads.items()):
+                if not _is_thread_running(entry_thread):
+                    del _live_threads[key]
+            _sweep_threshold = max(64, 2 * len(_live_threads))
+        _live_threads[id(thread)] = (thread, worker)
+
+
+def _retire_thread(
+        thread: Optional[QThread], worker: Optional[QObject], finished: bool = False
+) -> None:
+    """延迟删除 QThread 及其 worker；线程仍在运行时由 _live_threads 保留到线程结束。
+
+    finished 为 True 表示线程已发出 finished 信号，只差最后的退出步骤：此时不在
+    主线程中等待，而是稍后由共享的截止时间调度器重新检查，线程一结束即释放；
+    否则留给 _track_thread 的清扫。
+    """
+    if thread is not None:
+        if _is_thread_running(thread):
+            if finished:
+                _deadlines.call_later(
+                    _REAP_RETRY_S, call_in_main_thread, _retire_thread, thread, None, True
+                )
+            return
+        with _live_threads_lock:
+            _live_threads.pop(id(thread), None)
+    for obj in (worker, thread):
+        if obj is not None:
+            with contextlib.suppress(RuntimeError, AttributeError):
+                obj.deleteLater()
+
+
+class _Waiter:
+    """一次性唤醒的等待器，wake() 可以从任意线程调用。
+
+    主线程中（存在 Qt 应用时）运行局部 QEventLoop，等待期间排队的信号和回调照常执行；
+    其它线程直接阻塞在 threading.Event 上。wait() 返回后自动复位，可重复使用。
+    """
 
-from PySide6.QtCore import QThread, QObject, Signal, QTimer, QMutex, QWaitCondition
+    __slots__ = ("_event", "_loop", "_lock")
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._loop = None
+        self._lock = threading.Lock()
+
+    def wake(self) -> None:
+        with self._lock:
+            self._event.set()
+            loop = self._loop
+        if loop is None:
+            return
+        if QThread.currentThread() == loop.thread():
+            loop.quit()
+        else:
+            # 跨线程退出必须排队：事件在 loop.exec() 中处理，不会在 exec() 之前丢失
+            QMetaObject.invokeMethod(loop, "quit", Qt.QueuedConnection)
+
+    def wait(self, timeout_ms: int = -1) -> bool:
+        """等待唤醒，返回是否在超时前被唤醒。timeout_ms <= 0 表示无限等待"""
+        app = app_instance()
+        if app is None or threading.current_thread() is not threading.main_thread():
+            woken = self._event.wait(timeout_ms / 1000.0 if timeout_ms > 0 else None)
+            self._event.clear()
+            return woken
+
+        loop = QEventLoop()
+        with self._lock:
+            if self._event.is_set():
+                self._event.clear()
+                return True
+            self._loop = loop
+        timer = None
+        try:
+            if timeout_ms > 0:
+                timer = QTimer()
+                timer.setSingleShot(True)
+                timer.timeout.connect(loop.quit)
+                timer.start(max(1, int(timeout_ms)))
+            loop.exec()
+        finally:
+            with self._lock:
+                self._loop = None
+                woken = self._event.is_set()
+                self._event.clear()
+            if timer is not None:
+                timer.stop()
+                timer.deleteLater()
+        return woken
 
 
 class QThreadWithReturn(QObject):
@@ -54,6 +178,8 @@ class QThreadWithReturn(QObject):
         - 灵活的回调机制（支持无参数、单参数、多参数）
         - 支持超时控制
         - 支持优雅取消和强制终止
+        - 合并的进度报告（任务声明 progress 参数，主线程按固定频率收到最新值）
+        - 生成器任务：产出的项分批交给主线程，result() 返回生成器的返回值或全部产出项
         - 自动处理 Qt 事件循环
         - 线程安全的状态管理
 
@@ -76,6 +202,14 @@ class QThreadWithReturn(QObject):
         >>> thread = QThreadWithReturn(multi_return)
         >>> thread.add_done_callback(lambda a, b, c: print(f"{a}, {b}, {c}"))
         >>> thread.start()
+        ...
+        >>> # 生成器任务：边扫描边显示
+        >>> def scan(root):
+        ...     for entry in os.scandir(root):
+        ...         yield entry.name
+        >>> thread = QThreadWithReturn(scan, "/data")
+        >>> thread.add_item_callback(lambda names: model.append_rows(names))
+        >>> thread.start()
 
     Signals:
         finished_signal: 任务完成时发射（不论成功或失败）。
@@ -96,6 +230,11 @@ class QThreadWithReturn(QObject):
             **kwargs,
     ):
         super().__init__()
+        # 在非主线程中创建时移到主线程：结果和完成信号以队列方式投递到本对象，
+        # 留在创建线程（通常没有事件循环，可能很快退出）中会永远无法送达
+        app = app_instance()
+        if app is not None and self.thread() is not app.thread():
+            self.moveToThread(app.thread())
         self._func: Callable = func
         self._args: tuple = args
         self._kwargs: dict = kwargs
@@ -110,6 +249,8 @@ class QThreadWithReturn(QObject):
         # 回调函数 - 支持多个回调（与标准库行为一致）
         self._done_callbacks: list = []  # [(callback, param_count), ...]
         self._failure_callbacks: list = []  # [(callback, param_count), ...]
+        self._progress_callbacks: list = []  # [(callback, param_count), ...]
+        self._item_callbacks: list = []  # [(callback, param_count), ...]
 
         # 状态管理
         self._result: Any = None
@@ -118,10 +259,27 @@ class QThreadWithReturn(QObject):
         self._is_finished: bool = False
         self._is_force_stopped: bool = False
         self._thread_really_finished: bool = False  # 真正的线程完成状态
+        self._pool_running: bool = False  # 正在线程池常驻工作线程中执行
+        self._pool_managed: bool = False  # 由线程池管理（已连接池的完成处理）
 
-        # 超时管理
-        self._timeout_timer: Optional[QTimer] = None
+        # 超时管理：截止时间登记在进程共享的调度器中
+        self._timeout_timer: Optional["_deadlines._Deadline"] = None
         self._timeout_ms: int = -1
+        # 线程池超时（由 QThreadPoolExecutor 提交时设置）：_pool_timeout_ms < 0 表示
+        # 无超时；_pool_deadline 为截止时间（time.monotonic()），仅 "submit" 计时方式
+        # 使用；_queue_deadline 为排队期间登记的截止时间
+        self._pool_timeout_ms: int = -1
+        self._pool_deadline: Optional[float] = None
+        self._queue_deadline: Optional["_deadlines._Deadline"] = None
+        self._timeout_generation: int = 0  # 每次 start() 递增，用于忽略过期的超时
+
+        # 无 Qt 应用时由共享的 Python 工作线程执行
+        self._headless_running: bool = False
+
+        # 协作式取消：任务声明 cancel_token 参数时，每次执行创建一个令牌
+        self._cancel_token: Optional[CancellationToken] = None
+        # 进度报告：任务声明 progress 参数时，每次执行创建一个报告器
+        self._progress: Optional[ProgressReporter] = None
 
         # 线程同步
         self._mutex: QMutex = QMutex()
@@ -129,6 +287,15 @@ class QThreadWithReturn(QObject):
 
         # 备用同步机制（用于无Qt应用时）
         self._completion_event = threading.Event()
+        # 完成通知：任务完成（含取消）时各调用一次 hook(future)，可能在任意线程中调用
+        self._completion_hooks: list = []
+        # 所属线程池的完成通知，与 _completion_hooks 分开存放，只触发一次
+        self._pool_done_hook: Optional[Callable[["QThreadWithReturn"], None]] = None
+        # 所属线程池的回调延迟记录：第一个完成/失败回调开始执行时调用一次 hook(future)
+        self._pool_callback_hook: Optional[Callable[["QThreadWithReturn"], None]] = None
+        # 各阶段的 time.monotonic() 时间戳，见 timings 属性
+        self._timestamps: dict = {"created": time.monotonic()}
+        self._callback_timestamps: list = []  # 每个回调开始执行的时间
 
         # 信号连接状态跟踪
         self._signals_connected: bool = False
@@ -203,6 +370,74 @@ class QThreadWithReturn(QObject):
 
     add_exception_callback = add_failure_callback  # 别名
 
+    def add_progress_callback(self, callback: Callable) -> None:
+        """添加进度回调函数。
+
+        任务函数声明名为 progress 的参数时会收到一个 ProgressReporter，每次调用
+        progress.report(...) 只覆盖最新值；主线程按 set_progress_rate() 设置的频率
+        （默认 30Hz，所有任务共用）把最新值交给进度回调，中间值被合并。任务结束时
+        尚未交付的最新值在完成/失败回调之前交付。参数形式与 add_done_callback 相同：
+        - 无参数: callback()
+        - 单参数: callback(value)
+        - 多参数: callback(a, b) - 报告的值是元组时自动解包
+
+        Args:
+            callback: 回调函数。参数数量会自动检测。
+
+        Note:
+            - 回调在主线程中执行；任务被取消后不再交付进度
+            - 多个回调会按注册顺序依次执行
+
+        Example:
+            >>> def task(items, progress):
+            ...     for i, item in enumerate(items, 1):
+            ...         process(item)
+            ...         progress.report(i, len(items))
+            >>> thread = QThreadWithReturn(task, items)
+            >>> thread.add_progress_callback(lambda done, total: bar.setValue(100 * done // total))
+            >>> thread.start()
+        """
+        param_count = self._validate_callback(callback, "progress_callback")
+        with self._callbacks_lock:
+            self._progress_callbacks.append((callback, param_count))
+
+    def add_item_callback(self, callback: Callable) -> None:
+        """添加生成器任务产出项的回调函数。
+
+        任务函数是生成器函数时，工作线程逐项消费生成器，产出的项
+        先在工作线程中缓冲，数量或等待时间达到 set_item_batching() 设置的上限时
+        整批交给回调，主线程的开销与批数而不是项数成正比。回调在主线程中执行，
+        支持以下形式：
+        - 无参数: callback()
+        - 单参数: callback(items) - items 为本批产出项的列表
+
+        所有产出项都在完成/失败回调之前交付。result() 返回生成器的返回值；生成器
+        没有返回值（为 None）且开始执行时未注册产出项回调的任务，result() 返回
+        全部产出项组成的列表。开始执行时已注册回调的任务只把产出项交给回调、
+        不会保留，长时间的流式任务内存不随项数增长。产出项在主线程中交付时才读取
+        已注册的回调，在调用 start()/submit() 的同一段主线程代码中注册回调即可
+        收到全部产出项（无 Qt 应用时需要在 start() 之前注册）。
+
+        Args:
+            callback: 回调函数。
+
+        Note:
+            - 批次之间以及批次内部保持产出顺序
+            - 任务被取消后停止消费生成器，不再交付产出项
+
+        Example:
+            >>> def fetch_pages(query):
+            ...     for page in query.pages():
+            ...         yield from page.rows
+            >>> thread = QThreadWithReturn(fetch_pages, query)
+            >>> thread.add_item_callback(lambda rows: table.append_rows(rows))
+            >>> thread.add_done_callback(lambda: status.setText("查询完成"))
+            >>> thread.start()
+        """
+        param_count = self._validate_callback(callback, "item_callback")
+        with self._callbacks_lock:
+            self._item_callbacks.append((callback, param_count))
+
     def cancel(self, force_stop: bool = False) -> bool:
         """取消线程执行。
 
@@ -224,17 +459,26 @@ class QThreadWithReturn(QObject):
         if self._is_finished or self._is_force_stopped or self._thread_really_finished:
             return False
 
+        # 先通知协作式任务，使其在下面的等待期间就能退出
+        token = self._cancel_token
+        if token is not None:
+            token.cancel()
+
         if not self._thread:
             self._is_cancelled = True
             self._is_finished = True
+            # 无Qt应用时任务可能仍在排队或运行，先撤销其超时
+            self._cleanup_timeout_timer()
             # Fix #2: Clear callbacks in early cancel path
             self._clear_callbacks()
+            self._set_completion_event()
             self.finished_signal.emit()
             return True
 
         if not self._thread.isRunning():
             self._is_cancelled = True
             self._is_finished = True
+            self._set_completion_event()
             self.finished_signal.emit()
             return True
 
@@ -249,7 +493,9 @@ class QThreadWithReturn(QObject):
                 # 分阶段强制停止策略
                 self._is_force_stopped = True
 
-                # 第一阶段：请求中断（100ms）
+                # 第一阶段：请求中断（100ms）；同时请求退出事件循环，
+                # 响应令牌或中断请求的任务返回后线程立即结束
+                self._thread.quit()
                 if self._thread.wait(100):
                     # 优雅退出成功
                     self._thread_really_finished = True
@@ -292,10 +538,143 @@ class QThreadWithReturn(QObject):
 
         # 确保在取消时也清理资源
         if not force_stop:
+            thread = self._thread
             self._cleanup_resources()
+            # 线程真正结束后再发出完成信号，线程池此时才释放该任务占用的位置
+            self._emit_finished_when_stopped(thread)
 
         return True
 
+    def _emit_finished_when_stopped(self, thread: Optional[QThread]) -> None:
+        """线程已结束时立即发射 finished_signal，否则在线程结束后发射（只发射一次）"""
+        emitted = []
+
+        def emit_once() -> None:
+            if not emitted:
+                emitted.append(True)
+                self.finished_signal.emit()
+
+        if thread is not None:
+            with contextlib.suppress(RuntimeError):
+                thread.finished.connect(emit_once, Qt.QueuedConnection)
+        # 先连接再检查，避免错过检查与连接之间结束的线程
+        if thread is None or not _is_thread_running(thread):
+            emit_once()
+
+    def _task_kwargs(self) -> dict:
+        """返回本次执行传给任务函数的关键字参数，按需注入取消令牌和进度报告器。
+
+        任务声明了需要注入的 cancel_token 参数且调用方没有（按关键字或按位置）
+        传入，或调用方按关键字传入了 CancellationToken 时，创建一个新令牌（调用方
+        的令牌作为父令牌）并以 cancel_token 关键字传入。任务声明了需要注入的 progress 参数且调用方没有
+        （按关键字或按位置）传入时，创建一个新的 ProgressReporter。带默认值的参数
+        只在注解为对应类型时注入（见 cancellation._wants_injection）。
+        """
+        kwargs = self._kwargs
+        supplied = kwargs.get(_TOKEN_PARAMETER)
+        if isinstance(supplied, CancellationToken) or (
+                _TOKEN_PARAMETER not in kwargs and _accepts_token(self._func, len(self._args))
+        ):
+            token = CancellationToken(parent=supplied)
+            token.add_callback(self._on_token_cancelled)
+            self._cancel_token = token
+            kwargs = dict(kwargs)
+            kwargs[_TOKEN_PARAMETER] = token
+        else:
+            self._cancel_token = None
+
+        if _PROGRESS_PARAMETER not in kwargs and _accepts_progress(self._func, len(self._args)):
+            self._progress = ProgressReporter(self._deliver_progress)
+            kwargs = dict(kwargs)
+            kwargs[_PROGRESS_PARAMETER] = self._progress
+        else:
+            self._progress = None
+        return kwargs
+
+    def _deliver_progress(self, value: Any) -> None:
+        """执行进度回调（由进度刷新调度在主线程中调用）"""
+        if self._is_cancelled or self._is_force_stopped:
+            return
+        with self._callbacks_lock:
+            callbacks = list(self._progress_callbacks)
+        for callback, param_count in callbacks:
+            try:
+                self._call_with_values(callback, value, param_count, "progress_callback")
+            except Exception as e:
+                print(f"Error in progress_callback: {e}", file=sys.stderr)
+
+    def _call_task(self, *args: Any, **kwargs: Any) -> Any:
+        """在工作线程中执行任务函数；生成器函数逐项消费，产出的项分批交付。
+
+        只消费生成器函数产生的生成器；普通函数返回的（可能无限的）惰性生成器原样
+        作为结果。
+        """
+        if inspect.isgeneratorfunction(self._func):
+            return self._consume_generator(self._func(*args, **kwargs))
+        return self._func(*args, **kwargs)
+
+    def _consume_generator(self, generator: Generator) -> Any:
+        """消费生成器，返回其返回值；没有返回值时返回产出项列表。
+
+        是否保留产出项在开始消费时决定一次：已注册产出项回调时产出项只交给回调、
+        不会保留，长时间的流式任务内存不随项数增长；否则产出项同时收集起来，
+        生成器没有返回值（为 None）时作为结果返回。
+        """
+        batcher = _ItemBatcher(self._post_items)
+        collected = None if self._item_callbacks else []
+        value = None
+        try:
+            while not self._is_cancelled:
+                try:
+                    item = next(generator)
+                except StopIteration as stop:
+                    value = stop.value
+                    break
+                batcher.add(item)
+                if collected is not None:
+                    collected.append(item)
+            else:
+                generator.close()
+        finally:
+            # 生成器抛出异常时，已产出的项同样先于失败回调交付
+            batcher.flush()
+        if value is None and collected is not None:
+            return collected
+        return value
+
+    def _post_items(self, items: list) -> None:
+        """把一批产出项投递到主线程（无Qt应用时直接交付）"""
+        call_in_main_thread(self._deliver_items, items)
+
+    def _deliver_items(self, items: list) -> None:
+        """执行产出项回调"""
+        if self._is_cancelled or self._is_force_stopped:
+            return
+        with self._callbacks_lock:
+            callbacks = list(self._item_callbacks)
+        for callback, param_count in callbacks:
+            try:
+                if param_count == 0:
+                    callback()
+                else:
+                    callback(items)
+            except Exception as e:
+                print(f"Error in item_callback: {e}", file=sys.stderr)
+
+    def _flush_progress(self) -> None:
+        """任务结束时立即交付尚未交付的进度，保证其先于完成/失败回调"""
+        progress = self._progress
+        if progress is not None:
+            progress._flush()
+
+    def _on_token_cancelled(self) -> None:
+        """令牌被取消（例如父令牌被取消）时，在主线程中取消 Future"""
+        call_in_main_thread(self._cancel_from_token)
+
+    def _cancel_from_token(self) -> None:
+        if not self._is_finished and not self._is_cancelled:
+            self.cancel()
+
     def start(self, timeout_ms: int = -1) -> None:
         """启动线程执行任务。
 
@@ -317,7 +696,7 @@ class QThreadWithReturn(QObject):
         if not isinstance(timeout_ms, (int, float)):
             raise TypeError(f"timeout_ms must be a number, got {type(timeout_ms).__name__}")
 
-        if self._thread and self._thread.isRunning():
+        if self._headless_running or (self._thread and self._thread.isRunning()):
             raise RuntimeError("Thread is already running")
 
         # 重置状态
@@ -327,84 +706,109 @@ class QThreadWithReturn(QObject):
         self._thread_really_finished = False
         self._result = None
         self._exception = None
+        self._completion_event.clear()
+        self._timeout_generation += 1
+
+        # 线程池提交时已记录 queued；重新启动时清除上一次运行的时间戳
+        timestamps = self._timestamps
+        if "queued" not in timestamps or "started" in timestamps:
+            timestamps["queued"] = time.monotonic()
+        for key in ("started", "returned", "delivered"):
+            timestamps.pop(key, None)
+        self._callback_timestamps = []
+
+        # 检查是否有Qt应用来决定使用 QThread 还是纯 Python 后端
+        if app_instance() is None:
+            # 没有Qt应用：不创建 QThread/_Worker，交给共享工作线程执行
+            self._headless_running = True
+            self._schedule_timeout(timeout_ms)
+            _headless.run_in_worker(self._run_headless)
+            return
 
         # 创建工作线程和worker对象
         self._thread = QThread()
         if self._thread_name:
             self._thread.setObjectName(self._thread_name)
         self._worker = self._Worker(
-            self._func,
+            self._call_task,
             self._args,
-            self._kwargs,
+            self._task_kwargs(),
             self._initializer,
             self._initargs,
             self._thread_name,
+            self._timestamps,
         )
 
         # 将worker移动到线程中
         self._worker.moveToThread(self._thread)
 
-        # 设置直接回调方法（用于无Qt应用时）
+        # 设置直接回调方法（用于任务运行期间 Qt 应用被销毁的情况）
         self._worker._parent_result_callback = self._on_finished
         self._worker._parent_error_callback = self._on_error
 
-        # 检查是否有Qt应用来决定使用信号还是直接启动
-        from PySide6.QtWidgets import QApplication
-
-        app = QApplication.instance()
-
-        if app is not None:
-            # 有Qt应用，使用正常的信号连接
-            from PySide6.QtCore import Qt
-
-            self._thread.started.connect(self._worker._run, Qt.QueuedConnection)
-            self._worker._finished_signal.connect(
-                self._on_finished, Qt.QueuedConnection
-            )
-            self._worker._error_signal.connect(self._on_error, Qt.QueuedConnection)
-            self._thread.finished.connect(self._on_thread_finished, Qt.QueuedConnection)
-            self._signals_connected = True  # 标记信号已连接
-
-            # 设置超时定时器
-            if timeout_ms >= 0:
-                self._timeout_timer = QTimer()
-                self._timeout_timer.timeout.connect(self._on_timeout)
-                self._timeout_timer.setSingleShot(True)
-                # 对于0超时，使用最小的正数值（1ms）
-                actual_timeout = max(1, timeout_ms)
-                self._timeout_timer.start(actual_timeout)
-
-            # 启动线程
-            self._thread.start()
-        else:
-            # 没有Qt应用，使用标准线程
-            import threading
-
-            def run_worker():
-                try:
-                    self._worker._run()
-                finally:
-                    self._thread_really_finished = True
-                    # 在标准线程模式下也要调用清理
-                    self._on_thread_finished()
+        # 使用正常的信号连接
+        self._thread.started.connect(self._worker._run, Qt.QueuedConnection)
+        self._worker._finished_signal.connect(
+            self._on_finished, Qt.QueuedConnection
+        )
+        self._worker._error_signal.connect(self._on_error, Qt.QueuedConnection)
+        self._thread.finished.connect(self._on_thread_finished, Qt.QueuedConnection)
+        self._signals_connected = True  # 标记信号已连接
+        _track_thread(self._thread, self._worker)
 
-            # 设置超时处理
-            if timeout_ms >= 0:
+        # 登记超时
+        self._schedule_timeout(timeout_ms)
 
-                def timeout_handler():
-                    import time
+        # 启动线程
+        self._thread.start()
 
-                    actual_timeout = max(0.001, timeout_ms / 1000.0)
-                    time.sleep(actual_timeout)
-                    if not self._is_finished:
-                        self.cancel(force_stop=True)
+    def _schedule_timeout(self, timeout_ms: int) -> None:
+        """向共享调度器登记超时；到期后在主线程中（无Qt应用时在共享工作线程中）处理"""
+        if timeout_ms < 0:
+            return
+        # 对于0超时，使用最小的正数值（1ms）
+        self._timeout_timer = _deadlines.call_later(
+            max(1, timeout_ms) / 1000.0,
+            call_in_main_thread,
+            self._on_deadline,
+            self._timeout_generation,
+        )
 
-                timeout_thread = threading.Thread(target=timeout_handler, daemon=True)
-                timeout_thread.start()
+    def _on_deadline(self, generation: int) -> None:
+        """截止时间到达；忽略已完成或已重新启动的任务"""
+        if generation != self._timeout_generation or self._is_finished:
+            return
+        self._on_timeout()
 
-            # 启动工作线程
-            work_thread = threading.Thread(target=run_worker, daemon=True)
-            work_thread.start()
+    def _run_headless(self) -> None:
+        """在共享工作线程中执行任务（无Qt应用时使用）"""
+        try:
+            if self._is_cancelled:
+                return
+            current = threading.current_thread()
+            original_name = current.name
+            if self._thread_name:
+                current.name = self._thread_name
+            try:
+                if self._initializer:
+                    with contextlib.suppress(Exception):
+                        self._initializer(*self._initargs)
+                self._timestamps["started"] = time.monotonic()
+                result = self._call_task(*self._args, **self._task_kwargs())
+            except Exception as e:
+                self._timestamps["returned"] = time.monotonic()
+                self._on_error(e)
+            else:
+                self._timestamps["returned"] = time.monotonic()
+                self._on_finished(result)
+            finally:
+                # 工作线程会被后续任务复用，恢复线程名
+                current.name = original_name
+        finally:
+            self._headless_running = False
+            self._thread_really_finished = True
+            # 直接清理，不经过 _on_thread_finished()：此时运行在 Python 线程中
+            self._perform_delayed_cleanup()
 
     def result(self, timeout_ms: int = -1) -> Any:
         """获取任务执行结果。
@@ -437,10 +841,6 @@ class QThreadWithReturn(QObject):
         if not isinstance(timeout_ms, (int, float)):
             raise TypeError(f"timeout_ms must be a number, got {type(timeout_ms).__name__}")
 
-        # 转换为整数毫秒
-        from PySide6.QtWidgets import QApplication
-        import threading
-
         if self._is_cancelled or self._is_force_stopped:
             raise CancelledError()
 
@@ -451,39 +851,8 @@ class QThreadWithReturn(QObject):
                 raise self._exception
             return self._result
 
-        app = QApplication.instance()
-        start_time = time.monotonic()
-
-        # 如果没有Qt应用，使用事件等待机制
-        if app is None:
-            wait_timeout = None
-            if timeout_ms > 0:
-                wait_timeout = timeout_ms / 1000.0  # 转换为秒
-            if wait_timeout is not None and not self._completion_event.wait(wait_timeout):
-                raise TimeoutError()
-        else:
-            # STRESS TEST FIX: Hybrid approach for high concurrency
-            # Check completion event first (faster), then poll with events
-            while not self._is_finished and not self._completion_event.wait(0.001):
-                if self._is_cancelled or self._is_force_stopped:
-                    raise CancelledError()
-
-                # Process events for main thread
-                if threading.current_thread() == threading.main_thread():
-                    app.processEvents()
-
-                # STRESS TEST FIX: Increased sleep times to reduce CPU load under concurrency
-                # Higher minimums prevent busy-waiting when many threads call result()
-                elapsed_ms = (time.monotonic() - start_time) * 1000  # 转换为毫秒
-                if elapsed_ms < 500:
-                    time.sleep(0.005)  # 5ms (was 1ms) - less aggressive under load
-                elif elapsed_ms < 2000:
-                    time.sleep(0.020)  # 20ms (was 10ms)
-                else:
-                    time.sleep(0.050)  # 50ms (unchanged)
-
-                if timeout_ms > 0 and elapsed_ms > timeout_ms:
-                    raise TimeoutError()
+        if not self._wait_for_completion(timeout_ms):
+            raise TimeoutError()
 
         # Final state checks after wait
         if self._is_cancelled or self._is_force_stopped:
@@ -497,6 +866,57 @@ class QThreadWithReturn(QObject):
 
         return self._result
 
+    def _wait_for_completion(self, timeout_ms: int = -1) -> bool:
+        """等待任务完成，返回是否在超时前完成（取消也视为完成）。
+
+        主线程中运行一个局部 QEventLoop，任务完成时由完成通知立即退出该事件循环，
+        等待期间不轮询也不休眠；其它线程直接阻塞在完成事件上。
+        """
+        if self._is_finished or self._completion_event.is_set():
+            return True
+
+        # 没有Qt应用或不在主线程：结果由其它线程投递，直接等待完成事件
+        if app_instance() is None or threading.current_thread() is not threading.main_thread():
+            return self._completion_event.wait(timeout_ms / 1000.0 if timeout_ms > 0 else None)
+
+        # 主线程：运行局部事件循环，让排队的 _on_finished 和回调得以执行
+        waiter = _Waiter()
+        hook = lambda _future: waiter.wake()
+        self._add_completion_hook(hook)
+        try:
+            waiter.wait(timeout_ms)
+        finally:
+            self._remove_completion_hook(hook)
+        return self._completion_event.is_set()
+
+    def _add_completion_hook(self, hook: Callable[["QThreadWithReturn"], None]) -> None:
+        """注册完成通知；任务已经完成时立即调用 hook"""
+        with self._callbacks_lock:
+            if not self._completion_event.is_set():
+                self._completion_hooks.append(hook)
+                return
+        hook(self)
+
+    def _remove_completion_hook(self, hook: Callable[["QThreadWithReturn"], None]) -> None:
+        """注销尚未触发的完成通知"""
+        with self._callbacks_lock:
+            with contextlib.suppress(ValueError):
+                self._completion_hooks.remove(hook)
+
+    def _set_completion_event(self) -> None:
+        """设置完成事件，并触发完成通知（每个 hook 只触发一次）"""
+        with self._callbacks_lock:
+            self._completion_event.set()
+            hooks, self._completion_hooks = self._completion_hooks, []
+            if self._pool_done_hook is not None:
+                hooks.append(self._pool_done_hook)
+                self._pool_done_hook = None
+        for hook in hooks:
+            try:
+                hook(self)
+            except Exception as e:
+                print(f"Error in completion hook: {e}", file=sys.stderr)
+
     def exception(self, timeout_ms: int = -1) -> Optional[BaseException]:
         """获取任务执行时抛出的异常。
 
@@ -530,14 +950,109 @@ class QThreadWithReturn(QObject):
             raise CancelledError()
         return self._exception
 
+    def __await__(self) -> Generator[Any, None, Any]:
+        """在 asyncio 协程中等待任务完成，返回结果或抛出任务的异常。
+
+        任务完成时通过事件循环的 call_soon_threadsafe() 唤醒等待方，等待期间
+        不轮询，也不占用任何线程，大量并发 await 在空闲时没有开销。
+
+        Returns:
+            Any: 任务的返回值。
+
+        Raises:
+            asyncio.CancelledError: 如果任务被取消或强制停止。
+            RuntimeError: 如果当前线程没有正在运行的 asyncio 事件循环。
+            Exception: 任务执行时抛出的异常。
+
+        Note:
+            与 asyncio.wrap_future() 相同，等待方被取消（例如 asyncio.wait_for 超时）时
+            会调用 cancel() 取消任务。存在 Qt 应用时，完成通知在 Qt 事件循环中投递，
+            asyncio 事件循环需要与 Qt 集成（例如 PySide6.QtAsyncio）；没有 Qt 应用时
+            可以直接使用 asyncio.run()。未启动的任务会一直等待到 start() 之后完成。
+
+        Example:
+            >>> async def load():
+            ...     thread = QThreadWithReturn(fetch_data, url)
+            ...     thread.start()
+            ...     data = await thread
+            ...     return data
+        """
+        return self._as_asyncio_future().__await__()
+
+    def _as_asyncio_future(self) -> "asyncio.Future":
+        """创建在当前事件循环中与本任务同步完成的 asyncio.Future"""
+        # asyncio 只在被 await 时需要，避免增加包的导入时间
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+
+        def copy_state() -> None:
+            if future.done():
+                return
+            if self._is_cancelled or self._is_force_stopped:
+                future.cancel()
+            elif self._exception is not None:
+                future.set_exception(self._exception)
+            else:
+                future.set_result(self._result)
+
+        def on_complete(_thread: "QThreadWithReturn") -> None:
+            # 事件循环已关闭时不再需要结果
+            with contextlib.suppress(RuntimeError):
+                loop.call_soon_threadsafe(copy_state)
+
+        def on_awaiter_done(awaited: "asyncio.Future") -> None:
+            if awaited.cancelled():
+                self._remove_completion_hook(on_complete)
+                self.cancel()
+
+        if self._completion_event.is_set():
+            copy_state()
+            return future
+        future.add_done_callback(on_awaiter_done)
+        self._add_completion_hook(on_complete)
+        return future
+
+    @property
+    def timings(self) -> dict:
+        """任务各阶段的时间戳（time.monotonic() 秒），用于分析延迟。
+
+        Returns:
+            dict: 新字典，尚未到达的阶段不出现：
+                - created: 对象创建。
+                - queued: 调用 start()，或提交到线程池。
+                - started: 任务函数开始执行（在工作线程中，初始化函数之后）。
+                - returned: 任务函数返回或抛出异常（在工作线程中）。
+                - delivered: 结果或异常在主线程中处理。
+                - callbacks: 每个完成/失败回调开始执行的时间列表（总是存在）。
+
+        Note:
+            returned 与 callbacks 之间的间隔即任务完成到界面收到回调的延迟，
+            包括信号投递和回调分发器排队的时间。
+
+        Example:
+            >>> thread.add_done_callback(update_ui)
+            >>> thread.start()
+            >>> ...
+            >>> t = thread.timings
+            >>> print(f"run: {(t['returned'] - t['started']) * 1000:.1f}ms")
+            >>> print(f"callback latency: {(t['callbacks'][0] - t['returned']) * 1000:.1f}ms")
+        """
+        timings = dict(self._timestamps)
+        timings["callbacks"] = list(self._callback_timestamps)
+        return timings
+
     def running(self) -> bool:
         """检查任务是否正在运行。
 
         Returns:
             bool: 如果任务正在执行返回 True。
         """
-        if self._thread_really_finished or self._is_force_stopped:
+        if self._thread_really_finished or self._is_force_stopped or self._is_finished:
             return False
+        if self._pool_running or self._headless_running:
+            return True
         return self._thread is not None and self._thread.isRunning()
 
     def done(self) -> bool:
@@ -587,6 +1102,17 @@ class QThreadWithReturn(QObject):
 
         # 转换为整数毫秒
         if not self._thread:
+            # 常驻工作线程模式下任务没有独立的 QThread，改为等待完成事件
+            if self._pool_managed and not self._is_finished:
+                return self._wait_for_completion(timeout_ms)
+            # 无Qt应用时任务在共享 Python 工作线程中执行，同样等待完成事件
+            if self._headless_running and not self._is_finished:
+                if self._wait_for_completion(timeout_ms):
+                    return True
+                if force_stop:
+                    # Python 线程无法强制终止：标记为取消，结果被丢弃
+                    self.cancel(force_stop=True)
+                return False
             return True
 
         # 如果线程已经完成，直接返回True
@@ -643,43 +1169,7 @@ class QThreadWithReturn(QObject):
 
     def _validate_callback(self, callback: Callable, callback_name: str) -> int:
         """验证回调函数的参数数量，返回需要的参数个数"""
-        if not callable(callback):
-            raise TypeError(f"{callback_name} must be callable")
-
-        try:
-            sig = inspect.signature(callback)
-            params = list(sig.parameters.values())
-
-            # 过滤掉self参数（类方法的第一个参数）
-            if params and params[0].name == "self":
-                params = params[1:]
-
-            # 计算必需参数的数量（没有默认值的参数）
-            required_param_count = len(
-                [
-                    p
-                    for p in params
-                    if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD)
-                       and p.default is p.empty
-                ]
-            )
-
-            # 改进：检查是否有可变参数 (*args, **kwargs)
-            has_var_positional = any(p.kind == p.VAR_POSITIONAL for p in params)
-            has_var_keyword = any(p.kind == p.VAR_KEYWORD for p in params)
-
-            # 如果有可变参数，允许任意数量的参数
-            if has_var_positional or has_var_keyword:
-                # 对于可变参数函数，返回所需的最小参数数量
-                return required_param_count
-
-            # Note: For failure_callback, we allow multiple parameters but will only pass the exception
-            # The validation should not restrict the parameter count, only ensure proper handling during execution
-
-            return required_param_count
-
-        except Exception as e:
-            raise ValueError(f"Cannot inspect {callback_name} signature: {e}") from e
+        return validate_callback(callback, callback_name)
 
     def _on_finished(self, result: Any) -> None:
         """处理线程完成信号"""
@@ -701,6 +1191,8 @@ class QThreadWithReturn(QObject):
 
     def _on_finished_impl(self, result: Any) -> None:
         """Internal implementation of _on_finished"""
+        self._timestamps["delivered"] = time.monotonic()
+        self._flush_progress()
         self._mutex.lock()
         try:
             self._result = result
@@ -713,7 +1205,7 @@ class QThreadWithReturn(QObject):
 
         # STRESS TEST FIX: Set completion event FIRST before any other operations
         # This ensures concurrent result() calls can proceed immediately
-        self._completion_event.set()
+        self._set_completion_event()
 
         self._cleanup_timeout_timer()
 
@@ -721,37 +1213,22 @@ class QThreadWithReturn(QObject):
         if self._thread:
             self._thread.quit()
 
-        # Fix #3: Fix non-Qt mode QTimer usage - check for Qt application before using QTimer
-        # STRESS TEST FIX: Execute callbacks with immediate event processing
         # Execute all registered callbacks in order (standard library behavior)
+        # Qt 模式下由回调分发器在主线程中批量执行；非 Qt 模式下直接执行
         if self._done_callbacks:
             try:
-                from PySide6.QtWidgets import QApplication
-
-                app = QApplication.instance()
                 # Create a copy to avoid modification during iteration
                 with self._callbacks_lock:
                     callbacks_copy = list(self._done_callbacks)
                 for callback, callback_params in callbacks_copy:
-                    if app is not None:
-                        # Qt mode: schedule in event loop
-                        QTimer.singleShot(
-                            0,
-                            lambda r=result,
-                                   cb=callback,
-                                   cp=callback_params: self._execute_callback_safely(
-                                cb, r, cp, "done_callback"
-                            ),
-                        )
-                        # STACK OVERFLOW FIX: REMOVED app.processEvents() call
-                        # Explicit processEvents() causes cascading recursion across multiple instances:
-                        # Instance A: processEvents() → triggers Instance B: _on_finished() → processEvents() → ...
-                        # Qt's event loop will naturally process these callbacks without explicit forcing.
-                    else:
-                        # Non-Qt mode: execute directly
-                        self._execute_callback_safely(
-                            callback, result, callback_params, "done_callback"
-                        )
+                    call_in_main_thread(
+                        self._execute_callback_safely,
+                        callback, result, callback_params, "done_callback",
+                    )
+                # STACK OVERFLOW FIX: REMOVED app.processEvents() call
+                # Explicit processEvents() causes cascading recursion across multiple instances:
+                # Instance A: processEvents() → triggers Instance B: _on_finished() → processEvents() → ...
+                # Qt's event loop will naturally process these callbacks without explicit forcing.
             except Exception as e:
                 print(f"Error scheduling done callbacks: {e}", file=sys.stderr)
 
@@ -814,6 +1291,8 @@ class QThreadWithReturn(QObject):
 
     def _on_error_impl(self, exception: Exception) -> None:
         """Internal implementation of _on_error"""
+        self._timestamps["delivered"] = time.monotonic()
+        self._flush_progress()
         self._mutex.lock()
         try:
             self._exception = exception
@@ -823,7 +1302,7 @@ class QThreadWithReturn(QObject):
             self._mutex.unlock()
 
         # 设置完成事件（备用同步机制）
-        self._completion_event.set()
+        self._set_completion_event()
 
         self._cleanup_timeout_timer()
 
@@ -831,32 +1310,18 @@ class QThreadWithReturn(QObject):
         if self._thread:
             self._thread.quit()
 
-        # Fix #3: Fix non-Qt mode QTimer usage - check for Qt application before using QTimer
         # Execute all registered failure callbacks in order (standard library behavior)
+        # Qt 模式下由回调分发器在主线程中批量执行；非 Qt 模式下直接执行
         if self._failure_callbacks:
             try:
-                from PySide6.QtWidgets import QApplication
-
-                app = QApplication.instance()
                 # Create a copy to avoid modification during iteration
                 with self._callbacks_lock:
                     callbacks_copy = list(self._failure_callbacks)
                 for callback, callback_params in callbacks_copy:
-                    if app is not None:
-                        # Qt mode: schedule in event loop
-                        QTimer.singleShot(
-                            0,
-                            lambda exc=exception,
-                                   cb=callback,
-                                   cp=callback_params: self._execute_failure_callback_safely(
-                                cb, exc, cp
-                            ),
-                        )
-                    else:
-                        # Non-Qt mode: execute directly
-                        self._execute_failure_callback_safely(
-                            callback, exception, callback_params
-                        )
+                    call_in_main_thread(
+                        self._execute_failure_callback_safely,
+                        callback, exception, callback_params,
+                    )
             except Exception as e:
                 print(f"Error scheduling failure callbacks: {e}", file=sys.stderr)
 
@@ -878,11 +1343,7 @@ class QThreadWithReturn(QObject):
                     callbacks_copy = list(self._failure_callbacks)
                 for callback, callback_params in callbacks_copy:
                     try:
-                        # 对于异常回调，总是传递异常对象（如果callback需要的话）
-                        if callback_params == 0:
-                            callback()
-                        else:
-                            callback(exception)
+                        self._call_failure_callback(callback, exception, callback_params)
                     except Exception as e:
                         print(f"Error in failure callback: {e}", file=sys.stderr)
         except Exception as e:
@@ -894,35 +1355,32 @@ class QThreadWithReturn(QObject):
         """安全执行失败回调函数（避免竞态条件）"""
         try:
             if callback and not self._is_cancelled and not self._is_force_stopped:
-                # 对于异常回调，总是传递异常对象（如果callback需要的话）
-                if param_count == 0:
-                    callback()
-                else:
-                    # 多参数情况：只传递异常作为第一个参数，其他参数使用默认值
-                    callback(exception)
+                self._call_failure_callback(callback, exception, param_count)
         except Exception as e:
             print(f"Error in failure callback: {e}", file=sys.stderr)
 
+    def _call_failure_callback(
+            self, callback: Callable, exception: Exception, param_count: int
+    ) -> None:
+        """调用失败回调"""
+        self._mark_callback_started()
+        # 对于异常回调，总是传递异常对象（如果callback需要的话）
+        if param_count == 0:
+            callback()
+        else:
+            # 多参数情况：只传递异常作为第一个参数，其他参数使用默认值
+            callback(exception)
+
     def _on_thread_finished(self) -> None:
         """处理线程真正完成的信号 - SECURITY HARDENED"""
         self._thread_really_finished = True
 
-        # CRITICAL FIX: Defer signal disconnection to allow queued _on_finished() to execute
-        # The issue: _on_thread_finished() is called first, disconnecting worker signals
-        # before the queued _on_finished() slot can run, breaking all callbacks.
-        # Solution: Use QTimer to defer cleanup, ensuring _on_finished() executes first.
-        from PySide6.QtWidgets import QApplication
-        from PySide6.QtCore import QTimer
-
-        app = QApplication.instance()
-        if app is not None:
-            # Defer cleanup by 50ms to ensure queued _on_finished() AND callbacks complete
-            # This is safe because the thread has already finished
-            # Need enough time for: _on_finished() → callback scheduling → callback execution
-            QTimer.singleShot(50, self._perform_delayed_cleanup)
-        else:
-            # No Qt app - no event loop, safe to cleanup immediately
-            self._perform_delayed_cleanup()
+        # CRITICAL FIX: Defer signal disconnection until queued _on_finished() and its
+        # callbacks have run. No fixed delay is needed: thread.finished is only delivered
+        # after _on_finished() (which calls quit()), and the callbacks it scheduled are
+        # already queued on the FIFO callback dispatcher, so cleanup queued behind them
+        # runs right after they are delivered. Without a Qt app this runs immediately.
+        call_in_main_thread(self._perform_delayed_cleanup)
 
     def _perform_delayed_cleanup(self) -> None:
         """Execute cleanup after ensuring _on_finished() has completed"""
@@ -942,16 +1400,13 @@ class QThreadWithReturn(QObject):
         self._cleanup_resources()
 
         # Fix #6: Replace deleteLater() with mode-aware cleanup
-        from PySide6.QtWidgets import QApplication
-
-        has_qt_app = QApplication.instance() is not None
+        has_qt_app = app_instance() is not None
 
         # 清理对象引用
         if self._worker:
             # 只有当信号实际连接时才尝试断开
             if self._signals_connected:
                 # 使用 warnings 模块抑制 RuntimeWarning
-                import warnings
                 with warnings.catch_warnings():
                     warnings.simplefilter("ignore", RuntimeWarning)
                     with contextlib.suppress(RuntimeError, TypeError):
@@ -966,15 +1421,13 @@ class QThreadWithReturn(QObject):
 
             # Mode-aware cleanup: only use deleteLater() in Qt mode
             if has_qt_app:
-                with contextlib.suppress(RuntimeError, AttributeError):
-                    self._worker.deleteLater()
+                _retire_thread(None, self._worker)
             self._worker = None
 
         if self._thread:
             # 只有当信号实际连接时才尝试断开
             if self._signals_connected:
                 # 使用 warnings 模块抑制 RuntimeWarning
-                import warnings
                 with warnings.catch_warnings():
                     warnings.simplefilter("ignore", RuntimeWarning)
                     with contextlib.suppress(RuntimeError, TypeError):
@@ -982,9 +1435,11 @@ class QThreadWithReturn(QObject):
                     with contextlib.suppress(RuntimeError, TypeError):
                         self._thread.finished.disconnect()
             # Mode-aware cleanup: only use deleteLater() in Qt mode
+            # 线程已发出 finished 时，仍在退出的 QThread 稍后由 _retire_thread 释放；
+            # 强制停止的线程可能卡在 terminate 中，留给 _track_thread 的清扫
             if has_qt_app:
-                with contextlib.suppress(RuntimeError, AttributeError):
-                    self._thread.deleteLater()
+                finished = self._thread_really_finished and not self._is_force_stopped
+                _retire_thread(self._thread, None, finished)
             self._thread = None
 
     def _on_timeout(self) -> None:
@@ -995,6 +1450,24 @@ class QThreadWithReturn(QObject):
             self, callback: Callable, result: Any, param_count: int, callback_name: str
     ) -> None:
         """根据回调函数的参数数量调用回调，支持返回值解包"""
+        self._mark_callback_started()
+        self._call_with_values(callback, result, param_count, callback_name)
+
+    def _mark_callback_started(self) -> None:
+        """记录回调开始执行的时间，第一个回调触发所属线程池的回调延迟记录"""
+        self._callback_timestamps.append(time.monotonic())
+        hook, self._pool_callback_hook = self._pool_callback_hook, None
+        if hook is not None:
+            try:
+                hook(self)
+            except Exception as e:
+                print(f"Error in callback hook: {e}", file=sys.stderr)
+
+    @staticmethod
+    def _call_with_values(
+            callback: Callable, result: Any, param_count: int, callback_name: str
+    ) -> None:
+        """按参数数量传入 result：0 个参数不传，元组按参数数量解包"""
         if param_count == 0:
             # 无参数回调，不传递任何参数
             callback()
@@ -1024,22 +1497,19 @@ class QThreadWithReturn(QObject):
             )
 
     def _cleanup_timeout_timer(self) -> None:
-        """清理超时定时器"""
-        if self._timeout_timer:
-            # 确保定时器完全停止
-            if self._timeout_timer.isActive():
-                self._timeout_timer.stop()
-            # 断开所有信号连接
-            with contextlib.suppress(RuntimeError, TypeError):
-                self._timeout_timer.timeout.disconnect()
-            self._timeout_timer.deleteLater()
-            self._timeout_timer = None
+        """撤销超时：从共享调度器中取消截止时间，释放对本对象的引用"""
+        # 可能与其它线程中的清理并发执行，先取出再取消
+        deadline, self._timeout_timer = self._timeout_timer, None
+        if deadline is not None:
+            deadline.cancel()
 
     def _clear_callbacks(self) -> None:
         """Fix #2: Clear callback references to break circular refs"""
         with self._callbacks_lock:
             self._done_callbacks.clear()
             self._failure_callbacks.clear()
+            self._progress_callbacks.clear()
+            self._item_callbacks.clear()
 
     def _cleanup_resources(self) -> None:
         """清理资源 - 增强版：支持 force_stop 场景的完善清理"""
@@ -1107,13 +1577,12 @@ class QThreadWithReturn(QObject):
                         hasattr(self, "_completion_event")
                         and self._completion_event is not None
                 ):
-                    self._completion_event.set()
+                    self._set_completion_event()
 
             # 4. 断开 worker 信号（force_stop 特别重要）
             if hasattr(self, "_worker") and self._worker is not None:
                 if self._signals_connected:
                     # 使用 warnings 模块抑制 RuntimeWarning
-                    import warnings
                     with warnings.catch_warnings():
                         warnings.simplefilter("ignore", RuntimeWarning)
                         with contextlib.suppress(RuntimeError, TypeError):
@@ -1129,7 +1598,6 @@ class QThreadWithReturn(QObject):
 
             # 5. 断开 thread 信号
             if hasattr(self, "_thread") and self._thread is not None and self._signals_connected:
-                import warnings
                 with warnings.catch_warnings():
                     warnings.simplefilter("ignore", RuntimeWarning)
                     with contextlib.suppress(RuntimeError, TypeError):
@@ -1142,18 +1610,11 @@ class QThreadWithReturn(QObject):
             # _cleanup_resources() → processEvents() → _perform_delayed_cleanup() → _cleanup_resources() → ...
             # With 1000 concurrent tasks, this creates infinite recursion and stack overflow.
             # Qt's event loop will naturally process deleteLater() calls without explicit forcing.
-            from PySide6.QtWidgets import QApplication
+            app = app_instance()
 
-            app = QApplication.instance()
-
-            # 7. 延迟清理 Qt 对象
+            # 7. 延迟清理 Qt 对象（线程仍在运行时推迟到线程结束后）
             if app is not None:
-                if hasattr(self, "_worker") and self._worker is not None:
-                    with contextlib.suppress(RuntimeError, AttributeError):
-                        self._worker.deleteLater()
-                if hasattr(self, "_thread") and self._thread is not None:
-                    with contextlib.suppress(RuntimeError, AttributeError):
-                        self._thread.deleteLater()
+                _retire_thread(getattr(self, "_thread", None), getattr(self, "_worker", None))
 
             # 8. 清除 Python 引用
             self._worker = None
@@ -1167,6 +1628,8 @@ class QThreadWithReturn(QObject):
                 with self._callbacks_lock:
                     self._done_callbacks.clear()
                     self._failure_callbacks.clear()
+                    self._progress_callbacks.clear()
+                    self._item_callbacks.clear()
 
         finally:
             # Always release cleanup lock
@@ -1187,6 +1650,7 @@ class QThreadWithReturn(QObject):
                 initializer: Optional[Callable] = None,
                 initargs: tuple = (),
                 thread_name: Optional[str] = None,
+                timestamps: Optional[dict] = None,
         ):
             super().__init__()
             self._func = func
@@ -1196,13 +1660,11 @@ class QThreadWithReturn(QObject):
             self._initargs = initargs
             self._should_stop = False
             self._thread_name = thread_name
+            self._timestamps = timestamps if timestamps is not None else {}
 
         def _run(self) -> None:
             """执行工作函数"""
             try:
-                from PySide6.QtCore import QThread
-                from PySide6.QtWidgets import QApplication
-
                 if self._thread_name:
                     QThread.currentThread().setObjectName(self._thread_name)
 
@@ -1212,10 +1674,14 @@ class QThreadWithReturn(QObject):
                 if self._initializer:
                     with contextlib.suppress(Exception):
                         self._initializer(*self._initargs)
-                result = self._func(*self._args, **self._kwargs)
+                self._timestamps["started"] = time.monotonic()
+                try:
+                    result = self._func(*self._args, **self._kwargs)
+                finally:
+                    self._timestamps["returned"] = time.monotonic()
                 if not self._should_stop:
                     # 检查是否有Qt应用，决定使用信号还是直接调用
-                    app = QApplication.instance()
+                    app = app_instance()
                     if app is not None:
                         self._finished_signal.emit(result)
                     else:
@@ -1224,14 +1690,17 @@ class QThreadWithReturn(QObject):
             except Exception as e:
                 if not self._should_stop:
                     # 检查是否有Qt应用，决定使用信号还是直接调用
-                    from PySide6.QtWidgets import QApplication
-
-                    app = QApplication.instance()
+                    app = app_instance()
                     if app is not None:
                         self._error_signal.emit(e)
                     else:
                         # 没有Qt应用时，直接调用父对象的方法
                         self._direct_error_callback(e)
+            finally:
+                # worker 会被保留到线程结束，释放任务（及其引用的 Future）和参数
+                self._func = None
+                self._args = ()
+                self._kwargs = {}
 
         def _direct_result_callback(self, result):
             """直接结果回调（无Qt应用时使用）"""
@@ -1256,6 +1725,8 @@ class QThreadWithReturn(QObject):
 
     def _set_result(self, result: Any) -> None:
         """直接设置结果（用于 QThreadPoolExecutor）"""
+        self._timestamps["delivered"] = time.monotonic()
+        self._flush_progress()
         self._mutex.lock()
         try:
             if not self._is_cancelled:
@@ -1266,7 +1737,7 @@ class QThreadWithReturn(QObject):
             self._mutex.unlock()
 
         # 设置完成事件（备用同步机制）
-        self._completion_event.set()
+        self._set_completion_event()
 
         # 发射完成信号
         self.finished_signal.emit()
@@ -1288,6 +1759,8 @@ class QThreadWithReturn(QObject):
 
     def _set_exception(self, exception: Exception) -> None:
         """直接设置异常（用于 QThreadPoolExecutor）"""
+        self._timestamps["delivered"] = time.monotonic()
+        self._flush_progress()
         self._mutex.lock()
         try:
             if not self._is_cancelled:
@@ -1298,7 +1771,7 @@ class QThreadWithReturn(QObject):
             self._mutex.unlock()
 
         # 设置完成事件（备用同步机制）
-        self._completion_event.set()
+        self._set_completion_event()
 
         # 发射完成信号
         self.finished_signal.emit()
@@ -1309,10 +1782,6 @@ class QThreadWithReturn(QObject):
                 callbacks_to_execute = list(self._failure_callbacks)
             for callback, callback_params in callbacks_to_execute:
                 try:
-                    # 对于异常回调，总是传递异常对象（如果callback需要的话）
-                    if callback_params == 0:
-                        callback()
-                    else:
-                        callback(exception)
+                    self._call_failure_callback(callback, exception, callback_params)
                 except Exception as e:
                     print(f"Error in failure callback: {e}", file=sys.stderr)
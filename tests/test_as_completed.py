@@ -0,0 +1,107 @@
+"""Test suite for notification-based QThreadPoolExecutor.as_completed.
+
+Each future pushes itself onto a shared completion queue when it finishes, so
+as_completed yields in true completion order without polling.
+"""
+
+import threading
+import time
+from concurrent.futures import TimeoutError
+
+import pytest
+
+from qthreadwithreturn import QThreadPoolExecutor
+from qthreadwithreturn.qthread_with_return import _Waiter
+
+
+@pytest.mark.usefixtures("qapp_session")
+class TestAsCompleted:
+    """Test as_completed ordering, timeouts and hook bookkeeping."""
+
+    @pytest.mark.unit
+    def test_yields_in_completion_order(self):
+        """Futures come back in the order they finish, not submit order."""
+        pool = QThreadPoolExecutor(max_workers=3)
+        try:
+            slow = pool.submit(time.sleep, 0.3)
+            medium = pool.submit(time.sleep, 0.15)
+            fast = pool.submit(lambda: "fast")
+
+            order = list(QThreadPoolExecutor.as_completed([slow, medium, fast], timeout_ms=5000))
+            assert order == [fast, medium, slow]
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_duplicates_and_already_done(self):
+        """Duplicate futures are yielded once; finished futures are yielded immediately."""
+        pool = QThreadPoolExecutor(max_workers=2)
+        try:
+            done = pool.submit(lambda: 1)
+            assert done.result(timeout_ms=5000) == 1
+            pending = pool.submit(time.sleep, 0.05)
+
+            order = list(QThreadPoolExecutor.as_completed([done, pending, done], timeout_ms=5000))
+            assert order == [done, pending]
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_cancelled_queued_future_is_yielded(self):
+        """A queued future that is cancelled counts as completed."""
+        pool = QThreadPoolExecutor(max_workers=1)
+        gate = threading.Event()
+        try:
+            blocker = pool.submit(gate.wait, 5)
+            queued = pool.submit(lambda: None)
+
+            iterator = QThreadPoolExecutor.as_completed([blocker, queued], timeout_ms=5000)
+            assert queued.cancel()
+            assert next(iterator) is queued
+            gate.set()
+            assert next(iterator) is blocker
+        finally:
+            gate.set()
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_timeout_unregisters_hooks(self):
+        """Timing out raises TimeoutError and leaves no hooks on pending futures."""
+        pool = QThreadPoolExecutor(max_workers=1)
+        gate = threading.Event()
+        try:
+            future = pool.submit(gate.wait, 5)
+            start = time.monotonic()
+            with pytest.raises(TimeoutError):
+                list(QThreadPoolExecutor.as_completed([future], timeout_ms=100))
+            assert time.monotonic() - start < 2.0
+            assert future._completion_hooks == []
+        finally:
+            gate.set()
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_many_futures_persistent_pool(self):
+        """A large batch is yielded exactly once each."""
+        pool = QThreadPoolExecutor(max_workers=4, persistent_workers=True)
+        try:
+            futures = [pool.submit(lambda x=i: x) for i in range(2000)]
+            seen = [f.result() for f in QThreadPoolExecutor.as_completed(futures, timeout_ms=30000)]
+            assert sorted(seen) == list(range(2000))
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_waiter_woken_from_other_thread(self):
+        """_Waiter.wait on the main thread returns as soon as another thread wakes it."""
+        waiter = _Waiter()
+        timer = threading.Timer(0.05, waiter.wake)
+        start = time.monotonic()
+        timer.start()
+        try:
+            assert waiter.wait(5000) is True
+            assert time.monotonic() - start < 2.0
+            # 唤醒后自动复位
+            assert waiter.wait(20) is False
+        finally:
+            timer.cancel()
@@ -0,0 +1,150 @@
+"""Test suite for awaiting QThreadWithReturn from asyncio.
+
+Completion wakes the awaiting loop through call_soon_threadsafe(). With a Qt
+application the completion is delivered by the Qt event loop, so those checks
+run under PySide6.QtAsyncio; without one a plain asyncio.run() is enough. Both
+run in a fresh interpreter because the test session owns a QApplication that
+is not driven by an asyncio loop.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+import pytest
+
+from qthreadwithreturn import QThreadWithReturn
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+QT_PRELUDE = """
+import asyncio, threading
+from PySide6.QtWidgets import QApplication
+import PySide6.QtAsyncio as QtAsyncio
+from qthreadwithreturn import QThreadPoolExecutor, QThreadWithReturn
+app = QApplication([])
+run = lambda coro: QtAsyncio.run(coro, keep_running=False)
+"""
+
+HEADLESS_PRELUDE = """
+import asyncio, threading
+from qthreadwithreturn import QThreadPoolExecutor, QThreadWithReturn
+run = asyncio.run
+"""
+
+
+def run_script(prelude: str, script: str) -> list:
+    """Run prelude + script in a fresh interpreter and return its stdout lines."""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    completed = subprocess.run(
+        [sys.executable, "-c", prelude + textwrap.dedent(script)],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert completed.returncode == 0, completed.stderr
+    return completed.stdout.split()
+
+
+MODES = pytest.mark.parametrize("prelude", [QT_PRELUDE, HEADLESS_PRELUDE], ids=["qt", "headless"])
+
+
+@pytest.mark.unit
+class TestAwait:
+    """End-to-end awaits under a running asyncio loop."""
+
+    @MODES
+    def test_await_thread_and_submit_async(self, prelude):
+        """Results and exceptions are delivered to the awaiting coroutine."""
+        output = run_script(prelude, """
+            async def main():
+                thread = QThreadWithReturn(lambda: 42)
+                thread.start()
+                print(await thread)
+                with QThreadPoolExecutor(max_workers=2) as pool:
+                    print(await pool.submit_async(lambda a, b=0: a + b, 1, b=2))
+                    try:
+                        await pool.submit_async(lambda: 1 / 0)
+                    except ZeroDivisionError:
+                        print("ZeroDivisionError")
+            run(main())
+        """)
+        assert output == ["42", "3", "ZeroDivisionError"]
+
+    @MODES
+    def test_many_concurrent_awaits(self, prelude):
+        """Thousands of pending awaits need no extra threads and all complete."""
+        output = run_script(prelude, """
+            async def main():
+                pool = QThreadPoolExecutor(max_workers=4, persistent_workers=True)
+                gate = threading.Event()
+                tasks = [asyncio.ensure_future(pool.submit_async(lambda x: gate.wait(5) and x, i))
+                         for i in range(2000)]
+                await asyncio.sleep(0.2)
+                # 等待中的协程不占用线程：只有 4 个工作线程
+                print(threading.active_count() <= 8)
+                gate.set()
+                print(sum(await asyncio.gather(*tasks)))
+                pool.shutdown(wait=True)
+            run(main())
+        """)
+        assert output == ["True", str(sum(range(2000)))]
+
+    @MODES
+    def test_cancelling_the_awaiter_cancels_the_task(self, prelude):
+        """A wait_for timeout cancels the queued task, as asyncio.wrap_future does."""
+        output = run_script(prelude, """
+            async def main():
+                pool = QThreadPoolExecutor(max_workers=1)
+                gate = threading.Event()
+                blocker = pool.submit(gate.wait, 5)
+                queued = pool.submit(lambda: "never")
+                try:
+                    await asyncio.wait_for(queued, timeout=0.1)
+                except asyncio.TimeoutError:
+                    print("timeout")
+                print(queued.cancelled())
+                gate.set()
+                print(await blocker)
+                pool.shutdown(wait=True)
+            run(main())
+        """)
+        assert output == ["timeout", "True", "True"]
+
+
+@pytest.mark.usefixtures("qapp_session")
+class TestAwaitCompleted:
+    """Awaiting a future that is already complete does not need the Qt loop."""
+
+    @pytest.mark.unit
+    def test_completed_thread(self):
+        thread = QThreadWithReturn(lambda: "done")
+        thread.start()
+        assert thread.result(timeout_ms=5000) == "done"
+
+        async def main():
+            return await thread
+
+        assert asyncio.run(main()) == "done"
+
+    @pytest.mark.unit
+    def test_cancelled_thread(self):
+        thread = QThreadWithReturn(lambda: "never")
+        thread.cancel()
+
+        async def main():
+            return await thread
+
+        with pytest.raises(asyncio.CancelledError):
+            asyncio.run(main())
+
+    @pytest.mark.unit
+    def test_requires_running_loop(self):
+        thread = QThreadWithReturn(lambda: None)
+        with pytest.raises(RuntimeError):
+            thread.__await__()
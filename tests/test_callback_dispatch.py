@@ -0,0 +1,126 @@
+"""Test suite for batched main-thread callback dispatch.
+
+Callbacks from finished tasks are queued on a per-application dispatcher and
+drained in one posted event at a time, bounded by a time budget.
+"""
+
+import threading
+import time
+
+import pytest
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QApplication
+
+from qthreadwithreturn import QThreadPoolExecutor, set_callback_time_budget
+from qthreadwithreturn._callbacks import (
+    DEFAULT_CALLBACK_TIME_BUDGET_MS,
+    _get_dispatcher,
+    call_in_main_thread,
+)
+
+
+def wait_with_events(ms):
+    """Wait specified time while processing Qt events to allow callbacks to execute."""
+    app = QApplication.instance()
+    if app is None:
+        time.sleep(max(0.001, ms / 1000.0))
+        return
+
+    deadline = time.monotonic() + (ms / 1000.0)
+    while time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.010)
+
+
+@pytest.fixture
+def restore_budget():
+    yield
+    set_callback_time_budget(DEFAULT_CALLBACK_TIME_BUDGET_MS)
+
+
+@pytest.mark.usefixtures("qapp_session")
+class TestCallbackDispatch:
+    """Test the callback dispatcher and its use by futures and pools."""
+
+    @pytest.mark.unit
+    def test_batched_in_order_on_main_thread(self):
+        """Callbacks queued from any thread run in order on the main thread."""
+        calls = []
+
+        def record(i):
+            calls.append((i, threading.current_thread() is threading.main_thread()))
+
+        for i in range(500):
+            call_in_main_thread(record, i)
+        worker = threading.Thread(target=call_in_main_thread, args=(record, "worker"))
+        worker.start()
+        worker.join()
+
+        dispatcher = _get_dispatcher(QApplication.instance())
+        assert dispatcher._posted
+        wait_with_events(50)
+
+        assert [c[0] for c in calls] == list(range(500)) + ["worker"]
+        assert all(on_main for _, on_main in calls)
+        assert not dispatcher._posted
+
+    @pytest.mark.unit
+    def test_time_budget_yields_to_other_events(self, restore_budget):
+        """An exhausted budget lets other queued events run before the rest."""
+        set_callback_time_budget(1)
+        order = []
+
+        def slow(i):
+            time.sleep(0.002)
+            order.append(i)
+
+        for i in range(5):
+            call_in_main_thread(slow, i)
+        QTimer.singleShot(0, lambda: order.append("timer"))
+        wait_with_events(100)
+
+        assert sorted(x for x in order if x != "timer") == list(range(5))
+        assert order.index("timer") < 4
+
+    @pytest.mark.unit
+    def test_exception_does_not_stop_batch(self, capsys):
+        """A failing callback is logged and the remaining callbacks still run."""
+        calls = []
+        call_in_main_thread(lambda: 1 / 0)
+        call_in_main_thread(calls.append, "after")
+        wait_with_events(50)
+
+        assert calls == ["after"]
+        assert "Error in dispatched callback" in capsys.readouterr().err
+
+    @pytest.mark.unit
+    def test_invalid_budget(self):
+        with pytest.raises(ValueError):
+            set_callback_time_budget(0)
+
+    @pytest.mark.unit
+    def test_many_future_callbacks(self):
+        """Done, failure and pool callbacks from many tasks are all delivered."""
+        pool = QThreadPoolExecutor(max_workers=4, persistent_workers=True)
+        done, failed, pool_failed, pool_done = [], [], [], []
+        pool.add_failure_callback(lambda e: pool_failed.append(type(e)))
+        pool.add_done_callback(lambda: pool_done.append(True))
+
+        try:
+            for i in range(300):
+                if i % 10 == 0:
+                    f = pool.submit(lambda: 1 / 0)
+                    f.add_failure_callback(lambda e: failed.append(type(e)))
+                else:
+                    f = pool.submit(lambda x=i: x)
+                    f.add_done_callback(done.append)
+            pool.shutdown(wait=True)
+            wait_with_events(200)
+
+            assert len(done) == 270
+            assert failed == [ZeroDivisionError] * 30
+            assert pool_failed == [ZeroDivisionError] * 30
+            assert pool_done == [True]
+        finally:
+            if not pool._shutdown:
+                pool.shutdown(wait=True)
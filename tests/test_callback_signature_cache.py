@@ -0,0 +1,99 @@
+"""Test suite for the shared callback signature cache.
+
+validate_callback() inspects each underlying function once; bound methods are
+keyed on __func__ so the same method attached to many futures is O(1).
+"""
+
+import gc
+import inspect
+import weakref
+from unittest.mock import patch
+
+import pytest
+
+from qthreadwithreturn import QThreadPoolExecutor, QThreadWithReturn
+from qthreadwithreturn import _callbacks
+from qthreadwithreturn._callbacks import validate_callback
+
+
+class Handler:
+    def on_done(self, result):
+        pass
+
+    def on_any(self, *args):
+        pass
+
+    def __call__(self, result, extra=None):
+        pass
+
+
+class TestSignatureCache:
+    """Unit tests for validate_callback caching."""
+
+    @pytest.mark.unit
+    def test_counts_match_signature_semantics(self):
+        def two(a, b, c=1):
+            pass
+
+        handler = Handler()
+        assert validate_callback(two, "cb") == 2
+        assert validate_callback(handler.on_done, "cb") == 1
+        assert validate_callback(handler.on_any, "cb") == 0
+        assert validate_callback(handler, "cb") == 1
+        # 未绑定的函数与绑定方法分开缓存
+        assert validate_callback(Handler.on_done, "cb") == 1
+        assert validate_callback(len, "cb") == 1
+
+    @pytest.mark.unit
+    def test_bound_methods_inspected_once(self):
+        class Receiver:
+            def on_done(self, result):
+                pass
+
+        receivers = [Receiver() for _ in range(50)]
+        with patch("inspect.signature", wraps=inspect.signature) as spy:
+            for receiver in receivers:
+                assert validate_callback(receiver.on_done, "done_callback") == 1
+        assert spy.call_count == 1
+        assert Receiver.on_done in _callbacks._bound_signature_cache
+
+    @pytest.mark.unit
+    def test_entries_released_with_function(self):
+        def callback(result):
+            pass
+
+        validate_callback(callback, "cb")
+        assert callback in _callbacks._signature_cache
+        size = len(_callbacks._signature_cache)
+        ref = weakref.ref(callback)
+        del callback
+        gc.collect()
+        # 其它测试留下的函数也可能在这次回收中释放，只要求本条目已被移除
+        assert ref() is None
+        assert len(_callbacks._signature_cache) <= size - 1
+
+    @pytest.mark.unit
+    def test_errors_are_not_cached(self):
+        def callback(result):
+            pass
+
+        with patch("inspect.signature", side_effect=ValueError("boom")):
+            with pytest.raises(ValueError, match="Cannot inspect cb signature"):
+                validate_callback(callback, "cb")
+        assert validate_callback(callback, "cb") == 1
+        with pytest.raises(TypeError, match="must be callable"):
+            validate_callback(42, "cb")
+
+    @pytest.mark.unit
+    @pytest.mark.usefixtures("qapp_session")
+    def test_thread_and_pool_share_cache(self):
+        handler = Handler()
+        thread = QThreadWithReturn(lambda: None)
+        pool = QThreadPoolExecutor(max_workers=1)
+        try:
+            with patch("inspect.signature", wraps=inspect.signature) as spy:
+                thread.add_done_callback(handler.on_any)
+                pool.add_failure_callback(Handler().on_any)
+            assert spy.call_count <= 1
+        finally:
+            pool.shutdown(wait=True)
@@ -0,0 +1,213 @@
+"""Test suite for cooperative cancellation with CancellationToken.
+
+Tasks that declare a ``cancel_token`` parameter receive a token that is
+cancelled together with their future, so they can exit without the staged
+quit/terminate escalation.
+"""
+
+import functools
+import threading
+import time
+from concurrent.futures import CancelledError
+from typing import Optional
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from qthreadwithreturn import CancellationToken, QThreadPoolExecutor, QThreadWithReturn
+
+
+def wait_with_events(ms):
+    """Wait specified time while processing Qt events to allow callbacks to execute."""
+    app = QApplication.instance()
+    if app is None:
+        time.sleep(max(0.001, ms / 1000.0))
+        return
+
+    deadline = time.monotonic() + (ms / 1000.0)
+    while time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.010)
+
+
+def cooperative(started, cancel_token):
+    started.set()
+    while True:
+        cancel_token.raise_if_cancelled()
+        time.sleep(0.001)
+
+
+class TestCancellationToken:
+    """Unit tests for CancellationToken."""
+
+    @pytest.mark.unit
+    def test_cancel_runs_callbacks_once(self):
+        token = CancellationToken()
+        calls = []
+        token.add_callback(lambda: calls.append("a"))
+        removed = lambda: calls.append("removed")
+        token.add_callback(removed)
+        assert token.remove_callback(removed)
+        assert not token.cancelled
+        token.raise_if_cancelled()
+
+        token.cancel()
+        token.cancel()
+        assert token.cancelled
+        assert calls == ["a"]
+        with pytest.raises(CancelledError):
+            token.raise_if_cancelled()
+        # 已取消的令牌立即调用新回调
+        token.add_callback(lambda: calls.append("late"))
+        assert calls == ["a", "late"]
+
+    @pytest.mark.unit
+    def test_parent_cancels_children_only_downwards(self):
+        parent = CancellationToken()
+        child = CancellationToken(parent)
+        grandchild = CancellationToken(child)
+        sibling = CancellationToken(parent)
+
+        sibling.cancel()
+        assert not parent.cancelled and not child.cancelled
+
+        parent.cancel()
+        assert child.cancelled and grandchild.cancelled
+        assert CancellationToken(parent).cancelled
+
+    @pytest.mark.unit
+    def test_wait_wakes_on_cancel(self):
+        token = CancellationToken()
+        assert token.wait(10) is False
+        threading.Timer(0.05, token.cancel).start()
+        start = time.monotonic()
+        assert token.wait(5000) is True
+        assert time.monotonic() - start < 2
+
+
+@pytest.mark.usefixtures("qapp_session")
+class TestTokenInjection:
+    """Tokens injected into QThreadWithReturn and pool tasks."""
+
+    @pytest.mark.unit
+    def test_force_stop_returns_without_staged_waits(self):
+        started = threading.Event()
+        thread = QThreadWithReturn(cooperative, started)
+        thread.start()
+        assert started.wait(5)
+        assert isinstance(thread._cancel_token, CancellationToken)
+
+        start = time.monotonic()
+        assert thread.cancel(force_stop=True)
+        assert time.monotonic() - start < 0.1
+        assert thread.cancelled()
+        wait_with_events(50)
+
+    @pytest.mark.unit
+    def test_token_not_injected_without_parameter(self):
+        thread = QThreadWithReturn(lambda **kwargs: sorted(kwargs), a=1)
+        thread.start()
+        assert thread.result(timeout_ms=5000) == ["a"]
+        assert thread._cancel_token is None
+        wait_with_events(50)
+
+    @pytest.mark.unit
+    def test_defaulted_parameter_is_left_alone(self):
+        """A cancel_token parameter with a plain default keeps its default."""
+        def task(cancel_token=None):
+            return cancel_token
+
+        thread = QThreadWithReturn(task)
+        thread.start()
+        assert thread.result(timeout_ms=5000) is None
+        assert thread._cancel_token is None
+
+        explicit = QThreadWithReturn(task, cancel_token="mine")
+        explicit.start()
+        assert explicit.result(timeout_ms=5000) == "mine"
+        wait_with_events(50)
+
+    @pytest.mark.unit
+    def test_positional_token_is_not_injected_again(self):
+        """A cancel_token argument passed positionally is passed through unchanged."""
+        def task(x, cancel_token):
+            return x, cancel_token
+
+        token = CancellationToken()
+        thread = QThreadWithReturn(task, 1, token)
+        thread.start()
+        assert thread.result(timeout_ms=5000) == (1, token)
+        assert thread._cancel_token is None
+
+        with QThreadPoolExecutor(max_workers=1) as pool:
+            assert pool.submit(task, 2, None).result(timeout_ms=5000) == (2, None)
+        wait_with_events(50)
+
+    @pytest.mark.unit
+    def test_partials_are_judged_by_their_function(self):
+        """Arguments bound by functools.partial count as supplied by the caller."""
+        def task(x, cancel_token):
+            return x, cancel_token
+
+        token = CancellationToken()
+        for func, expected in [
+            (functools.partial(task, 1), None),
+            (functools.partial(task, 1, token), token),
+            (functools.partial(task, cancel_token=token), token),
+        ]:
+            args = (1,) if func.args == () else ()
+            thread = QThreadWithReturn(func, *args)
+            thread.start()
+            _, received = thread.result(timeout_ms=5000)
+            if expected is None:
+                assert isinstance(received, CancellationToken)
+                assert received is thread._cancel_token
+            else:
+                assert received is expected
+                assert thread._cancel_token is None
+        wait_with_events(50)
+
+    @pytest.mark.unit
+    def test_annotated_default_opts_in(self):
+        def task(cancel_token: Optional[CancellationToken] = None):
+            return cancel_token
+
+        thread = QThreadWithReturn(task)
+        thread.start()
+        assert isinstance(thread.result(timeout_ms=5000), CancellationToken)
+        wait_with_events(50)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("persistent", [False, True])
+    def test_parent_token_cancels_pooled_tasks(self, persistent):
+        pool = QThreadPoolExecutor(max_workers=2, persistent_workers=persistent)
+        batch = CancellationToken()
+        events = [threading.Event() for _ in range(2)]
+        try:
+            futures = [pool.submit(cooperative, e, cancel_token=batch) for e in events]
+            for e in events:
+                assert e.wait(5)
+            assert all(f._cancel_token is not batch for f in futures)
+
+            batch.cancel()
+            wait_with_events(200)
+            assert all(f.cancelled() for f in futures)
+            # 工作线程已释放
+            assert pool.submit(lambda: "next").result(timeout_ms=5000) == "next"
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_timeout_frees_persistent_worker(self):
+        """A timed-out cooperative task returns its shared worker promptly."""
+        pool = QThreadPoolExecutor(max_workers=1, persistent_workers=True)
+        started = threading.Event()
+        try:
+            slow = pool.submit(cooperative, started, timeout_ms=50)
+            assert started.wait(5)
+            start = time.monotonic()
+            assert pool.submit(lambda: "next").result(timeout_ms=5000) == "next"
+            assert time.monotonic() - start < 1
+            assert slow.cancelled()
+        finally:
+            pool.shutdown(wait=True)
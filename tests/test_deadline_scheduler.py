@@ -0,0 +1,145 @@
+"""Test suite for the shared deadline scheduler used by start(timeout_ms).
+
+All futures register their timeouts with one process-wide heap-based
+scheduler; cancelling is O(1) and completed tasks drop their deadline.
+"""
+
+import gc
+import threading
+from concurrent.futures import CancelledError
+import time
+import weakref
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from qthreadwithreturn import QThreadWithReturn
+from qthreadwithreturn._deadlines import _DeadlineScheduler
+
+
+def wait_with_events(ms):
+    """Wait specified time while processing Qt events to allow callbacks to execute."""
+    app = QApplication.instance()
+    if app is None:
+        time.sleep(max(0.001, ms / 1000.0))
+        return
+
+    deadline = time.monotonic() + (ms / 1000.0)
+    while time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.010)
+
+
+class TestDeadlineScheduler:
+    """Unit tests for _DeadlineScheduler."""
+
+    @pytest.mark.unit
+    def test_fires_in_deadline_order_and_cancel(self):
+        scheduler = _DeadlineScheduler()
+        fired = []
+        done = threading.Event()
+        scheduler.call_later(0.06, lambda: (fired.append("late"), done.set()))
+        scheduler.call_later(0.02, fired.append, "early")
+        cancelled = scheduler.call_later(0.04, fired.append, "cancelled")
+        cancelled.cancel()
+        assert not cancelled.active()
+        assert done.wait(5)
+        assert fired == ["early", "late"]
+
+    @pytest.mark.unit
+    def test_earlier_deadline_wakes_scheduler(self):
+        scheduler = _DeadlineScheduler()
+        done = threading.Event()
+        scheduler.call_later(3600, lambda: None)
+        start = time.monotonic()
+        scheduler.call_later(0.01, done.set)
+        assert done.wait(5)
+        assert time.monotonic() - start < 1
+
+    @pytest.mark.unit
+    def test_cancel_releases_callback_and_compacts(self):
+        scheduler = _DeadlineScheduler()
+
+        class Target:
+            def fire(self):
+                pass
+
+        target = Target()
+        ref = weakref.ref(target)
+        scheduler.call_later(3600, target.fire).cancel()
+        del target
+        gc.collect()
+        assert ref() is None
+        for _ in range(1000):
+            scheduler.call_later(3600, lambda: None).cancel()
+        assert len(scheduler) < 200
+
+
+@pytest.mark.usefixtures("qapp_session")
+class TestTaskTimeouts:
+    """start(timeout_ms) in Qt mode goes through the shared scheduler."""
+
+    @pytest.mark.unit
+    def test_timeout_cancels_running_task(self):
+        gate = threading.Event()
+        thread = QThreadWithReturn(gate.wait, 5)
+        try:
+            thread.start(timeout_ms=50)
+            assert thread._timeout_timer is not None
+            wait_with_events(400)
+            assert thread.cancelled()
+        finally:
+            gate.set()
+
+    @pytest.mark.unit
+    def test_completed_tasks_drop_deadline(self):
+        threads = [QThreadWithReturn(lambda x=i: x) for i in range(50)]
+        for thread in threads:
+            thread.start(timeout_ms=60_000)
+        deadlines = [thread._timeout_timer for thread in threads]
+        assert [thread.result(timeout_ms=5000) for thread in threads] == list(range(50))
+        assert all(thread._timeout_timer is None for thread in threads)
+        assert not any(deadline.active() for deadline in deadlines)
+
+    @pytest.mark.unit
+    def test_stale_deadline_ignored(self):
+        """A deadline from an earlier start() does not cancel the current run."""
+        gate = threading.Event()
+        thread = QThreadWithReturn(gate.wait, 5)
+        try:
+            thread.start(timeout_ms=5000)
+            thread._on_deadline(thread._timeout_generation - 1)
+            assert not thread.cancelled()
+            gate.set()
+            assert thread.result(timeout_ms=5000) is True
+        finally:
+            gate.set()
+            wait_with_events(100)
+
+    @pytest.mark.unit
+    def test_timeout_fires_inside_blocking_done_callback(self):
+        """A done callback that waits on a timed-out task still sees the timeout."""
+        outcome = []
+
+        def wait_for_cancel(cancel_token):
+            return cancel_token.wait(5000)
+
+        def on_done(_):
+            inner = QThreadWithReturn(wait_for_cancel)
+            inner.start(timeout_ms=100)
+            start = time.monotonic()
+            try:
+                outcome.append(inner.result())
+            except CancelledError:
+                outcome.append("cancelled")
+            outcome.append(time.monotonic() - start)
+
+        outer = QThreadWithReturn(lambda: None)
+        outer.add_done_callback(on_done)
+        outer.start()
+        deadline = time.monotonic() + 10
+        while len(outcome) < 2 and time.monotonic() < deadline:
+            wait_with_events(10)
+        assert outcome and outcome[0] == "cancelled"
+        assert outcome[1] < 2
+        wait_with_events(100)
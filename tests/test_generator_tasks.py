@@ -0,0 +1,251 @@
+"""Test suite for generator tasks.
+
+Generator functions are consumed on the worker thread; yielded items are
+buffered and delivered to add_item_callback callbacks in size- or
+time-bounded batches before the done/failure callbacks run. result() returns
+the generator's return value, or the list of yielded items when the generator
+returns None and no item callback was registered when it started.
+"""
+
+import gc
+import itertools
+import subprocess
+import sys
+import threading
+import time
+import weakref
+from pathlib import Path
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from qthreadwithreturn import QThreadPoolExecutor, QThreadWithReturn, set_item_batching
+from qthreadwithreturn import _item_batches
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def wait_with_events(ms):
+    """Wait specified time while processing Qt events to allow callbacks to execute."""
+    app = QApplication.instance()
+    if app is None:
+        time.sleep(max(0.001, ms / 1000.0))
+        return
+
+    deadline = time.monotonic() + (ms / 1000.0)
+    while time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.010)
+
+
+def wait_until(predicate, timeout_ms=5000):
+    deadline = time.monotonic() + timeout_ms / 1000.0
+    while not predicate() and time.monotonic() < deadline:
+        wait_with_events(10)
+    return predicate()
+
+
+def numbers(n):
+    for i in range(n):
+        yield i
+
+
+def numbers_with_total(n):
+    yield from range(n)
+    return f"{n} rows"
+
+
+def failing_after(n):
+    yield from range(n)
+    raise ValueError("scan failed")
+
+
+@pytest.fixture
+def batching():
+    """Restore the default batch limits after the test."""
+    yield set_item_batching
+    set_item_batching()
+
+
+@pytest.mark.usefixtures("qapp_session")
+class TestGeneratorTasks:
+    """Generator tasks on QThreadWithReturn."""
+
+    @pytest.mark.unit
+    def test_items_arrive_in_batches_before_done(self, batching):
+        batching(max_items=100, max_delay_ms=1000)
+        events = []
+        thread = QThreadWithReturn(numbers, 1000)
+        thread.add_item_callback(lambda items: events.append(("items", list(items))))
+        thread.add_done_callback(lambda result: events.append(("done", result)))
+        thread.start()
+        assert wait_until(lambda: events and events[-1][0] == "done")
+
+        batches = [items for kind, items in events[:-1]]
+        assert all(kind == "items" for kind, _ in events[:-1])
+        assert len(batches) == 10
+        assert [item for batch in batches for item in batch] == list(range(1000))
+        assert events[-1] == ("done", None)
+        assert thread.result() is None
+
+    @pytest.mark.unit
+    def test_return_value_becomes_result(self):
+        received = []
+        thread = QThreadWithReturn(numbers_with_total, 5)
+        thread.add_item_callback(received.extend)
+        thread.start()
+        assert thread.result(timeout_ms=5000) == "5 rows"
+        assert wait_until(lambda: received == [0, 1, 2, 3, 4])
+
+    @pytest.mark.unit
+    def test_items_become_result_without_item_callback(self):
+        """Without an item callback the yielded items are collected unless the generator returns a value."""
+        thread = QThreadWithReturn(numbers, 5)
+        thread.start()
+        assert thread.result(timeout_ms=5000) == [0, 1, 2, 3, 4]
+
+        thread = QThreadWithReturn(numbers_with_total, 5)
+        thread.start()
+        assert thread.result(timeout_ms=5000) == "5 rows"
+
+        with QThreadPoolExecutor(max_workers=1) as pool:
+            assert pool.submit(numbers, 3).result(timeout_ms=5000) == [0, 1, 2]
+
+    @pytest.mark.unit
+    def test_returned_generator_is_not_consumed(self):
+        """A plain function returning a lazy (here infinite) generator gets it back untouched."""
+        thread = QThreadWithReturn(lambda: itertools.count())
+        thread.start()
+        counter = thread.result(timeout_ms=5000)
+        assert next(counter) == 0
+
+    @pytest.mark.unit
+    def test_streamed_items_are_not_retained(self):
+        """With an item callback, delivered items are released as the stream goes on."""
+
+        class Row:
+            pass
+
+        refs = []
+
+        def rows(n):
+            for _ in range(n):
+                row = Row()
+                refs.append(weakref.ref(row))
+                yield row
+
+        received = [0]
+        thread = QThreadWithReturn(rows, 5000)
+        thread.add_item_callback(lambda items: received.__setitem__(0, received[0] + len(items)))
+        thread.start()
+        assert thread.result(timeout_ms=5000) is None
+        assert wait_until(lambda: received[0] == 5000)
+        wait_with_events(50)
+        gc.collect()
+        assert sum(ref() is not None for ref in refs) == 0
+
+    @pytest.mark.unit
+    def test_items_flush_after_max_delay_while_generator_blocks(self, batching):
+        batching(max_items=1000, max_delay_ms=20)
+        release = threading.Event()
+        received = []
+
+        def slow_scan():
+            yield "a"
+            yield "b"
+            release.wait(5)
+            yield "c"
+
+        thread = QThreadWithReturn(slow_scan)
+        thread.add_item_callback(received.extend)
+        thread.start()
+        try:
+            assert wait_until(lambda: received == ["a", "b"], timeout_ms=2000)
+            assert not thread.done()
+        finally:
+            release.set()
+        assert thread.result(timeout_ms=5000) is None
+        assert wait_until(lambda: received == ["a", "b", "c"])
+
+    @pytest.mark.unit
+    def test_items_precede_failure_callback(self):
+        events = []
+        thread = QThreadWithReturn(failing_after, 3)
+        thread.add_item_callback(lambda items: events.append(list(items)))
+        thread.add_item_callback(lambda: events.append("batch"))
+        thread.add_failure_callback(lambda e: events.append(str(e)))
+        thread.start()
+        assert wait_until(lambda: "scan failed" in events)
+        assert events == [[0, 1, 2], "batch", "scan failed"]
+        with pytest.raises(ValueError):
+            thread.result()
+
+    @pytest.mark.unit
+    def test_cancel_stops_consuming_generator(self):
+        closed = threading.Event()
+        started = threading.Event()
+
+        def endless():
+            try:
+                while True:
+                    started.set()
+                    yield 1
+                    time.sleep(0.005)
+            finally:
+                closed.set()
+
+        with QThreadPoolExecutor(max_workers=1, persistent_workers=True) as pool:
+            future = pool.submit(endless)
+            assert started.wait(5)
+            future.cancel()
+            assert closed.wait(5)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("persistent", [False, True])
+    def test_pool_generator_tasks(self, persistent):
+        """A callback added right after submit() receives every item, however fast the task runs."""
+        received = []
+        with QThreadPoolExecutor(max_workers=2, persistent_workers=persistent) as pool:
+            future = pool.submit(numbers_with_total, 600)
+            time.sleep(0.05)  # 任务很可能已经结束
+            future.add_item_callback(received.extend)
+            assert future.result(timeout_ms=5000) == "600 rows"
+            assert list(pool.map(numbers_with_total, [1, 2])) == ["1 rows", "2 rows"]
+            assert list(pool.map(numbers, [2, 3])) == [[0, 1], [0, 1, 2]]
+            assert list(pool.map(numbers, [2, 3], chunksize=2, ordered=False)) in (
+                [[0, 1], [0, 1, 2]], [[0, 1, 2], [0, 1]]
+            )
+        assert wait_until(lambda: len(received) == 600)
+        assert received == list(range(600))
+
+    @pytest.mark.unit
+    def test_invalid_batching_is_rejected(self):
+        with pytest.raises(ValueError):
+            set_item_batching(max_items=0)
+        with pytest.raises(ValueError):
+            set_item_batching(max_delay_ms=0)
+        assert _item_batches._batch_size == _item_batches.DEFAULT_ITEM_BATCH_SIZE
+
+
+@pytest.mark.unit
+def test_headless_generator_task():
+    """Without a Qt application items are delivered on the worker side, still in order."""
+    code = (
+        "import threading\n"
+        "from tests.test_generator_tasks import numbers\n"
+        "from qthreadwithreturn import QThreadWithReturn\n"
+        "items, done = [], threading.Event()\n"
+        "t = QThreadWithReturn(numbers, 1000)\n"
+        "t.add_item_callback(items.extend)\n"
+        "t.add_done_callback(lambda r: done.set())\n"
+        "t.start()\n"
+        "assert t.result(timeout_ms=5000) is None\n"
+        "assert done.wait(5)\n"
+        "assert items == list(range(1000)), len(items)\n"
+        "print('ok')\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=60
+    )
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == "ok"
@@ -0,0 +1,168 @@
+"""Test suite for the headless (no QApplication) execution backend.
+
+Without a Qt application QThreadWithReturn runs on a shared set of Python
+worker threads and timeouts fire from the shared deadline scheduler. The test
+session always owns a QApplication, so end-to-end checks run in a subprocess.
+"""
+
+import os
+import subprocess
+import sys
+import textwrap
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from qthreadwithreturn._headless import _WorkerSet
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def run_headless(script: str) -> str:
+    """Run script in a fresh interpreter without a QApplication and return stdout."""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    completed = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(script)],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert completed.returncode == 0, completed.stderr
+    return completed.stdout
+
+
+class TestWorkerSet:
+    """Unit tests for the shared worker threads."""
+
+    @pytest.mark.unit
+    def test_reuses_idle_threads(self):
+        workers = _WorkerSet(idle_timeout=5)
+        names = []
+        for _ in range(20):
+            done = threading.Event()
+            workers.submit(lambda: (names.append(threading.current_thread().name), done.set()))
+            assert done.wait(5)
+            time.sleep(0.005)  # 让工作线程回到空闲状态
+        assert len(set(names)) == 1
+
+    @pytest.mark.unit
+    def test_grows_for_blocking_tasks_and_retires(self):
+        workers = _WorkerSet(idle_timeout=0.1)
+        gate = threading.Event()
+        started = threading.Semaphore(0)
+        threads = set()
+
+        def blocker():
+            threads.add(threading.current_thread())
+            started.release()
+            gate.wait(5)
+
+        for _ in range(5):
+            workers.submit(blocker)
+        for _ in range(5):
+            assert started.acquire(timeout=5)
+        assert len(threads) == 5  # 互相等待的任务各自占用一个线程，不会死锁
+        gate.set()
+        for thread in threads:
+            thread.join(timeout=5)
+            assert not thread.is_alive()
+
+
+class TestHeadlessEndToEnd:
+    """QThreadWithReturn and QThreadPoolExecutor without a QApplication."""
+
+    @pytest.mark.unit
+    def test_tasks_allocate_no_qt_threads(self):
+        output = run_headless("""
+            import threading
+            from qthreadwithreturn import QThreadWithReturn, qthread_with_return
+
+            class NoQThread:
+                def __init__(self, *args, **kwargs):
+                    raise AssertionError("QThread created in headless mode")
+
+            qthread_with_return.QThread = NoQThread
+            qthread_with_return.QThreadWithReturn._Worker = NoQThread
+            qthread_with_return.QTimer = NoQThread
+
+            results = []
+            for batch in range(10):
+                threads = [QThreadWithReturn(lambda x: x * 2, i) for i in range(20)]
+                for t in threads:
+                    t.start(timeout_ms=5000)
+                results.extend(t.result() for t in threads)
+
+            named = QThreadWithReturn(lambda: threading.current_thread().name, thread_name="job")
+            named.start()
+            print(sum(results), named.result(), threading.active_count() <= 25)
+        """)
+        assert output.split() == [str(2 * sum(range(20)) * 10), "job", "True"]
+
+    @pytest.mark.unit
+    def test_timeouts_share_one_timer_thread(self):
+        output = run_headless("""
+            import threading, time
+            from concurrent.futures import CancelledError
+            from qthreadwithreturn import QThreadWithReturn
+
+            gate = threading.Event()
+            threads = [QThreadWithReturn(gate.wait, 5) for _ in range(50)]
+            for t in threads:
+                t.start(timeout_ms=50)
+            timers = [th for th in threading.enumerate() if th.name == "QThreadWithReturn-deadlines"]
+            assert all(t.wait(2000) for t in threads)
+            cancelled = sum(t.cancelled() for t in threads)
+            gate.set()
+            print(len(timers), cancelled)
+        """)
+        assert output.split() == ["1", "50"]
+
+    @pytest.mark.unit
+    def test_blocking_deadline_callback_does_not_delay_timeouts(self):
+        """Fired deadlines run on worker threads, so a blocking callback cannot stall the scheduler."""
+        output = run_headless("""
+            import threading, time
+            from qthreadwithreturn import QThreadWithReturn
+            from qthreadwithreturn import _deadlines
+
+            gate = threading.Event()
+            slow = QThreadWithReturn(gate.wait, 5)
+            outcome = []
+            done = threading.Event()
+
+            def wait_for_slow():
+                # 等待另一个超时任务，只有它的截止时间按时触发才会很快返回
+                outcome.append(slow.wait(5000) and slow.cancelled())
+                done.set()
+
+            start = time.monotonic()
+            slow.start(timeout_ms=100)
+            _deadlines.call_later(0.01, wait_for_slow)
+            assert done.wait(10)
+            elapsed = time.monotonic() - start
+            gate.set()
+            print(outcome, elapsed < 2)
+        """)
+        assert output.split() == ["[True]", "True"]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("persistent", [False, True])
+    def test_pool_completes_without_event_loop(self, persistent):
+        output = run_headless(f"""
+            import warnings
+            from qthreadwithreturn import QThreadPoolExecutor
+
+            pool = QThreadPoolExecutor(max_workers=2, persistent_workers={persistent})
+            print(list(pool.map(abs, range(-6, 0))))
+            futures = [pool.submit(pow, 2, i) for i in range(5)]
+            print(sum(f.result(timeout_ms=5000) for f in futures))
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", UserWarning)
+                pool.shutdown(wait=True)
+            print(len(pool._active_futures), len(pool._pending_tasks))
+        """)
+        assert output.splitlines() == ["[6, 5, 4, 3, 2, 1]", "31", "0 0"]
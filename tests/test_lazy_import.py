@@ -0,0 +1,64 @@
+"""Test suite for lazy package imports.
+
+Public names are resolved on first access, so importing the package does not
+load PySide6 and headless use never loads QtWidgets. Each check runs in a fresh
+interpreter because the test session already has Qt loaded.
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def run_python(code: str) -> str:
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=60,
+    )
+    assert completed.returncode == 0, completed.stderr
+    return completed.stdout.strip()
+
+
+@pytest.mark.unit
+class TestLazyImport:
+    """Test which Qt modules get loaded."""
+
+    def test_package_import_does_not_load_qt(self):
+        """Importing the package and CancellationToken does not need PySide6."""
+        output = run_python(
+            "import sys, qthreadwithreturn\n"
+            "from qthreadwithreturn import CancellationToken\n"
+            "print(any(m.startswith('PySide6') for m in sys.modules))"
+        )
+        assert output == "False"
+
+    def test_headless_tasks_do_not_load_qtwidgets(self):
+        """Running a thread and a pool without a Qt application only needs QtCore."""
+        output = run_python(
+            "import sys\n"
+            "from qthreadwithreturn import QThreadPoolExecutor, QThreadWithReturn\n"
+            "t = QThreadWithReturn(int, 1)\n"
+            "t.start()\n"
+            "assert t.result(timeout_ms=5000) == 1\n"
+            "with QThreadPoolExecutor(max_workers=2, persistent_workers=True) as pool:\n"
+            "    assert pool.submit(int, 2).result(timeout_ms=5000) == 2\n"
+            "print('PySide6.QtWidgets' in sys.modules)"
+        )
+        assert output == "False"
+
+    def test_public_names(self):
+        """Every name in __all__ resolves and unknown names raise AttributeError."""
+        output = run_python(
+            "import qthreadwithreturn as q\n"
+            "print(all(getattr(q, name) is not None for name in q.__all__))\n"
+            "print(set(q.__all__) <= set(dir(q)))\n"
+            "try:\n"
+            "    q.missing\n"
+            "except AttributeError:\n"
+            "    print('AttributeError')"
+        )
+        assert output.splitlines() == ["True", "True", "AttributeError"]
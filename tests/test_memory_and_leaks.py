@@ -16,7 +16,7 @@ import tracemalloc
 from PySide6.QtWidgets import QApplication
 from PySide6.QtCore import QTimer
 
-from qthreadwithreturn import QThreadWithReturn, QThreadPoolExecutor
+from qthreadwithreturn import QThreadWithReturn, QThreadPoolExecutor, qthread_pool_executor
 
 
 # Test fixtures
@@ -452,6 +452,29 @@ class TestResourceCleanup:
         # Thread count should not grow significantly
         assert final_thread_count <= initial_thread_count + 2
 
+    def test_finished_qthreads_released_without_waiting(self, qapp):
+        """Finished QThreads leave the live-thread registry without a blocking wait()"""
+        from unittest.mock import patch
+        from PySide6.QtCore import QThread
+        from qthreadwithreturn import qthread_with_return as module
+
+        threads = []
+        with patch.object(QThread, "wait", side_effect=AssertionError("wait() on cleanup")):
+            for i in range(20):
+                thread = QThreadWithReturn(lambda x=i: x)
+                thread.start()
+                threads.append(thread)
+            started = {id(t._thread) for t in threads}
+            deadline = time.monotonic() + 5
+            while not all(t.done() for t in threads) and time.monotonic() < deadline:
+                wait_with_events(10)
+            wait_with_events(200)
+
+        assert [t.result(timeout_ms=1000) for t in threads] == list(range(20))
+        assert all(t._thread is None for t in threads)
+        with module._live_threads_lock:
+            assert not started & set(module._live_threads)
+
     def test_cleanup_resources_called_properly(self, qapp):
         """Validate _cleanup_resources is called in all completion paths"""
         cleanup_counts = {"normal": 0, "cancel": 0, "timeout": 0, "exception": 0}
@@ -641,6 +664,26 @@ class TestWeakReferenceValidation:
         # At least 70% should be collected after pool shutdown
         assert collected >= 35
 
+    def test_unshutdown_persistent_pool_is_collectable(self, qapp, monkeypatch):
+        """A local persistent pool that is never shut down is released once its workers go idle"""
+        monkeypatch.setattr(qthread_pool_executor, "_WORKER_IDLE_TIMEOUT_S", 0.1)
+
+        def handler():
+            pool = QThreadPoolExecutor(max_workers=3, persistent_workers=True)
+            futures = [pool.submit(lambda n: n, i) for i in range(6)]
+            assert [f.result(timeout_ms=5000) for f in futures] == list(range(6))
+            return weakref.ref(pool), [thread for thread, _ in pool._workers]
+
+        pool_ref, threads = handler()
+
+        deadline = time.monotonic() + 5
+        while pool_ref() is not None and time.monotonic() < deadline:
+            wait_with_events(20)
+            gc.collect()
+
+        assert pool_ref() is None
+        assert not any(thread.isRunning() for thread in threads)
+
 
 # ============================================================================
 # TestCallbackMemoryManagement: Callback-specific memory tests
@@ -0,0 +1,212 @@
+"""Test suite for QThreadPoolExecutor persistent worker mode.
+
+persistent_workers=True keeps up to max_workers long-lived QThreads that pull
+tasks from the pool queue instead of creating one QThread per submit.
+"""
+
+import threading
+import time
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from qthreadwithreturn import QThreadPoolExecutor, qthread_pool_executor
+
+
+def wait_with_events(ms):
+    """Wait specified time while processing Qt events to allow callbacks to execute."""
+    app = QApplication.instance()
+    if app is None:
+        time.sleep(max(0.001, ms / 1000.0))
+        return
+
+    deadline = time.monotonic() + (ms / 1000.0)
+    while time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.010)
+
+
+@pytest.mark.usefixtures("qapp_session")
+class TestPersistentWorkers:
+    """Test persistent worker threads."""
+
+    @pytest.mark.unit
+    def test_results_and_thread_reuse(self):
+        """Many tasks run on at most max_workers distinct threads."""
+        pool = QThreadPoolExecutor(max_workers=3, persistent_workers=True)
+        thread_ids = set()
+        lock = threading.Lock()
+
+        def task(x):
+            with lock:
+                thread_ids.add(threading.get_ident())
+            return x * 2
+
+        try:
+            futures = [pool.submit(task, i) for i in range(200)]
+            results = [f.result(timeout_ms=10000) for f in futures]
+            assert results == [i * 2 for i in range(200)]
+            assert 1 <= len(thread_ids) <= 3
+            assert threading.get_ident() not in thread_ids
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_done_and_failure_callbacks_run_on_main_thread(self):
+        """Future callbacks keep running on the main thread."""
+        pool = QThreadPoolExecutor(max_workers=2, persistent_workers=True)
+        calls = []
+
+        try:
+            ok = pool.submit(lambda: (1, 2))
+            ok.add_done_callback(
+                lambda a, b: calls.append(("done", a, b, threading.current_thread() is threading.main_thread()))
+            )
+            bad = pool.submit(lambda: 1 / 0)
+            bad.add_failure_callback(
+                lambda e: calls.append(("failed", type(e), threading.current_thread() is threading.main_thread()))
+            )
+
+            assert ok.result(timeout_ms=5000) == (1, 2)
+            assert isinstance(bad.exception(timeout_ms=5000), ZeroDivisionError)
+            wait_with_events(100)
+
+            assert ("done", 1, 2, True) in calls
+            assert ("failed", ZeroDivisionError, True) in calls
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_initializer_runs_once_per_worker(self):
+        """The initializer runs once per worker thread, not once per task."""
+        init_calls = []
+        pool = QThreadPoolExecutor(
+            max_workers=2,
+            persistent_workers=True,
+            initializer=lambda: init_calls.append(threading.get_ident()),
+        )
+
+        try:
+            futures = [pool.submit(time.sleep, 0.001) for _ in range(50)]
+            for f in futures:
+                f.result(timeout_ms=5000)
+            assert 1 <= len(init_calls) <= 2
+            assert len(set(init_calls)) == len(init_calls)
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_cancel_queued_task(self):
+        """A queued task can be cancelled and never runs."""
+        pool = QThreadPoolExecutor(max_workers=1, persistent_workers=True)
+        ran = []
+        gate = threading.Event()
+
+        try:
+            blocker = pool.submit(gate.wait, 5)
+            queued = pool.submit(lambda: ran.append("queued"))
+
+            assert queued.cancel() is True
+            assert queued.cancelled()
+            assert queued.done()
+
+            gate.set()
+            assert blocker.result(timeout_ms=5000) is True
+            wait_with_events(100)
+            assert ran == []
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_running_state(self):
+        """running() reports tasks executing on a persistent worker."""
+        pool = QThreadPoolExecutor(max_workers=1, persistent_workers=True)
+        started = threading.Event()
+        gate = threading.Event()
+
+        def task():
+            started.set()
+            gate.wait(5)
+            return "ok"
+
+        try:
+            future = pool.submit(task)
+            assert started.wait(5)
+            assert future.running()
+            assert not future.done()
+
+            gate.set()
+            assert future.result(timeout_ms=5000) == "ok"
+            assert not future.running()
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_pool_done_callback(self):
+        """Pool-level done callback fires once all tasks finish."""
+        pool = QThreadPoolExecutor(max_workers=2, persistent_workers=True)
+        completed = []
+
+        try:
+            pool.add_done_callback(lambda: completed.append(True))
+            for _ in range(5):
+                pool.submit(time.sleep, 0.01)
+            pool.shutdown(wait=True)
+            wait_with_events(200)
+            assert completed == [True]
+        finally:
+            if not pool._shutdown:
+                pool.shutdown(wait=False, force_stop=True)
+
+    @pytest.mark.unit
+    def test_idle_workers_exit_and_respawn(self, monkeypatch):
+        """Idle workers leave after the idle timeout; later submits start new ones."""
+        monkeypatch.setattr(qthread_pool_executor, "_WORKER_IDLE_TIMEOUT_S", 0.05)
+        pool = QThreadPoolExecutor(max_workers=2, persistent_workers=True)
+        try:
+            assert pool.submit(lambda: 1).result(timeout_ms=5000) == 1
+            first = [thread for thread, _ in pool._workers]
+            deadline = time.monotonic() + 5
+            while pool._live_workers and time.monotonic() < deadline:
+                wait_with_events(20)
+            assert pool._live_workers == 0
+
+            assert [pool.submit(lambda x: x, i).result(timeout_ms=5000) for i in range(4)] == [0, 1, 2, 3]
+            assert 1 <= pool._live_workers <= 2
+            assert not any(thread in first for thread, _ in pool._workers)
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_shutdown_stops_worker_threads(self):
+        """shutdown(wait=True) joins every worker thread."""
+        pool = QThreadPoolExecutor(max_workers=3, persistent_workers=True)
+        futures = [pool.submit(time.sleep, 0.01) for _ in range(6)]
+        for f in futures:
+            f.result(timeout_ms=5000)
+
+        pool.shutdown(wait=True)
+
+        assert pool._workers
+        assert all(not thread.isRunning() for thread, _ in pool._workers)
+        with pytest.raises(RuntimeError):
+            pool.submit(lambda: None)
+
+    @pytest.mark.unit
+    def test_force_stop_with_stuck_worker(self):
+        """force_stop terminates a worker that never returns."""
+        pool = QThreadPoolExecutor(max_workers=1, persistent_workers=True)
+        started = threading.Event()
+
+        def stuck():
+            started.set()
+            while True:
+                time.sleep(0.01)
+
+        future = pool.submit(stuck)
+        assert started.wait(5)
+
+        pool.shutdown(force_stop=True)
+
+        assert future.done()
+        assert all(not thread.isRunning() for thread, _ in pool._workers)
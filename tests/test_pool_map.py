@@ -0,0 +1,155 @@
+"""Test suite for QThreadPoolExecutor.map.
+
+map consumes its input lazily, batches items into chunks and yields results
+as a generator with a bounded number of chunks in flight.
+"""
+
+import itertools
+import threading
+import time
+from concurrent.futures import TimeoutError
+
+import pytest
+
+from qthreadwithreturn import QThreadPoolExecutor
+
+
+@pytest.mark.usefixtures("qapp_session")
+class TestPoolMap:
+    """Test map ordering, chunking, laziness and error handling."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("chunksize", [1, 3, 50])
+    def test_ordered_results(self, chunksize):
+        """Ordered map matches builtin map for any chunk size."""
+        pool = QThreadPoolExecutor(max_workers=4)
+        try:
+            results = list(pool.map(lambda x, y: x * y, range(100), range(100), chunksize=chunksize))
+            assert results == [x * x for x in range(100)]
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_unordered_results(self):
+        """Unordered map yields every result, fast chunks first."""
+        pool = QThreadPoolExecutor(max_workers=2)
+
+        def task(x):
+            if x == 0:
+                time.sleep(0.3)
+            return x
+
+        try:
+            results = list(pool.map(task, range(6), ordered=False))
+            assert sorted(results) == list(range(6))
+            assert results[-1] == 0
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_input_consumed_lazily(self):
+        """Only the prefetch window is read ahead of the consumer."""
+        pool = QThreadPoolExecutor(max_workers=2, persistent_workers=True)
+        consumed = []
+
+        def source():
+            for i in itertools.count():
+                consumed.append(i)
+                yield i
+
+        try:
+            results = pool.map(lambda x: x + 1, source(), chunksize=5, prefetch=2)
+            # 调用时只提交第一批分块
+            assert len(consumed) == 10
+            taken = list(itertools.islice(results, 25))
+            assert taken == list(range(1, 26))
+            assert len(consumed) <= 25 + 2 * 5
+            results.close()
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_exception_propagates(self):
+        """An exception in fn is raised when its chunk is reached."""
+        pool = QThreadPoolExecutor(max_workers=2)
+
+        def task(x):
+            if x == 5:
+                raise ValueError("bad item")
+            return x
+
+        try:
+            results = pool.map(task, range(10))
+            assert [next(results) for _ in range(5)] == [0, 1, 2, 3, 4]
+            with pytest.raises(ValueError, match="bad item"):
+                next(results)
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_timeout(self):
+        """timeout_ms bounds the whole iteration."""
+        pool = QThreadPoolExecutor(max_workers=1)
+        gate = threading.Event()
+        try:
+            results = pool.map(lambda _: gate.wait(5), range(3), timeout_ms=100)
+            with pytest.raises(TimeoutError):
+                list(results)
+        finally:
+            gate.set()
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_timeout_cancels_the_awaited_queued_chunk(self):
+        """The chunk whose result timed out is cancelled with the rest of the queue."""
+        pool = QThreadPoolExecutor(max_workers=1)
+        gate = threading.Event()
+        ran = []
+        try:
+            blocker = pool.submit(gate.wait, 5)
+            results = pool.map(ran.append, range(3), timeout_ms=100)
+            with pytest.raises(TimeoutError):
+                next(results)
+            gate.set()
+            assert blocker.result(timeout_ms=5000) is True
+            pool.shutdown(wait=True)
+            assert ran == []
+        finally:
+            gate.set()
+
+    @pytest.mark.unit
+    def test_close_cancels_queued_chunks(self):
+        """Closing the generator early cancels chunks that have not started."""
+        pool = QThreadPoolExecutor(max_workers=1)
+        ran = []
+        release = threading.Event()
+
+        def task(x):
+            ran.append(x)
+            if x > 0:
+                release.wait(5)
+            return x
+
+        try:
+            results = pool.map(task, range(10), prefetch=4)
+            assert next(results) == 0
+            results.close()
+            release.set()
+            pool.shutdown(wait=True)
+            assert ran in ([0], [0, 1])
+        finally:
+            release.set()
+
+    @pytest.mark.unit
+    def test_argument_validation(self):
+        """Invalid arguments and shutdown pools are rejected at call time."""
+        pool = QThreadPoolExecutor(max_workers=1)
+        with pytest.raises(ValueError):
+            pool.map(abs, [1], chunksize=0)
+        with pytest.raises(ValueError):
+            pool.map(abs, [1], prefetch=0)
+        with pytest.raises(TypeError):
+            pool.map(abs, [1], timeout_ms="1")
+        pool.shutdown(wait=True)
+        with pytest.raises(RuntimeError):
+            pool.map(abs, [1])
@@ -0,0 +1,250 @@
+"""Test suite for QThreadPoolExecutor.stats() and the metrics hook.
+
+Counters and histograms are recorded into per-thread shards and summed when a
+snapshot is taken; these tests cover the counters for every outcome, the
+queue/occupancy gauges, the three histograms and the streaming hook.
+"""
+
+import threading
+import time
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from qthreadwithreturn import QThreadPoolExecutor
+from qthreadwithreturn import _metrics
+from qthreadwithreturn._callbacks import call_in_main_thread
+
+
+def wait_with_events(ms):
+    """Wait specified time while processing Qt events to allow callbacks to execute."""
+    app = QApplication.instance()
+    if app is None:
+        time.sleep(max(0.001, ms / 1000.0))
+        return
+
+    deadline = time.monotonic() + (ms / 1000.0)
+    while time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.010)
+
+
+def fail():
+    raise ValueError("boom")
+
+
+@pytest.mark.unit
+class TestPoolMetricsShards:
+    """Test the sharded recorder on its own."""
+
+    def test_counters_and_histograms_merge_across_threads(self):
+        """Shards written by different threads, live or exited, are all summed."""
+        metrics = _metrics._PoolMetrics()
+
+        def record():
+            for _ in range(1000):
+                metrics.increment(_metrics.COMPLETED)
+                metrics.observe(_metrics.RUN_TIME, 0.003)
+
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        record()
+
+        snapshot = metrics.snapshot()
+        assert snapshot["completed"] == 5000
+        run_time = snapshot["run_time"]
+        assert run_time["count"] == 5000
+        assert run_time["sum"] == pytest.approx(15.0)
+        assert run_time["max"] == pytest.approx(0.003)
+        # 0.003s 落在 (0.0025, 0.005] 桶中，分位数按上界估计但不超过最大值
+        assert run_time["p50"] == pytest.approx(0.003)
+        assert dict(run_time["buckets"])[0.005] == 5000
+        # 已退出线程的分片被归档，再次汇总结果不变
+        assert metrics.snapshot()["completed"] == 5000
+
+    def test_empty_histogram(self):
+        """An empty histogram reports zeros."""
+        snapshot = _metrics._PoolMetrics().snapshot()
+        assert snapshot["queue_wait"]["count"] == 0
+        assert snapshot["queue_wait"]["p99"] == 0.0
+        assert snapshot["queue_wait"]["mean"] == 0.0
+
+
+@pytest.mark.usefixtures("qapp_session")
+class TestPoolStats:
+    """Test QThreadPoolExecutor.stats()."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("persistent", [False, True])
+    def test_outcome_counters(self, persistent):
+        """Completed, failed and cancelled tasks are counted separately."""
+        pool = QThreadPoolExecutor(max_workers=1, persistent_workers=persistent)
+        try:
+            gate = threading.Event()
+            blocker = pool.submit(gate.wait, 5)
+            queued = pool.submit(lambda: "never")
+            queued.cancel()
+            gate.set()
+            ok = [pool.submit(lambda x=i: x) for i in range(5)]
+            bad = pool.submit(fail)
+            for f in ok + [blocker]:
+                f.result(timeout_ms=5000)
+            with pytest.raises(ValueError):
+                bad.result(timeout_ms=5000)
+            wait_with_events(50)
+
+            stats = pool.stats()
+            assert stats["submitted"] == 8
+            assert stats["started"] == 7
+            assert stats["completed"] == 6
+            assert stats["failed"] == 1
+            assert stats["cancelled"] == 1
+            assert stats["run_time"]["count"] == 7
+            assert stats["queue_wait"]["count"] == 7
+            # 这些任务没有注册回调，不产生回调延迟
+            assert stats["callback_delay"]["count"] == 0
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("persistent", [False, True])
+    def test_callback_delay_includes_dispatcher_wait(self, persistent):
+        """callback_delay ends when the first callback runs, not when the result arrives."""
+        pool = QThreadPoolExecutor(max_workers=1, persistent_workers=persistent)
+        try:
+            gate = threading.Event()
+            future = pool.submit(gate.wait, 5)
+            # 结果在主线程中处理时先排入一个慢回调，完成回调排在它之后
+            future.result_ready_signal.connect(lambda _: call_in_main_thread(time.sleep, 0.2))
+            future.add_done_callback(lambda _: None)
+            gate.set()
+            future.result(timeout_ms=5000)
+            wait_with_events(400)
+
+            timings = future.timings
+            delay = pool.stats()["callback_delay"]
+            assert delay["count"] == 1
+            assert delay["sum"] == pytest.approx(timings["callbacks"][0] - timings["returned"])
+            assert timings["callbacks"][0] - timings["delivered"] >= 0.2
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("persistent", [False, True])
+    def test_queue_depth_and_occupancy(self, persistent):
+        """Gauges report queued tasks and busy workers."""
+        pool = QThreadPoolExecutor(max_workers=2, persistent_workers=persistent)
+        gate = threading.Event()
+        try:
+            futures = [pool.submit(gate.wait, 5) for _ in range(5)]
+            wait_with_events(200)
+            stats = pool.stats()
+            assert stats["max_workers"] == 2
+            assert stats["active_workers"] == 2
+            assert stats["worker_occupancy"] == 1.0
+            assert stats["queue_depth"] == 3
+        finally:
+            gate.set()
+            pool.shutdown(wait=True)
+        assert all(f.done() for f in futures)
+        stats = pool.stats()
+        assert stats["queue_depth"] == 0
+        assert stats["active_workers"] == 0
+
+    @pytest.mark.unit
+    def test_histograms_measure_phases(self):
+        """Queue wait covers time in the queue; run time covers the function."""
+        pool = QThreadPoolExecutor(max_workers=1)
+        try:
+            first = pool.submit(time.sleep, 0.2)
+            second = pool.submit(time.sleep, 0.05)
+            first.result(timeout_ms=5000)
+            second.result(timeout_ms=5000)
+            wait_with_events(50)
+
+            stats = pool.stats()
+            assert stats["run_time"]["max"] >= 0.2
+            assert stats["run_time"]["sum"] >= 0.25
+            # 第二个任务至少排队了第一个任务的执行时间
+            assert stats["queue_wait"]["max"] >= 0.15
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_caller_runs_is_counted(self):
+        """Tasks run in the caller by the caller_runs policy are recorded too."""
+        pool = QThreadPoolExecutor(max_workers=1, max_queue_size=1, queue_full_policy="caller_runs")
+        gate = threading.Event()
+        try:
+            pool.submit(gate.wait, 5)
+            wait_with_events(100)
+            pool.submit(gate.wait, 5)
+            inline = pool.submit(lambda: "inline")
+            assert inline.result() == "inline"
+            stats = pool.stats()
+            assert stats["submitted"] == 3
+            assert stats["completed"] == 1
+        finally:
+            gate.set()
+            pool.shutdown(wait=True)
+
+
+@pytest.mark.usefixtures("qapp_session")
+class TestMetricsHook:
+    """Test the streaming metrics hook."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("persistent", [False, True])
+    def test_hook_receives_events(self, persistent):
+        """Every counter increment and histogram observation is streamed."""
+        pool = QThreadPoolExecutor(max_workers=2, persistent_workers=persistent)
+        events = []
+        lock = threading.Lock()
+
+        def hook(name, value):
+            with lock:
+                events.append((name, value))
+
+        pool.set_metrics_hook(hook)
+        try:
+            for f in [pool.submit(lambda: 1) for _ in range(3)]:
+                f.result(timeout_ms=5000)
+            wait_with_events(50)
+        finally:
+            pool.shutdown(wait=True)
+
+        names = [name for name, _ in events]
+        assert names.count("submitted") == 3
+        assert names.count("started") == 3
+        assert names.count("completed") == 3
+        assert names.count("run_time") == 3
+        assert all(value >= 0 for _, value in events)
+
+    @pytest.mark.unit
+    def test_hook_errors_are_contained(self, capsys):
+        """A failing hook does not break task execution."""
+        pool = QThreadPoolExecutor(max_workers=1)
+        pool.set_metrics_hook(lambda name, value: 1 / 0)
+        try:
+            assert pool.submit(lambda: "ok").result(timeout_ms=5000) == "ok"
+        finally:
+            pool.shutdown(wait=True)
+        assert "Error in metrics hook" in capsys.readouterr().err
+
+    @pytest.mark.unit
+    def test_hook_validation_and_removal(self):
+        """Non-callables are rejected and None removes the hook."""
+        pool = QThreadPoolExecutor(max_workers=1)
+        events = []
+        try:
+            with pytest.raises(TypeError):
+                pool.set_metrics_hook("not callable")
+            pool.set_metrics_hook(lambda name, value: events.append(name))
+            pool.set_metrics_hook(None)
+            pool.submit(lambda: 1).result(timeout_ms=5000)
+        finally:
+            pool.shutdown(wait=True)
+        assert events == []
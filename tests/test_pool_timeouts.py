@@ -0,0 +1,141 @@
+"""Test suite for QThreadPoolExecutor task timeouts.
+
+submit(..., timeout_ms=) and default_timeout_ms time out pooled tasks; with
+timeout_from="submit" the countdown includes queueing time and tasks that
+expire while queued are dropped before they take a worker.
+"""
+
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from qthreadwithreturn import QThreadPoolExecutor, QThreadWithReturn
+
+
+def wait_with_events(ms):
+    """Wait specified time while processing Qt events to allow callbacks to execute."""
+    app = QApplication.instance()
+    if app is None:
+        time.sleep(max(0.001, ms / 1000.0))
+        return
+
+    deadline = time.monotonic() + (ms / 1000.0)
+    while time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.010)
+
+
+def busy_sleep(seconds):
+    """Sleep in short slices so a forced stop lands between them."""
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        time.sleep(0.01)
+    return "finished"
+
+
+@pytest.mark.usefixtures("qapp_session")
+class TestPoolTimeouts:
+    """Test per-task and pool-wide timeouts."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("persistent", [False, True])
+    def test_running_task_times_out(self, persistent):
+        """A task running past timeout_ms is cancelled; the pool keeps working."""
+        pool = QThreadPoolExecutor(max_workers=1, persistent_workers=persistent)
+        try:
+            slow = pool.submit(busy_sleep, 1.0, timeout_ms=100)
+            wait_with_events(400)
+            assert slow.cancelled()
+            with pytest.raises(CancelledError):
+                slow.result(timeout_ms=1000)
+            assert pool.submit(lambda: "next").result(timeout_ms=5000) == "next"
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_default_timeout_and_override(self):
+        """default_timeout_ms applies unless submit() passes its own timeout_ms."""
+        pool = QThreadPoolExecutor(max_workers=2, default_timeout_ms=100)
+        try:
+            limited = pool.submit(busy_sleep, 0.5)
+            unlimited = pool.submit(busy_sleep, 0.5, timeout_ms=-1)
+            assert unlimited.result(timeout_ms=5000) == "finished"
+            wait_with_events(100)
+            assert limited.cancelled()
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("persistent", [False, True])
+    def test_submit_deadline_drops_queued_task(self, persistent):
+        """A task whose deadline passes in the queue is cancelled and never runs."""
+        pool = QThreadPoolExecutor(
+            max_workers=1, persistent_workers=persistent, timeout_from="submit"
+        )
+        gate = threading.Event()
+        ran = []
+        try:
+            blocker = pool.submit(gate.wait, 5)
+            queued = pool.submit(ran.append, "queued", timeout_ms=50)
+            kept = pool.submit(ran.append, "kept")
+            wait_with_events(300)
+            assert queued.cancelled()
+            assert not blocker.done()
+
+            gate.set()
+            assert kept.result(timeout_ms=5000) is None
+            assert ran == ["kept"]
+        finally:
+            gate.set()
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_start_timeout_excludes_queue_time(self):
+        """With timeout_from="start" the countdown begins when the task starts."""
+        pool = QThreadPoolExecutor(max_workers=1, default_timeout_ms=150)
+        try:
+            first = pool.submit(time.sleep, 0.1)
+            second = pool.submit(time.sleep, 0.1)
+            assert first.result(timeout_ms=5000) is None
+            assert second.result(timeout_ms=5000) is None
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_timeout_not_passed_to_function(self):
+        """timeout_ms is consumed by the pool, other kwargs reach fn."""
+        pool = QThreadPoolExecutor(max_workers=1)
+        try:
+            future = pool.submit(lambda **kw: kw, timeout_ms=5000, a=1)
+            assert future.result(timeout_ms=5000) == {"a": 1}
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            QThreadPoolExecutor(max_workers=1, timeout_from="dequeue")
+        with pytest.raises(TypeError):
+            QThreadPoolExecutor(max_workers=1, default_timeout_ms="5s")
+        pool = QThreadPoolExecutor(max_workers=1)
+        try:
+            with pytest.raises(TypeError):
+                pool.submit(lambda: None, timeout_ms="5s")
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_futures_created_outside_submit_have_no_timeout(self):
+        """Pool timeout state is declared on every future, not only submitted ones."""
+        pool = QThreadPoolExecutor(max_workers=1)
+        try:
+            future = QThreadWithReturn(lambda: None)
+            assert pool._task_timeout_ms(future) is None
+            pool._expire_queued(future)
+            assert not future.cancelled()
+            assert future._pool_managed is False
+        finally:
+            pool.shutdown(wait=True)
@@ -0,0 +1,123 @@
+"""Test suite for priority scheduling of QThreadPoolExecutor tasks.
+
+submit(..., priority=N) moves the pending queue to a heap (_PriorityTaskQueue)
+where larger priorities start first and waiting tasks age upwards.
+"""
+
+import threading
+import time
+
+import pytest
+
+from qthreadwithreturn import QThreadPoolExecutor
+from qthreadwithreturn._task_queue import _PriorityTaskQueue, _TaskQueue
+
+
+class TestPriorityTaskQueue:
+    """Unit tests for _PriorityTaskQueue."""
+
+    @pytest.mark.unit
+    def test_priority_then_fifo(self):
+        queue = _PriorityTaskQueue()
+        queue.append("low-1", 0)
+        queue.append("high-1", 5)
+        queue.append("low-2", 0)
+        queue.append("high-2", 5)
+        queue.append("mid", 1)
+        assert list(queue) == ["high-1", "high-2", "mid", "low-1", "low-2"]
+        assert [queue.popleft() for _ in range(5)] == ["high-1", "high-2", "mid", "low-1", "low-2"]
+        assert not queue
+
+    @pytest.mark.unit
+    def test_aging_promotes_waiting_tasks(self):
+        queue = _PriorityTaskQueue(aging_ms=10)
+        queue.append("old-low", 0)
+        time.sleep(0.05)  # 等待约 5 个老化间隔
+        queue.append("new-high", 2)
+        queue.append("new-urgent", 100)
+        assert [queue.popleft() for _ in range(3)] == ["new-urgent", "old-low", "new-high"]
+
+    @pytest.mark.unit
+    def test_discard_appendleft_and_pop_oldest(self):
+        queue = _PriorityTaskQueue()
+        for name, priority in [("a", 0), ("b", 3), ("c", 1)]:
+            queue.append(name, priority)
+        assert queue.discard("b") is True
+        assert queue.peek() == "c"
+        assert queue.pop_oldest() == "a"
+        assert queue.popleft() == "c"
+        queue.append("d", 9)
+        queue.appendleft("retry")
+        assert queue.popleft() == "retry"
+        with pytest.raises(IndexError):
+            _PriorityTaskQueue().pop_oldest()
+
+    @pytest.mark.unit
+    def test_retried_task_keeps_its_age(self):
+        """A task re-inserted after a failed start is not mistaken for the oldest one."""
+        queue = _PriorityTaskQueue()
+        queue.append("old", 0)
+        queue.append("urgent", 5)
+        assert queue.popleft() == "urgent"
+        queue.appendleft("urgent")
+        assert queue.peek() == "urgent"
+        assert queue.pop_oldest() == "old"
+        assert queue.popleft() == "urgent"
+
+    @pytest.mark.unit
+    def test_from_queue_keeps_order(self):
+        fifo = _TaskQueue()
+        for i in range(3):
+            fifo.append(i)
+        queue = _PriorityTaskQueue.from_queue(fifo)
+        queue.append("urgent", 1)
+        assert list(queue) == ["urgent", 0, 1, 2]
+
+
+@pytest.mark.usefixtures("qapp_session")
+class TestPoolPriority:
+    """Test priority dispatch in a saturated pool."""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("persistent", [False, True])
+    def test_high_priority_runs_before_backlog(self, persistent):
+        """A high-priority task overtakes queued background tasks."""
+        pool = QThreadPoolExecutor(max_workers=1, persistent_workers=persistent)
+        gate = threading.Event()
+        order = []
+
+        try:
+            blocker = pool.submit(gate.wait, 5)
+            background = [pool.submit(order.append, f"bg-{i}") for i in range(5)]
+            urgent = pool.submit(order.append, "urgent", priority=10)
+            assert pool._priority_scheduling
+
+            gate.set()
+            urgent.result(timeout_ms=5000)
+            for f in [blocker, *background]:
+                f.result(timeout_ms=5000)
+            assert order == ["urgent", "bg-0", "bg-1", "bg-2", "bg-3", "bg-4"]
+        finally:
+            gate.set()
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_default_priority_keeps_fifo_queue(self):
+        """Pools that never use priorities keep the O(1) FIFO queue."""
+        pool = QThreadPoolExecutor(max_workers=2)
+        try:
+            futures = [pool.submit(lambda x=i: x) for i in range(10)]
+            assert [f.result(timeout_ms=5000) for f in futures] == list(range(10))
+            assert isinstance(pool._pending_tasks, _TaskQueue)
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_priority_not_passed_to_function(self):
+        """priority is consumed by the pool, other kwargs reach fn."""
+        pool = QThreadPoolExecutor(max_workers=1)
+        try:
+            future = pool.submit(lambda **kw: kw, priority=3, a=1)
+            assert future.result(timeout_ms=5000) == {"a": 1}
+        finally:
+            pool.shutdown(wait=True)
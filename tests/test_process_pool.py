@@ -0,0 +1,326 @@
+"""Test suite for QProcessPoolExecutor.
+
+Tasks run in persistent worker processes while futures, callbacks and pool
+level callbacks behave exactly as with QThreadPoolExecutor. Worker processes
+are spawned, so task functions live at module level where they can be
+imported by the children. Buffers above shared_memory_threshold travel through
+shared memory and arrive as views.
+"""
+
+import array
+import gc
+import glob
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from qthreadwithreturn import CancellationToken, QProcessPoolExecutor
+from qthreadwithreturn import _shared_memory
+
+_initialized_with = None
+
+
+def wait_with_events(ms):
+    """Wait specified time while processing Qt events to allow callbacks to execute."""
+    app = QApplication.instance()
+    if app is None:
+        time.sleep(max(0.001, ms / 1000.0))
+        return
+
+    deadline = time.monotonic() + (ms / 1000.0)
+    while time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.010)
+
+
+def wait_until(predicate, timeout_ms=20000):
+    deadline = time.monotonic() + timeout_ms / 1000.0
+    while not predicate() and time.monotonic() < deadline:
+        wait_with_events(10)
+    return predicate()
+
+
+def square(x):
+    return x * x
+
+
+def value_and_pid(x):
+    return x, os.getpid()
+
+
+def fail(message):
+    raise ValueError(message)
+
+
+def remember(value):
+    global _initialized_with
+    _initialized_with = value
+
+
+def initialized_with():
+    return _initialized_with
+
+
+def make_bytes(size):
+    return b"x" * size
+
+
+def make_bytearray(size):
+    return bytearray(size)
+
+
+def make_grid(rows, cols):
+    return memoryview(array.array("d", range(rows * cols))).cast("B").cast("d", (rows, cols))
+
+
+def describe(*args, **kwargs):
+    values = list(args) + [kwargs[key] for key in sorted(kwargs)]
+    return tuple((type(value).__name__, len(value)) for value in values)
+
+
+def shared_blocks():
+    return set(glob.glob("/dev/shm/psm_*"))
+
+
+@pytest.fixture
+def pool():
+    executor = QProcessPoolExecutor(max_workers=2)
+    yield executor
+    executor.shutdown(wait=True)
+
+
+@pytest.mark.usefixtures("qapp_session")
+class TestProcessPoolExecution:
+    """Tasks run in worker processes and keep the future contract."""
+
+    @pytest.mark.unit
+    def test_tuple_results_unpack_into_main_thread_callbacks(self, pool):
+        """Multi-value results unpack into callbacks that run on the main thread."""
+        calls = []
+        future = pool.submit(value_and_pid, 7)
+        future.add_done_callback(
+            lambda value, pid: calls.append((value, pid, threading.current_thread() is threading.main_thread()))
+        )
+        assert wait_until(lambda: calls)
+        value, pid, on_main_thread = calls[0]
+        assert value == 7
+        assert pid != os.getpid()
+        assert on_main_thread
+
+    @pytest.mark.unit
+    def test_failure_and_pool_callbacks(self, pool):
+        """Task and pool failure callbacks receive the exception from the child."""
+        task_errors, pool_errors, pool_done = [], [], []
+        pool.add_failure_callback(pool_errors.append)
+        pool.add_done_callback(lambda: pool_done.append(True))
+        future = pool.submit(fail, "boom")
+        future.add_failure_callback(task_errors.append)
+        pool.submit(square, 3)
+        assert wait_until(lambda: task_errors and pool_errors and pool_done)
+        assert isinstance(task_errors[0], ValueError)
+        assert str(pool_errors[0]) == "boom"
+        with pytest.raises(ValueError):
+            future.result(timeout_ms=5000)
+
+    @pytest.mark.unit
+    def test_map_and_as_completed(self, pool):
+        """map and as_completed work unchanged."""
+        assert list(pool.map(square, range(20))) == [x * x for x in range(20)]
+        futures = [pool.submit(square, x) for x in range(10)]
+        done = list(QProcessPoolExecutor.as_completed(futures, timeout_ms=20000))
+        assert sorted(f.result() for f in done) == [x * x for x in range(10)]
+
+    @pytest.mark.unit
+    def test_unpicklable_task_fails_the_future(self, pool):
+        """A lambda cannot be sent to a worker process; the future fails instead."""
+        future = pool.submit(lambda: 1)
+        assert future.exception(timeout_ms=20000) is not None
+
+    @pytest.mark.unit
+    def test_initializer_runs_in_workers(self):
+        """The initializer runs in each worker process, not in the caller."""
+        pool = QProcessPoolExecutor(max_workers=1, initializer=remember, initargs=("ready",))
+        try:
+            assert pool.submit(initialized_with).result(timeout_ms=20000) == "ready"
+            assert _initialized_with is None
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_persistent_workers_argument_is_rejected(self):
+        with pytest.raises(TypeError):
+            QProcessPoolExecutor(max_workers=1, persistent_workers=False)
+
+
+@pytest.mark.usefixtures("qapp_session")
+class TestProcessPoolCancellation:
+    """Cancellation and shutdown."""
+
+    @pytest.mark.unit
+    def test_parent_token_cancels_queued_task(self):
+        """A caller supplied token cancels tasks that have not started."""
+        pool = QProcessPoolExecutor(max_workers=1)
+        token = CancellationToken()
+        try:
+            blocker = pool.submit(time.sleep, 0.5)
+            queued = pool.submit(square, 2, cancel_token=token)
+            token.cancel()
+            assert wait_until(queued.done)
+            assert queued.cancelled()
+            blocker.result(timeout_ms=20000)
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_force_stop_terminates_worker_processes(self):
+        """force_stop terminates busy workers instead of waiting for them."""
+        pool = QProcessPoolExecutor(max_workers=2)
+        futures = [pool.submit(time.sleep, 30) for _ in range(3)]
+        assert wait_until(lambda: pool.stats()["active_workers"] == 2)
+        wait_with_events(500)  # 让工作进程启动并开始执行
+        processes = list(pool._process_pool._processes.values())
+
+        start = time.monotonic()
+        pool.shutdown(force_stop=True)
+        assert time.monotonic() - start < 5
+        assert all(f.done() for f in futures)
+        for process in processes:
+            process.join(5)
+            assert not process.is_alive()
+
+    @pytest.mark.unit
+    def test_shutdown_without_wait_releases_processes_after_last_task(self):
+        """Worker processes exit once the last outstanding task completes."""
+        pool = QProcessPoolExecutor(max_workers=1)
+        future = pool.submit(time.sleep, 0.3)
+        pool.shutdown()
+        assert not pool._processes_released
+        future.result(timeout_ms=20000)
+        assert wait_until(lambda: pool._processes_released)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("force_stop", [False, True])
+    def test_wait_warning_points_at_caller(self, force_stop):
+        pool = QProcessPoolExecutor(max_workers=1)
+        with pytest.warns(UserWarning, match="wait=True") as record:
+            pool.shutdown(force_stop=force_stop, wait=True)
+        assert record[0].filename == __file__
+
+
+@pytest.mark.usefixtures("qapp_session")
+class TestSharedMemoryTransfer:
+    """Large buffers bypass the result pipe and arrive as shared-memory views."""
+
+    THRESHOLD = 64 * 1024
+
+    @pytest.fixture
+    def shm_pool(self):
+        executor = QProcessPoolExecutor(max_workers=1, shared_memory_threshold=self.THRESHOLD)
+        yield executor
+        executor.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_pack_unpack_round_trip_without_copy(self):
+        payload, block = _shared_memory.pack((b"a" * self.THRESHOLD, b"small"), self.THRESHOLD)
+        try:
+            assert block is not None
+            assert len(payload.data) < 1024  # 大缓冲区不在 pickle 数据中
+            big, small = _shared_memory.unpack(payload, unlink=False)
+            assert isinstance(big, memoryview) and big.readonly
+            assert big.obj is not None and bytes(big[:2]) == b"aa"
+            assert small == b"small"
+        finally:
+            del big
+            _shared_memory.release(block)
+
+    @pytest.mark.unit
+    def test_large_bytes_result_arrives_as_view_in_callback(self, shm_pool):
+        received = []
+        future = shm_pool.submit(make_bytes, 2 * self.THRESHOLD)
+        future.add_done_callback(received.append)
+        assert wait_until(lambda: received)
+        view = received[0]
+        assert isinstance(view, memoryview)
+        assert view.readonly
+        assert len(view) == 2 * self.THRESHOLD and bytes(view[-3:]) == b"xxx"
+
+    @pytest.mark.unit
+    def test_bytearray_and_typed_views_keep_layout(self, shm_pool):
+        writable = shm_pool.submit(make_bytearray, self.THRESHOLD).result(timeout_ms=20000)
+        assert isinstance(writable, memoryview) and not writable.readonly
+        grid = shm_pool.submit(make_grid, 128, 128).result(timeout_ms=20000)
+        assert grid.format == "d" and grid.shape == (128, 128)
+        assert grid[1, 2] == 130.0
+
+    @pytest.mark.unit
+    def test_argument_types_do_not_depend_on_size(self, shm_pool):
+        """bytes/bytearray arguments keep their type on both sides of the threshold."""
+        big, small = b"y" * self.THRESHOLD, b"y" * (self.THRESHOLD - 1)
+        result = shm_pool.submit(
+            describe, big, small, [bytearray(self.THRESHOLD)], blob=bytearray(self.THRESHOLD), tiny=b"t"
+        ).result(timeout_ms=20000)
+        assert result == (
+            ("bytes", self.THRESHOLD),
+            ("bytes", self.THRESHOLD - 1),
+            ("list", 1),
+            ("bytearray", self.THRESHOLD),
+            ("bytes", 1),
+        )
+        assert shm_pool.submit(bytes.decode, big).result(timeout_ms=20000) == "y" * self.THRESHOLD
+
+    @pytest.mark.unit
+    def test_large_arguments_travel_through_shared_memory(self):
+        payload, block = _shared_memory.pack_call(describe, (b"a" * self.THRESHOLD,), {}, self.THRESHOLD)
+        try:
+            assert block is not None
+            assert len(payload.data) < 1024
+            fn, args, kwargs = _shared_memory.unpack(payload, unlink=False)
+            assert type(args[0]) is bytes and args[0] == b"a" * self.THRESHOLD
+        finally:
+            _shared_memory.release(block)
+
+    @pytest.mark.unit
+    def test_small_results_and_disabled_threshold_stay_bytes(self, shm_pool):
+        assert shm_pool.submit(make_bytes, 16).result(timeout_ms=20000) == b"x" * 16
+        pool = QProcessPoolExecutor(max_workers=1, shared_memory_threshold=None)
+        try:
+            assert pool.submit(make_bytes, 2 * self.THRESHOLD).result(timeout_ms=20000) == b"x" * 2 * self.THRESHOLD
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    @pytest.mark.skipif(not os.path.isdir("/dev/shm"), reason="requires POSIX shared memory in /dev/shm")
+    def test_blocks_are_unlinked_and_closed(self, shm_pool):
+        # 只检查本测试用到的块：并行运行的其它测试进程也会创建 psm_* 块
+        names = []
+        unpack, release = _shared_memory.unpack, _shared_memory.release
+
+        def record_unpack(payload, unlink):
+            names.append(payload.block)
+            return unpack(payload, unlink)
+
+        def record_release(block):
+            names.append(getattr(block, "name", None))
+            release(block)
+
+        with patch.object(_shared_memory, "unpack", record_unpack), \
+                patch.object(_shared_memory, "release", record_release):
+            results = [shm_pool.submit(make_bytes, self.THRESHOLD).result(timeout_ms=20000) for _ in range(3)]
+            shm_pool.submit(describe, b"z" * self.THRESHOLD).result(timeout_ms=20000)
+        used = {f"/dev/shm/{name.lstrip('/')}" for name in names if name is not None}
+        assert len(used) == 4
+        assert not used & shared_blocks()
+        assert _shared_memory._attached
+        del results
+        gc.collect()
+        _shared_memory._release_closed()
+        assert not _shared_memory._attached
+
+    @pytest.mark.unit
+    def test_invalid_threshold_is_rejected(self):
+        with pytest.raises(ValueError):
+            QProcessPoolExecutor(max_workers=1, shared_memory_threshold=0)
@@ -0,0 +1,263 @@
+"""Test suite for coalesced progress reporting.
+
+Tasks that declare a ``progress`` parameter receive a ProgressReporter that
+keeps only the latest value. One shared main-thread flush delivers it to
+add_progress_callback callbacks at a bounded rate, and the final value always
+arrives before the done/failure callbacks.
+"""
+
+import functools
+import inspect
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from qthreadwithreturn import ProgressReporter, QThreadPoolExecutor, QThreadWithReturn, set_progress_rate
+from qthreadwithreturn import progress as progress_module
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+def wait_with_events(ms):
+    """Wait specified time while processing Qt events to allow callbacks to execute."""
+    app = QApplication.instance()
+    if app is None:
+        time.sleep(max(0.001, ms / 1000.0))
+        return
+
+    deadline = time.monotonic() + (ms / 1000.0)
+    while time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.010)
+
+
+def wait_until(predicate, timeout_ms=5000):
+    deadline = time.monotonic() + timeout_ms / 1000.0
+    while not predicate() and time.monotonic() < deadline:
+        wait_with_events(10)
+    return predicate()
+
+
+def count_to(n, progress, delay_s=0.0):
+    for i in range(1, n + 1):
+        progress.report(i, n)
+        if delay_s:
+            time.sleep(delay_s)
+    return n
+
+
+def fail_halfway(progress):
+    progress.report(0.5)
+    raise ValueError("halfway")
+
+
+class TestProgressReporter:
+    """Unit tests for ProgressReporter."""
+
+    @pytest.mark.unit
+    def test_keeps_latest_value(self):
+        reporter = ProgressReporter()
+        assert reporter.value is None
+        reporter.report(1)
+        reporter.report(2, 10)
+        assert reporter.value == (2, 10)
+
+    @pytest.mark.unit
+    def test_invalid_rate_is_rejected(self):
+        with pytest.raises(ValueError):
+            set_progress_rate(0)
+
+
+@pytest.mark.usefixtures("qapp_session")
+class TestProgressCallbacks:
+    """Progress delivery through futures."""
+
+    @pytest.mark.unit
+    def test_reports_are_coalesced_and_final_value_precedes_done(self):
+        events = []
+        thread = QThreadWithReturn(count_to, 20000)
+        thread.add_progress_callback(lambda done, total: events.append(("progress", done, total)))
+        thread.add_done_callback(lambda result: events.append(("done", result)))
+        thread.start()
+        assert wait_until(lambda: events and events[-1][0] == "done")
+
+        progress_events = events[:-1]
+        assert len(progress_events) < 100
+        assert progress_events[-1] == ("progress", 20000, 20000)
+        assert all(event[0] == "progress" for event in progress_events)
+
+    @pytest.mark.unit
+    def test_callbacks_run_on_main_thread_with_signature_handling(self):
+        calls = []
+        thread = QThreadWithReturn(count_to, 3, delay_s=0.05)
+        thread.add_progress_callback(lambda: calls.append("none"))
+        thread.add_progress_callback(lambda value: calls.append(value))
+        thread.add_progress_callback(
+            lambda done, total: calls.append(threading.current_thread() is threading.main_thread())
+        )
+        thread.start()
+        thread.result(timeout_ms=5000)
+        assert wait_until(lambda: (3, 3) in calls)
+        assert "none" in calls
+        assert all(flag for flag in calls if isinstance(flag, bool))
+
+    @pytest.mark.unit
+    def test_final_progress_precedes_failure_callbacks(self):
+        events = []
+        thread = QThreadWithReturn(fail_halfway)
+        thread.add_progress_callback(lambda value: events.append(value))
+        thread.add_failure_callback(lambda e: events.append("failed"))
+        thread.start()
+        assert wait_until(lambda: "failed" in events)
+        assert events == [0.5, "failed"]
+
+    @pytest.mark.unit
+    def test_one_flush_per_interval_across_futures(self):
+        set_progress_rate(10)
+        try:
+            with patch.object(
+                    progress_module._channel, "_flush", wraps=progress_module._channel._flush
+            ) as flush:
+                threads = [QThreadWithReturn(count_to, 40, delay_s=0.01) for _ in range(8)]
+                for thread in threads:
+                    thread.start()
+                start = time.monotonic()
+                assert wait_until(lambda: all(t.done() for t in threads))
+                wait_with_events(150)
+                elapsed = time.monotonic() - start
+            assert flush.call_count <= elapsed * 10 + 2
+        finally:
+            set_progress_rate(progress_module.DEFAULT_PROGRESS_RATE_HZ)
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("persistent", [False, True])
+    def test_pool_tasks_receive_reporter(self, persistent):
+        seen = []
+        with QThreadPoolExecutor(max_workers=2, persistent_workers=persistent) as pool:
+            futures = [pool.submit(count_to, 50) for _ in range(4)]
+            for future in futures:
+                future.add_progress_callback(lambda done, total: seen.append((done, total)))
+            assert [f.result(timeout_ms=5000) for f in futures] == [50] * 4
+            assert wait_until(lambda: seen.count((50, 50)) == 4)
+
+    @pytest.mark.unit
+    def test_caller_supplied_progress_is_not_replaced(self):
+        def task(progress):
+            return progress
+
+        thread = QThreadWithReturn(task, progress="mine")
+        thread.start()
+        assert thread.result(timeout_ms=5000) == "mine"
+
+    @pytest.mark.unit
+    def test_positional_progress_is_not_replaced(self):
+        """A progress argument passed positionally is not injected a second time."""
+        class Target:
+            def download(self, url, progress):
+                return url, progress
+
+        def download(url, progress):
+            return url, progress
+
+        thread = QThreadWithReturn(download, "u", "mine")
+        thread.start()
+        assert thread.result(timeout_ms=5000) == ("u", "mine")
+        assert thread._progress is None
+
+        method = QThreadWithReturn(Target().download, "u", "mine")
+        method.start()
+        assert method.result(timeout_ms=5000) == ("u", "mine")
+
+        with QThreadPoolExecutor(max_workers=1) as pool:
+            assert pool.submit(download, "u", None).result(timeout_ms=5000) == ("u", None)
+
+    @pytest.mark.unit
+    def test_defaulted_progress_parameter_is_left_alone(self):
+        """Existing functions with ``progress=False`` keep their default."""
+        def task(x, progress=False):
+            return "verbose" if progress else "quiet"
+
+        thread = QThreadWithReturn(task, 1)
+        thread.start()
+        assert thread.result(timeout_ms=5000) == "quiet"
+        assert thread._progress is None
+
+    @pytest.mark.unit
+    def test_annotated_default_opts_in(self):
+        def task(progress: "ProgressReporter" = None):
+            return progress
+
+        thread = QThreadWithReturn(task)
+        thread.start()
+        assert isinstance(thread.result(timeout_ms=5000), ProgressReporter)
+
+    @pytest.mark.unit
+    def test_signatures_are_not_inspected_on_every_start(self):
+        """Per-submit lambdas, partials and builtins do not re-run inspect.signature()."""
+        def scale(x, factor):
+            return x * factor
+
+        with patch("inspect.signature", wraps=inspect.signature) as signature:
+            for i in range(20):
+                for func, args in [
+                    (lambda x=i: x, ()),
+                    (functools.partial(scale, i), (2,)),
+                    (time.sleep, (0,)),
+                ]:
+                    thread = QThreadWithReturn(func, *args)
+                    thread.start()
+                    thread.result(timeout_ms=5000)
+                    assert thread._progress is None
+            assert signature.call_count <= 1
+        wait_with_events(50)
+
+    @pytest.mark.unit
+    def test_cancelled_future_stops_delivery(self):
+        calls = []
+        started = threading.Event()
+
+        def task(progress):
+            started.set()
+            for i in range(400):
+                progress.report(i)
+                time.sleep(0.005)
+
+        thread = QThreadWithReturn(task)
+        thread.add_progress_callback(calls.append)
+        thread.start()
+        assert started.wait(5)
+        thread.cancel(force_stop=True)
+        count = len(calls)
+        wait_with_events(200)
+        assert len(calls) == count
+
+
+@pytest.mark.unit
+def test_headless_progress_delivery():
+    """Without a Qt application progress is still coalesced and ordered."""
+    code = (
+        "import threading\n"
+        "from tests.test_progress_reporting import count_to\n"
+        "from qthreadwithreturn import QThreadWithReturn\n"
+        "events = []\n"
+        "done = threading.Event()\n"
+        "t = QThreadWithReturn(count_to, 20000)\n"
+        "t.add_progress_callback(lambda d, n: events.append(d))\n"
+        "t.add_done_callback(lambda r: (events.append('done'), done.set()))\n"
+        "t.start()\n"
+        "assert done.wait(10)\n"
+        "assert events[-2:] == [20000, 'done'], events[-3:]\n"
+        "assert len(events) < 200, len(events)\n"
+        "print('ok')\n"
+    )
+    completed = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_ROOT, capture_output=True, text=True, timeout=60
+    )
+    assert completed.returncode == 0, completed.stderr
+    assert completed.stdout.strip() == "ok"
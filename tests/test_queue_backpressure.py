@@ -0,0 +1,170 @@
+"""Test suite for QThreadPoolExecutor bounded queue and backpressure policies.
+
+max_queue_size caps the number of tasks waiting to start; queue_full_policy
+decides what submit() does when the cap is reached, and try_submit() never
+blocks.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from qthreadwithreturn import QThreadPoolExecutor
+
+
+def wait_with_events(ms):
+    """Wait specified time while processing Qt events to allow callbacks to execute."""
+    app = QApplication.instance()
+    if app is None:
+        time.sleep(max(0.001, ms / 1000.0))
+        return
+
+    deadline = time.monotonic() + (ms / 1000.0)
+    while time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.010)
+
+
+@pytest.mark.usefixtures("qapp_session")
+class TestQueueBackpressure:
+    """Test max_queue_size with each queue_full_policy."""
+
+    @pytest.mark.unit
+    def test_raise_policy_and_try_submit(self):
+        """A full queue raises queue.Full; try_submit returns None."""
+        pool = QThreadPoolExecutor(max_workers=1, max_queue_size=2, queue_full_policy="raise")
+        gate = threading.Event()
+        try:
+            running = pool.submit(gate.wait, 5)
+            queued = [pool.submit(lambda: "q") for _ in range(2)]
+
+            with pytest.raises(queue.Full):
+                pool.submit(lambda: "overflow")
+            assert pool.try_submit(lambda: "overflow") is None
+
+            gate.set()
+            assert running.result(timeout_ms=5000) is True
+            assert [f.result(timeout_ms=5000) for f in queued] == ["q", "q"]
+            assert pool.try_submit(lambda: "ok").result(timeout_ms=5000) == "ok"
+        finally:
+            gate.set()
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_drop_oldest_policy(self):
+        """The oldest waiting task is cancelled to make room."""
+        pool = QThreadPoolExecutor(max_workers=1, max_queue_size=2, queue_full_policy="drop_oldest")
+        gate = threading.Event()
+        try:
+            pool.submit(gate.wait, 5)
+            oldest = pool.submit(lambda: "oldest")
+            middle = pool.submit(lambda: "middle")
+            newest = pool.submit(lambda: "newest")
+
+            assert oldest.cancelled()
+            gate.set()
+            with pytest.raises(CancelledError):
+                oldest.result(timeout_ms=5000)
+            assert middle.result(timeout_ms=5000) == "middle"
+            assert newest.result(timeout_ms=5000) == "newest"
+        finally:
+            gate.set()
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_caller_runs_policy(self):
+        """A full queue runs the task in the submitting thread."""
+        failures = []
+        pool = QThreadPoolExecutor(max_workers=1, max_queue_size=1, queue_full_policy="caller_runs")
+        pool.add_failure_callback(lambda e: failures.append(type(e)))
+        gate = threading.Event()
+        try:
+            pool.submit(gate.wait, 5)
+            pool.submit(lambda: None)
+
+            here = pool.submit(threading.get_ident)
+            assert here.done()
+            assert here.result() == threading.get_ident()
+
+            bad = pool.submit(lambda: 1 / 0)
+            assert isinstance(bad.exception(), ZeroDivisionError)
+            wait_with_events(50)
+            assert failures == [ZeroDivisionError]
+        finally:
+            gate.set()
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_block_policy_throttles_producer_thread(self):
+        """A producer thread is held back to max_queue_size pending tasks."""
+        pool = QThreadPoolExecutor(max_workers=2, persistent_workers=True, max_queue_size=3)
+        peak = []
+        futures = []
+
+        def produce():
+            for i in range(50):
+                futures.append(pool.submit(time.sleep, 0.002))
+                peak.append(len(pool._pending_tasks))
+
+        try:
+            producer = threading.Thread(target=produce)
+            producer.start()
+            producer.join(timeout=20)
+            assert not producer.is_alive()
+            assert max(peak) <= 3
+            for f in futures:
+                f.result(timeout_ms=5000)
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_block_policy_on_main_thread(self):
+        """Blocking on the main thread keeps processing events instead of deadlocking."""
+        pool = QThreadPoolExecutor(max_workers=2, max_queue_size=1)
+        try:
+            futures = [pool.submit(lambda x=i: x * 2) for i in range(20)]
+            assert [f.result(timeout_ms=5000) for f in futures] == [i * 2 for i in range(20)]
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_shutdown_releases_blocked_producer(self):
+        """shutdown() wakes a blocked submit(), which then raises RuntimeError."""
+        pool = QThreadPoolExecutor(max_workers=1, persistent_workers=True, max_queue_size=1)
+        gate = threading.Event()
+        errors = []
+
+        def produce():
+            try:
+                pool.submit(lambda: None)
+            except RuntimeError as e:
+                errors.append(e)
+
+        try:
+            pool.submit(gate.wait, 5)
+            pool.submit(lambda: None)
+            time.sleep(0.05)
+            producer = threading.Thread(target=produce)
+            producer.start()
+            time.sleep(0.1)
+            assert producer.is_alive()
+
+            pool.shutdown(cancel_futures=True)
+            producer.join(timeout=5)
+            assert not producer.is_alive()
+            assert len(errors) == 1
+        finally:
+            gate.set()
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_invalid_arguments(self):
+        """Negative sizes and unknown policies are rejected."""
+        with pytest.raises(ValueError):
+            QThreadPoolExecutor(max_workers=1, max_queue_size=-1)
+        with pytest.raises(ValueError):
+            QThreadPoolExecutor(max_workers=1, queue_full_policy="discard")
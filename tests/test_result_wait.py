@@ -0,0 +1,91 @@
+"""Test suite for the event-driven result() wait.
+
+On the main thread result() runs a local QEventLoop that quits as soon as the
+task completes; other threads block on the completion event.
+"""
+
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+from PySide6.QtCore import QTimer
+
+from qthreadwithreturn import QThreadWithReturn
+
+
+@pytest.mark.usefixtures("qapp_session")
+class TestEventDrivenResult:
+    """Test result() waking behaviour."""
+
+    @pytest.mark.unit
+    def test_result_wakes_promptly(self):
+        """result() returns right after the task returns, without staged sleeps."""
+
+        def task():
+            time.sleep(0.6)  # 旧实现在 500ms 后切换到 20ms 休眠
+            return time.perf_counter()
+
+        thread = QThreadWithReturn(task)
+        thread.start()
+        returned_at = thread.result(timeout_ms=5000)
+        assert time.perf_counter() - returned_at < 0.015
+
+    @pytest.mark.unit
+    def test_result_timeout(self):
+        """result(timeout_ms) raises TimeoutError when the task is still running."""
+        gate = threading.Event()
+        thread = QThreadWithReturn(gate.wait, 5)
+        thread.start()
+
+        start = time.monotonic()
+        with pytest.raises(TimeoutError):
+            thread.result(timeout_ms=100)
+        assert time.monotonic() - start < 1.0
+
+        gate.set()
+        assert thread.result(timeout_ms=5000) is True
+
+    @pytest.mark.unit
+    def test_events_processed_while_waiting(self):
+        """Queued main-thread events keep running during result()."""
+        fired = []
+        QTimer.singleShot(10, lambda: fired.append(True))
+
+        thread = QThreadWithReturn(time.sleep, 0.1)
+        thread.start()
+        thread.result(timeout_ms=5000)
+        assert fired == [True]
+
+    @pytest.mark.unit
+    def test_cancel_from_event_loop_wakes_waiter(self):
+        """Cancelling while result() waits raises CancelledError instead of hanging."""
+        stop = threading.Event()
+
+        def task():
+            while not stop.is_set():
+                time.sleep(0.01)
+
+        thread = QThreadWithReturn(task)
+        thread.start()
+        QTimer.singleShot(50, thread.cancel)
+        try:
+            with pytest.raises(CancelledError):
+                thread.result(timeout_ms=5000)
+        finally:
+            stop.set()
+            thread.wait(2000)
+
+    @pytest.mark.unit
+    def test_result_from_worker_thread(self):
+        """A non-main thread waits on the completion event."""
+        thread = QThreadWithReturn(lambda: "value")
+        results = []
+
+        waiter = threading.Thread(target=lambda: results.append(thread.result(timeout_ms=5000)))
+        thread.start()
+        waiter.start()
+        # 主线程需要处理事件，结果才会被投递
+        assert thread.result(timeout_ms=5000) == "value"
+        waiter.join(5)
+        assert results == ["value"]
@@ -11,6 +11,8 @@
 
 import time
 import warnings
+from unittest.mock import patch
+
 import pytest
 from PySide6.QtWidgets import QApplication
 from qthreadwithreturn import QThreadPoolExecutor
@@ -126,7 +128,8 @@ class TestShutdownForceStop:
         start_time = time.time()
         with warnings.catch_warnings(record=True) as w:
             warnings.simplefilter("always")
-            pool.shutdown(force_stop=True, wait=True)
+            # 强制停止的任务已全部结束，不会作为未完成任务返回
+            assert pool.shutdown(force_stop=True, wait=True) == []
             # 应该有警告
             assert len(w) == 1
             assert issubclass(w[0].category, UserWarning)
@@ -172,6 +175,51 @@ class TestShutdownForceStop:
         assert len(done_count) == 1
 
 
+    def test_force_stop_stops_threads_in_parallel(self, process_events):
+        """所有线程并行停止，总耗时不随线程数线性增长"""
+        pool = QThreadPoolExecutor(max_workers=16)
+
+        def stuck_task():
+            time.sleep(10)
+
+        futures = [pool.submit(stuck_task) for _ in range(16)]
+        time.sleep(0.2)  # 让所有任务开始
+
+        start_time = time.time()
+        pool.shutdown(force_stop=True)
+        elapsed = time.time() - start_time
+
+        # 逐个分阶段停止需要 16 * 300ms 以上
+        assert elapsed < 2.0, f"force_stop of 16 threads took {elapsed}s"
+        assert all(f.done() for f in futures)
+
+    def test_force_stop_timeout_budget(self, process_events):
+        """timeout_ms 限制强制停止的总耗时"""
+        pool = QThreadPoolExecutor(max_workers=8)
+
+        def stuck_task():
+            time.sleep(10)
+
+        futures = [pool.submit(stuck_task) for _ in range(8)]
+        time.sleep(0.2)
+
+        start_time = time.time()
+        pool.shutdown(force_stop=True, timeout_ms=200)
+        elapsed = time.time() - start_time
+
+        assert elapsed < 0.6, f"force_stop with timeout_ms=200 took {elapsed}s"
+        assert all(f.done() for f in futures)
+
+    def test_force_stop_invalid_timeout(self, process_events):
+        """timeout_ms 必须是非负数字"""
+        pool = QThreadPoolExecutor(max_workers=1)
+        with pytest.raises(TypeError):
+            pool.shutdown(force_stop=True, timeout_ms="100")
+        with pytest.raises(ValueError):
+            pool.shutdown(force_stop=True, timeout_ms=-1)
+        pool.shutdown(force_stop=True)
+
+
 class TestShutdownCancelFutures:
     """测试 cancel_futures=True 的行为"""
 
@@ -306,11 +354,89 @@ class TestShutdownWait:
         time.sleep(0.1)
 
         start_time = time.time()
-        pool.shutdown(wait=False)  # 默认行为
+        assert pool.shutdown(wait=False) == []  # 默认行为
         elapsed = time.time() - start_time
 
         assert elapsed < 0.5, f"shutdown(wait=False) took {elapsed}s"
 
+    @pytest.mark.parametrize("persistent", [False, True])
+    def test_wait_returns_empty_list_when_all_done(self, process_events, persistent):
+        """所有任务完成后返回空列表，排队的任务也会被执行"""
+        pool = QThreadPoolExecutor(max_workers=1, persistent_workers=persistent)
+        futures = [pool.submit(time.sleep, 0.05) for _ in range(4)]
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            unfinished = pool.shutdown(wait=True)
+
+        assert unfinished == []
+        assert all(f.done() for f in futures)
+
+    @pytest.mark.parametrize("persistent", [False, True])
+    def test_wait_adds_no_fixed_delay(self, process_events, persistent):
+        """任务完成后 shutdown(wait=True) 不再固定休眠"""
+        pool = QThreadPoolExecutor(max_workers=2, persistent_workers=persistent)
+        futures = [pool.submit(lambda x: x, i) for i in range(4)]
+        assert [f.result(timeout_ms=5000) for f in futures] == [0, 1, 2, 3]
+        time.sleep(0.1)  # 让逐任务的 QThread 完全退出
+
+        with patch.object(time, "sleep") as sleep, warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            assert pool.shutdown(wait=True) == []
+        sleep.assert_not_called()
+
+    @pytest.mark.parametrize("persistent", [False, True])
+    def test_wait_timeout_reports_unfinished(self, process_events, persistent):
+        """等待超时时返回仍未完成的任务，任务继续运行"""
+        pool = QThreadPoolExecutor(max_workers=1, persistent_workers=persistent)
+        quick = pool.submit(lambda: "quick")
+        quick.result(timeout_ms=5000)
+        slow = pool.submit(time.sleep, 0.5)
+        queued = pool.submit(lambda: "queued")
+
+        start_time = time.time()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            unfinished = pool.shutdown(wait=True, timeout_ms=100)
+        elapsed = time.time() - start_time
+
+        assert elapsed < 0.4, f"shutdown(wait=True, timeout_ms=100) took {elapsed}s"
+        assert set(unfinished) == {slow, queued}
+        # 超时后任务照常完成
+        assert queued.result(timeout_ms=5000) == "queued"
+        assert slow.done()
+
+    def test_wait_from_background_thread(self, process_events):
+        """在非主线程中等待时阻塞在完成通知上"""
+        import threading
+
+        pool = QThreadPoolExecutor(max_workers=2, persistent_workers=True)
+        futures = [pool.submit(time.sleep, 0.1) for _ in range(4)]
+        outcome = []
+
+        def waiter():
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                outcome.append(pool.shutdown(wait=True, timeout_ms=5000))
+
+        thread = threading.Thread(target=waiter)
+        thread.start()
+        deadline = time.monotonic() + 5
+        while thread.is_alive() and time.monotonic() < deadline:
+            QApplication.instance().processEvents()
+            time.sleep(0.01)
+        thread.join(1)
+
+        assert outcome == [[]]
+        assert all(f.done() for f in futures)
+
+    def test_wait_invalid_timeout(self, process_events):
+        """timeout_ms 为负数时抛出 ValueError"""
+        pool = QThreadPoolExecutor(max_workers=1)
+        with pytest.raises(ValueError):
+            pool.shutdown(wait=True, timeout_ms=-5)
+        pool.shutdown()
+
 
 class TestShutdownParameterCombinations:
     """测试各种参数组合"""
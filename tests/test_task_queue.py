@@ -0,0 +1,130 @@
+"""Test suite for the pool pending-task queue (_TaskQueue)."""
+
+import threading
+import time
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from qthreadwithreturn import QThreadPoolExecutor
+from qthreadwithreturn._task_queue import _TaskQueue
+
+
+def wait_with_events(ms):
+    """Wait specified time while processing Qt events to allow callbacks to execute."""
+    app = QApplication.instance()
+    if app is None:
+        time.sleep(max(0.001, ms / 1000.0))
+        return
+
+    deadline = time.monotonic() + (ms / 1000.0)
+    while time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.010)
+
+
+class TestTaskQueue:
+    """Unit tests for _TaskQueue."""
+
+    @pytest.mark.unit
+    def test_fifo_order(self):
+        queue = _TaskQueue()
+        for i in range(5):
+            queue.append(i)
+        assert len(queue) == 5
+        assert [queue.popleft() for _ in range(5)] == [0, 1, 2, 3, 4]
+        assert not queue
+
+    @pytest.mark.unit
+    def test_appendleft_and_peek(self):
+        queue = _TaskQueue()
+        queue.append("b")
+        queue.appendleft("a")
+        assert queue.peek() == "a"
+        assert len(queue) == 2
+        assert queue.popleft() == "a"
+        assert queue.popleft() == "b"
+
+    @pytest.mark.unit
+    def test_discard_is_lazy_but_invisible(self):
+        queue = _TaskQueue()
+        for item in ("a", "b", "c"):
+            queue.append(item)
+
+        assert queue.discard("b") is True
+        assert queue.discard("b") is False
+        assert "b" not in queue
+        assert len(queue) == 2
+        assert list(queue) == ["a", "c"]
+        assert queue.popleft() == "a"
+        assert queue.peek() == "c"
+        assert queue.popleft() == "c"
+        with pytest.raises(IndexError):
+            queue.popleft()
+
+    @pytest.mark.unit
+    def test_discard_head(self):
+        queue = _TaskQueue()
+        queue.append("a")
+        queue.append("b")
+        queue.discard("a")
+        assert queue.peek() == "b"
+
+    @pytest.mark.unit
+    def test_clear(self):
+        queue = _TaskQueue()
+        queue.append(1)
+        queue.append(2)
+        queue.clear()
+        assert len(queue) == 0
+        with pytest.raises(IndexError):
+            queue.peek()
+
+
+@pytest.mark.usefixtures("qapp_session")
+class TestPoolQueueDispatch:
+    """Dispatch behaviour of the pool queue."""
+
+    @pytest.mark.unit
+    def test_cancelled_pending_task_is_not_started(self):
+        """A task cancelled while queued is skipped instead of being started."""
+        pool = QThreadPoolExecutor(max_workers=1)
+        ran = []
+        gate = threading.Event()
+        completed = []
+
+        try:
+            pool.add_done_callback(lambda: completed.append(True))
+            blocker = pool.submit(gate.wait, 5)
+            queued = pool.submit(lambda: ran.append("queued"))
+            assert len(pool._pending_tasks) == 1
+
+            assert queued.cancel() is True
+            gate.set()
+            assert blocker.result(timeout_ms=5000) is True
+            wait_with_events(200)
+
+            assert ran == []
+            assert queued.cancelled()
+            assert len(pool._pending_tasks) == 0
+            assert completed == [True]
+        finally:
+            pool.shutdown(wait=True)
+
+    @pytest.mark.unit
+    def test_large_backlog_drains_in_order(self):
+        """Queued tasks start in submission order."""
+        pool = QThreadPoolExecutor(max_workers=1, persistent_workers=True)
+        order = []
+        gate = threading.Event()
+
+        try:
+            pool.submit(gate.wait, 5)
+            futures = [pool.submit(order.append, i) for i in range(500)]
+            assert len(pool._pending_tasks) >= 499
+            gate.set()
+            for f in futures:
+                f.result(timeout_ms=5000)
+            assert order == list(range(500))
+        finally:
+            pool.shutdown(wait=True)
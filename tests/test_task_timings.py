@@ -0,0 +1,116 @@
+"""Test suite for QThreadWithReturn.timings.
+
+Each future records monotonic timestamps for creation, queueing, start and
+return of the task function, delivery of the result to the main thread and
+every callback execution.
+"""
+
+import threading
+import time
+
+import pytest
+from PySide6.QtWidgets import QApplication
+
+from qthreadwithreturn import QThreadPoolExecutor, QThreadWithReturn
+
+
+def wait_with_events(ms):
+    """Wait specified time while processing Qt events to allow callbacks to execute."""
+    app = QApplication.instance()
+    if app is None:
+        time.sleep(max(0.001, ms / 1000.0))
+        return
+
+    deadline = time.monotonic() + (ms / 1000.0)
+    while time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.010)
+
+
+def wait_until(predicate, timeout_ms=5000):
+    deadline = time.monotonic() + timeout_ms / 1000.0
+    while not predicate() and time.monotonic() < deadline:
+        wait_with_events(10)
+    return predicate()
+
+
+def fail():
+    raise ValueError("boom")
+
+
+PHASES = ("created", "queued", "started", "returned", "delivered")
+
+
+@pytest.mark.usefixtures("qapp_session")
+class TestTaskTimings:
+    """Test the timings property."""
+
+    @pytest.mark.unit
+    def test_phases_are_ordered(self):
+        """All phases are recorded in order and callbacks run after delivery."""
+        thread = QThreadWithReturn(time.sleep, 0.05)
+        called = []
+        thread.add_done_callback(lambda: called.append(1))
+        thread.add_done_callback(lambda: called.append(2))
+        thread.start()
+        thread.result(timeout_ms=5000)
+        assert wait_until(lambda: len(called) == 2)
+
+        timings = thread.timings
+        stamps = [timings[phase] for phase in PHASES]
+        assert stamps == sorted(stamps)
+        assert timings["returned"] - timings["started"] >= 0.05
+        assert len(timings["callbacks"]) == 2
+        assert timings["callbacks"][0] >= timings["delivered"]
+
+    @pytest.mark.unit
+    def test_unstarted_thread(self):
+        """Only created is recorded before start()."""
+        thread = QThreadWithReturn(lambda: None)
+        assert thread.timings == {"created": thread.timings["created"], "callbacks": []}
+
+    @pytest.mark.unit
+    def test_failure_callbacks_are_recorded(self):
+        """Failure callbacks are timed like done callbacks."""
+        thread = QThreadWithReturn(fail)
+        errors = []
+        thread.add_failure_callback(errors.append)
+        thread.start()
+        assert wait_until(lambda: errors)
+
+        timings = thread.timings
+        assert timings["returned"] <= timings["delivered"] <= timings["callbacks"][0]
+
+    @pytest.mark.unit
+    def test_timings_is_read_only_copy(self):
+        """The property returns a copy and cannot be assigned."""
+        thread = QThreadWithReturn(lambda: None)
+        thread.timings["created"] = 0
+        thread.timings["callbacks"].append(0)
+        assert thread.timings["created"] != 0
+        assert thread.timings["callbacks"] == []
+        with pytest.raises(AttributeError):
+            thread.timings = {}
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("persistent", [False, True])
+    def test_pool_records_queue_time(self, persistent):
+        """A pooled future is queued at submit() and started when a worker is free."""
+        pool = QThreadPoolExecutor(max_workers=1, persistent_workers=persistent)
+        gate = threading.Event()
+        try:
+            blocker = pool.submit(gate.wait, 5)
+            queued = pool.submit(lambda: "done")
+            wait_with_events(150)
+            assert "started" not in queued.timings
+            gate.set()
+            assert queued.result(timeout_ms=5000) == "done"
+            blocker.result(timeout_ms=5000)
+            assert wait_until(lambda: "delivered" in queued.timings)
+
+            timings = queued.timings
+            stamps = [timings[phase] for phase in PHASES]
+            assert stamps == sorted(stamps)
+            assert timings["started"] - timings["queued"] >= 0.1
+        finally:
+            pool.shutdown(wait=True)